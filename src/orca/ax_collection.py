@@ -45,6 +45,40 @@ from .ax_object import AXObject
 class AXCollection:
     """Utilities for obtaining objects via the collection interface."""
 
+    # The number of matches requested at a time when paging through results.
+    CHUNK_SIZE = 200
+
+    QUERY_COUNT: int = 0
+    PARTIAL_QUERY_COUNT: int = 0
+    MATCH_COUNT: int = 0
+    TOTAL_TIME: float = 0.0
+    MAX_TIME: float = 0.0
+    MAX_MATCH_COUNT: int = 0
+
+    @staticmethod
+    def _record_query(elapsed: float, match_count: int, is_partial: bool = False) -> str:
+        """Updates the query statistics and returns a summary of them."""
+
+        AXCollection.QUERY_COUNT += 1
+        AXCollection.PARTIAL_QUERY_COUNT += int(is_partial)
+        AXCollection.MATCH_COUNT += match_count
+        AXCollection.TOTAL_TIME += elapsed
+        AXCollection.MAX_TIME = max(AXCollection.MAX_TIME, elapsed)
+        AXCollection.MAX_MATCH_COUNT = max(AXCollection.MAX_MATCH_COUNT, match_count)
+        return AXCollection.get_statistics()
+
+    @staticmethod
+    def get_statistics() -> str:
+        """Returns a summary of the timing and size of the queries made so far."""
+
+        count = max(1, AXCollection.QUERY_COUNT)
+        return (
+            f"{AXCollection.QUERY_COUNT} queries ({AXCollection.PARTIAL_QUERY_COUNT} partial), "
+            f"average: {AXCollection.TOTAL_TIME / count:.4f}s "
+            f"and {AXCollection.MATCH_COUNT / count:.1f} matches, "
+            f"max: {AXCollection.MAX_TIME:.4f}s and {AXCollection.MAX_MATCH_COUNT} matches"
+        )
+
     # Too many arguments and too many local variables.
     # This function wraps Atspi.MatchRule.new which has all the arguments.
     # pylint: disable=R0913,R0914
@@ -107,9 +141,11 @@ class AXCollection:
     def get_all_matches(
         obj: Atspi.Accessible,
         rule: Atspi.MatchRule,
-            order: Atspi.CollectionSortOrder = Atspi.CollectionSortOrder.CANONICAL
+            order: Atspi.CollectionSortOrder = Atspi.CollectionSortOrder.CANONICAL,
+            max_count: int = 0
         ) -> list[Atspi.Accessible]:
-        """Returns a list of objects matching the specified rule."""
+        """Returns a list of objects matching the specified rule. If max_count is
+        positive, at most max_count objects are returned."""
 
         if not AXObject.supports_collection(obj):
             tokens = ["AXCollection:", obj, "does not implement this interface."]
@@ -123,16 +159,86 @@ class AXCollection:
         try:
             # 0 means no limit on the number of results
             # The final argument, traverse, is not supported but is expected.
-            matches = Atspi.Collection.get_matches(obj, rule, order, 0, True)
+            matches = Atspi.Collection.get_matches(obj, rule, order, max(0, max_count), True)
         except Exception as error:
             tokens = ["AXCollection: Exception in get_all_matches:", error]
             debug.print_tokens(debug.LEVEL_INFO, tokens, True)
             return []
 
-        msg = f"AXCollection: {len(matches)} match(es) found in {time.time() - start:.4f}s"
-        debug.print_message(debug.LEVEL_INFO, msg, True)
+        elapsed = time.time() - start
+        is_truncated = 0 < max_count <= len(matches)
+        stats = AXCollection._record_query(elapsed, len(matches), is_truncated)
+        msg = f"AXCollection: {len(matches)} match(es) found in {elapsed:.4f}s"
+        if is_truncated:
+            msg += f" (truncated at {max_count})"
+        debug.print_message(debug.LEVEL_INFO, f"{msg}. {stats}", True)
         return matches
 
+    # pylint: disable=too-many-arguments
+    # pylint: disable=too-many-positional-arguments
+    @staticmethod
+    def get_matches_page(
+        obj: Atspi.Accessible,
+        rule: Atspi.MatchRule,
+        max_count: int = CHUNK_SIZE,
+        after: Optional[Atspi.Accessible] = None,
+        time_budget: float = 0.0,
+        order: Atspi.CollectionSortOrder = Atspi.CollectionSortOrder.CANONICAL
+    ) -> tuple[list[Atspi.Accessible], bool]:
+        """Returns up to max_count objects matching rule which follow after (if specified),
+        along with True if there are no further matches. Matches are requested in chunks;
+        if time_budget (in seconds) is exceeded, or a request fails, the matches found so
+        far are returned along with False."""
+
+        if not AXObject.supports_collection(obj):
+            tokens = ["AXCollection:", obj, "does not implement this interface."]
+            debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+            return [], True
+
+        if rule is None or max_count <= 0:
+            return [], True
+
+        start = time.time()
+        matches: list[Atspi.Accessible] = []
+        is_complete = False
+        while len(matches) < max_count:
+            count = min(AXCollection.CHUNK_SIZE, max_count - len(matches))
+            try:
+                # The final argument, traverse, is not supported but is expected.
+                if after is None:
+                    chunk = Atspi.Collection.get_matches(obj, rule, order, count, True)
+                else:
+                    # In-order traversal continues with the descendants of after, then
+                    # with what follows it, i.e. in document order.
+                    chunk = Atspi.Collection.get_matches_from(
+                        obj, after, rule, order,
+                        Atspi.CollectionTreeTraversalType.INORDER, count, True)
+            except Exception as error:
+                tokens = ["AXCollection: Exception in get_matches_page:", error]
+                debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+                break
+
+            matches.extend(chunk)
+            if len(chunk) < count:
+                is_complete = True
+                break
+
+            after = chunk[-1]
+            if time_budget and time.time() - start >= time_budget:
+                break
+
+        elapsed = time.time() - start
+        is_partial = not is_complete and len(matches) < max_count
+        stats = AXCollection._record_query(elapsed, len(matches), is_partial)
+        msg = (
+            f"AXCollection: {len(matches)} match(es) found in {elapsed:.4f}s "
+            f"(complete: {is_complete}, partial: {is_partial}). {stats}"
+        )
+        debug.print_message(debug.LEVEL_INFO, msg, True)
+        return matches, is_complete
+    # pylint: enable=too-many-arguments
+    # pylint: enable=too-many-positional-arguments
+
     @staticmethod
     def get_first_match(
         obj: Atspi.Accessible,
@@ -42,11 +42,9 @@ from gi.repository import Atspi
 
 from . import debug
 from . import messages
-from .ax_collection import AXCollection
 from .ax_object import AXObject
 from .ax_table import AXTable
-from .ax_utilities_role import AXUtilitiesRole
-from .ax_utilities_state import AXUtilitiesState
+from .ax_utilities_collection import AXUtilitiesCollection, MatchBucket
 
 class AXDocument:
     """Utilities for obtaining document-related information about accessible objects."""
@@ -218,38 +216,18 @@ class AXDocument:
     def _get_object_counts(document: Atspi.Accessible) -> dict[str, int]:
         """Returns a dictionary of object counts used in a document summary."""
 
-        result = {"forms": 0,
-                  "landmarks": 0,
-                  "headings": 0,
-                  "tables": 0,
-                  "unvisited_links": 0,
-                  "visited_links": 0}
-
-        roles = [Atspi.Role.HEADING,
-                 Atspi.Role.LINK,
-                 Atspi.Role.TABLE,
-                 Atspi.Role.FORM,
-                 Atspi.Role.LANDMARK]
-
-        rule = AXCollection.create_match_rule(roles=roles)
-        matches = AXCollection.get_all_matches(document, rule)
-
-        for obj in matches:
-            if AXUtilitiesRole.is_heading(obj):
-                result["headings"] += 1
-            elif AXUtilitiesRole.is_form(obj):
-                result["forms"] += 1
-            elif AXUtilitiesRole.is_table(obj) and not AXTable.is_layout_table(obj):
-                result["tables"] += 1
-            elif AXUtilitiesRole.is_link(obj):
-                if AXUtilitiesState.is_visited(obj):
-                    result["visited_links"] += 1
-                else:
-                    result["unvisited_links"] += 1
-            elif AXUtilitiesRole.is_landmark(obj):
-                result["landmarks"] += 1
-
-        return result
+        # The buckets are checked in order, so visited links must precede other links.
+        buckets: dict[str, MatchBucket] = {
+            "headings": ([Atspi.Role.HEADING], None, None),
+            "forms": ([Atspi.Role.FORM], None, None),
+            "tables": ([Atspi.Role.TABLE], None, lambda x: not AXTable.is_layout_table(x)),
+            "visited_links": ([Atspi.Role.LINK], [Atspi.StateType.VISITED], None),
+            "unvisited_links": ([Atspi.Role.LINK], None, None),
+            "landmarks": ([Atspi.Role.LANDMARK], None, None),
+        }
+
+        matches = AXUtilitiesCollection.find_all_in_buckets(document, buckets)
+        return {name: len(objs) for name, objs in matches.items()}
 
     @staticmethod
     def get_document_summary(document: Atspi.Accessible, only_if_found: bool = True) -> str:
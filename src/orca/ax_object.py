@@ -46,6 +46,7 @@ from gi.repository import Gtk
 
 from . import debug
 from . import keynames
+from . import process_health_monitor
 
 
 class AXObject:
@@ -54,6 +55,15 @@ class AXObject:
     KNOWN_DEAD: dict[int, bool] = {}
     OBJECT_ATTRIBUTES: dict[int, dict[str, str]] = {}
 
+    # Snapshots of each object's role and of its states as a bitset, so that the many
+    # role and state predicates checked while presenting an object don't each query it.
+    # They are removed when the object's role or states change, and otherwise expire
+    # quickly because not all applications emit events for all state changes.
+    ROLE_SNAPSHOTS: dict[int, tuple[float, Atspi.Role]] = {}
+    STATE_SNAPSHOTS: dict[int, tuple[float, int]] = {}
+    SNAPSHOT_TTL = 0.25
+    MAX_SNAPSHOTS = 2000
+
     _lock = threading.Lock()
 
     @staticmethod
@@ -74,6 +84,8 @@ class AXObject:
         with AXObject._lock:
             AXObject.KNOWN_DEAD.clear()
             AXObject.OBJECT_ATTRIBUTES.clear()
+            AXObject.ROLE_SNAPSHOTS.clear()
+            AXObject.STATE_SNAPSHOTS.clear()
 
     @staticmethod
     def clear_cache_now(reason: str = "") -> None:
@@ -175,6 +187,14 @@ class AXObject:
         elif re.search(r"The application no longer exists", error_string):
             msg = msg.replace(error_string, "app no longer exists")
             debug.print_message(debug.LEVEL_INFO, msg, True)
+        elif re.search(r"Timeout was reached", error_string):
+            debug.print_message(debug.LEVEL_INFO, msg, True)
+            try:
+                pid = Atspi.Accessible.get_process_id(obj)
+            except Exception:
+                return
+            process_health_monitor.get_monitor().record_slow_response(pid, msg)
+            return
         else:
             debug.print_message(debug.LEVEL_INFO, msg, True)
             return
@@ -763,6 +783,21 @@ class AXObject:
         debug.print_message(debug.LEVEL_INFO, msg, True)
         return matches
 
+    @staticmethod
+    def invalidate_snapshot(obj: Atspi.Accessible) -> None:
+        """Removes the snapshot of obj's role and states."""
+
+        AXObject.ROLE_SNAPSHOTS.pop(hash(obj), None)
+        AXObject.STATE_SNAPSHOTS.pop(hash(obj), None)
+
+    @staticmethod
+    def update_snapshot_for_event(event: Atspi.Event) -> None:
+        """Removes the snapshot of event.source if event changes its role or states."""
+
+        if event.type.startswith("object:state-changed") \
+           or event.type.startswith("object:property-change:accessible-role"):
+            AXObject.invalidate_snapshot(event.source)
+
     @staticmethod
     def get_role(obj: Atspi.Accessible) -> Atspi.Role:
         """Returns the accessible role of obj"""
@@ -770,6 +805,11 @@ class AXObject:
         if not AXObject.is_valid(obj):
             return Atspi.Role.INVALID
 
+        now = time.monotonic()
+        snapshot = AXObject.ROLE_SNAPSHOTS.get(hash(obj))
+        if snapshot is not None and now - snapshot[0] < AXObject.SNAPSHOT_TTL:
+            return snapshot[1]
+
         try:
             role = Atspi.Accessible.get_role(obj)
         except Exception as error:
@@ -778,6 +818,9 @@ class AXObject:
             return Atspi.Role.INVALID
 
         AXObject._set_known_dead_status(obj, False)
+        if len(AXObject.ROLE_SNAPSHOTS) >= AXObject.MAX_SNAPSHOTS:
+            AXObject.ROLE_SNAPSHOTS.clear()
+        AXObject.ROLE_SNAPSHOTS[hash(obj)] = now, role
         return role
 
     @staticmethod
@@ -1019,6 +1062,12 @@ class AXObject:
             return Atspi.StateSet()
 
         AXObject._set_known_dead_status(obj, False)
+        bits = 0
+        for state in state_set.get_states():
+            bits |= 1 << int(state)
+        if len(AXObject.STATE_SNAPSHOTS) >= AXObject.MAX_SNAPSHOTS:
+            AXObject.STATE_SNAPSHOTS.clear()
+        AXObject.STATE_SNAPSHOTS[hash(obj)] = time.monotonic(), bits
         return state_set
 
     @staticmethod
@@ -1028,7 +1077,14 @@ class AXObject:
         if not AXObject.is_valid(obj):
             return False
 
-        return AXObject.get_state_set(obj).contains(state)
+        snapshot = AXObject.STATE_SNAPSHOTS.get(hash(obj))
+        if snapshot is None or time.monotonic() - snapshot[0] >= AXObject.SNAPSHOT_TTL:
+            AXObject.get_state_set(obj)
+            snapshot = AXObject.STATE_SNAPSHOTS.get(hash(obj))
+            if snapshot is None:
+                return False
+
+        return bool(snapshot[1] >> int(state) & 1)
 
     @staticmethod
     def clear_cache(
@@ -1046,6 +1102,12 @@ class AXObject:
             tokens.append(f" Reason: {reason}")
         debug.print_tokens(debug.LEVEL_INFO, tokens, True)
 
+        if recursive:
+            AXObject.ROLE_SNAPSHOTS.clear()
+            AXObject.STATE_SNAPSHOTS.clear()
+        else:
+            AXObject.invalidate_snapshot(obj)
+
         if not recursive:
             try:
                 Atspi.Accessible.clear_cache_single(obj)
@@ -1403,5 +1465,3 @@ class AXObject:
             debug.print_tokens(debug.LEVEL_INFO, tokens, True)
 
         return result
-
-AXObject.start_cache_clearing_thread()
@@ -41,6 +41,7 @@ from typing import Generator, Optional
 import gi
 gi.require_version("Atspi", "2.0")
 from gi.repository import Atspi
+from gi.repository import GLib
 
 from . import debug
 from . import messages
@@ -50,15 +51,158 @@ from .ax_component import AXComponent
 from .ax_utilities_role import AXUtilitiesRole
 
 
+class AXTableModel:
+    """Cached structural information about a single table.
+
+    Unlike the other cached table details, which are cleared periodically, this
+    information remains valid until an event indicates the table has changed, or
+    until it has not been used for MAX_AGE seconds. Everything is filled in lazily
+    as cells are queried, and the model is emptied if it reaches MAX_CELLS cells.
+    """
+
+    MAX_CELLS = 5000
+    MAX_AGE = 300
+
+    def __init__(self, table: Atspi.Accessible) -> None:
+        self.table: Atspi.Accessible = table
+        self.last_used: float = time.monotonic()
+        self.cells: dict[tuple[int, int], Atspi.Accessible] = {}
+        self.coordinates_from_cell: dict[int, tuple[int, int]] = {}
+        self.coordinates_from_table: dict[int, tuple[int, int]] = {}
+        self.spans_from_cell: dict[int, tuple[int, int]] = {}
+        self.spans_from_table: dict[int, tuple[int, int]] = {}
+        self.column_headers: dict[int, list[Atspi.Accessible]] = {}
+        self.row_headers: dict[int, list[Atspi.Accessible]] = {}
+        self.members: set[int] = set()
+
+        # Members by row, so that inserting or deleting rows need not examine every
+        # member. Members whose row is not yet known, and those which span multiple
+        # rows, are tracked separately because they might be affected by any change.
+        self._rows: dict[int, set[int]] = {}
+        self._row_for_member: dict[int, int] = {}
+        self._unindexed: set[int] = set()
+        self._spanning: set[int] = set()
+
+    def __str__(self) -> str:
+        return (
+            f"AXTableModel: {len(self.members)} cells, {len(self.cells)} grid positions"
+        )
+
+    def is_full(self) -> bool:
+        """Returns True if the model has reached its size limit."""
+
+        return len(self.members) >= self.MAX_CELLS or len(self.cells) >= self.MAX_CELLS
+
+    def touch(self) -> None:
+        """Records that the model was just used."""
+
+        self.last_used = time.monotonic()
+
+    def is_expired(self) -> bool:
+        """Returns True if the model has not been used for MAX_AGE seconds."""
+
+        return time.monotonic() - self.last_used > self.MAX_AGE
+
+    def add_member(self, cell_hash: int) -> None:
+        """Adds the cell with cell_hash to the model."""
+
+        if cell_hash not in self.members:
+            self.members.add(cell_hash)
+            self._unindexed.add(cell_hash)
+
+    def set_coordinates(
+        self,
+        cell_hash: int,
+        coordinates: tuple[int, int],
+        from_table: bool
+    ) -> None:
+        """Stores the coordinates of the cell with cell_hash."""
+
+        if from_table:
+            self.coordinates_from_table[cell_hash] = coordinates
+        else:
+            self.coordinates_from_cell[cell_hash] = coordinates
+
+        row = coordinates[0]
+        if row < 0:
+            return
+
+        old_row = self._row_for_member.get(cell_hash)
+        if old_row is not None and old_row != row:
+            self._rows.get(old_row, set()).discard(cell_hash)
+
+        self._row_for_member[cell_hash] = row
+        self._rows.setdefault(row, set()).add(cell_hash)
+        self._unindexed.discard(cell_hash)
+
+    def set_spans(self, cell_hash: int, spans: tuple[int, int], from_table: bool) -> None:
+        """Stores the spans of the cell with cell_hash."""
+
+        if from_table:
+            self.spans_from_table[cell_hash] = spans
+        else:
+            self.spans_from_cell[cell_hash] = spans
+
+        if spans[0] > 1:
+            self._spanning.add(cell_hash)
+
+    def _remove_member(self, cell_hash: int) -> None:
+        for cache in (self.coordinates_from_cell, self.coordinates_from_table,
+                      self.spans_from_cell, self.spans_from_table,
+                      self.column_headers, self.row_headers):
+            cache.pop(cell_hash, None)
+
+        row = self._row_for_member.pop(cell_hash, None)
+        if row is not None:
+            self._rows.get(row, set()).discard(cell_hash)
+        self._unindexed.discard(cell_hash)
+        self._spanning.discard(cell_hash)
+        self.members.discard(cell_hash)
+
+    def invalidate_rows(self, first_row: int) -> set[int]:
+        """Removes everything which might have changed due to rows added at or after first_row.
+        Returns the hashes of the cells which were removed from the model."""
+
+        self.cells = {k: v for k, v in self.cells.items() if k[0] < first_row}
+
+        stale = set(self._unindexed)
+        for row in [r for r in self._rows if r >= first_row]:
+            stale.update(self._rows.pop(row))
+
+        for cell_hash in self._spanning:
+            row = self._row_for_member.get(cell_hash, -1)
+            span = (self.spans_from_cell.get(cell_hash)
+                    or self.spans_from_table.get(cell_hash) or (1, 1))[0]
+            if row < 0 or row + max(span, 1) > first_row:
+                stale.add(cell_hash)
+
+        for cell_hash in stale:
+            self._remove_member(cell_hash)
+
+        return stale
+
+    def clear(self) -> None:
+        """Removes everything from the model."""
+
+        self.cells.clear()
+        self.coordinates_from_cell.clear()
+        self.coordinates_from_table.clear()
+        self.spans_from_cell.clear()
+        self.spans_from_table.clear()
+        self.column_headers.clear()
+        self.row_headers.clear()
+        self.members.clear()
+        self._rows.clear()
+        self._row_for_member.clear()
+        self._unindexed.clear()
+        self._spanning.clear()
+
+
 class AXTable:
     """Utilities for obtaining information about accessible tables."""
 
     # Things we cache.
     CAPTIONS: dict[int, Atspi.Accessible] = {}
-    PHYSICAL_COORDINATES_FROM_CELL: dict[int, tuple[int, int]] = {}
-    PHYSICAL_COORDINATES_FROM_TABLE: dict[int, tuple[int, int]] = {}
-    PHYSICAL_SPANS_FROM_CELL: dict[int, tuple[int, int]] = {}
-    PHYSICAL_SPANS_FROM_TABLE: dict[int, tuple[int, int]] = {}
     PHYSICAL_COLUMN_COUNT: dict[int, int] = {}
     PHYSICAL_ROW_COUNT: dict[int, int] = {}
     PRESENTABLE_COORDINATES: dict[int, tuple[Optional[str], Optional[str]]] = {}
@@ -66,10 +210,14 @@ class AXTable:
     PRESENTABLE_SPANS: dict[int, tuple[Optional[str], Optional[str]]] = {}
     PRESENTABLE_COLUMN_COUNT: dict[int, Optional[int]] = {}
     PRESENTABLE_ROW_COUNT: dict[int, Optional[int]] = {}
-    COLUMN_HEADERS_FOR_CELL: dict[int, list[Atspi.Accessible]] = {}
-    ROW_HEADERS_FOR_CELL: dict[int, list[Atspi.Accessible]] = {}
+
+    # Spreadsheet rows wider than this are limited to the visible columns when read in full.
+    MAX_FULL_ROW_COLUMNS = 100
 
     # Things which have to be explicitly cleared.
+    MODELS: dict[int, AXTableModel] = {}
+    MODEL_FOR_CELL: dict[int, AXTableModel] = {}
+    MAX_MODELS = 10
     DYNAMIC_COLUMN_HEADERS_ROW: dict[int, int] = {}
     DYNAMIC_ROW_HEADERS_COLUMN: dict[int, int] = {}
 
@@ -83,6 +231,9 @@ class AXTable:
         thread.daemon = True
         thread.start()
 
+        # The models are only ever modified on the main thread, so they are expired there.
+        GLib.timeout_add_seconds(60, AXTable._clear_expired_models)
+
     @staticmethod
     def _clear_stored_data() -> None:
         """Clears any data we have cached for objects"""
@@ -91,6 +242,16 @@ class AXTable:
             time.sleep(60)
             AXTable._clear_all_dictionaries()
 
+    @staticmethod
+    def _clear_expired_models() -> bool:
+        """Removes the models which have not been used for AXTableModel.MAX_AGE seconds."""
+
+        for model in list(AXTable.MODELS.values()):
+            if model.is_expired():
+                AXTable._remove_model(model)
+
+        return True
+
     @staticmethod
     def _clear_all_dictionaries(reason: str = "") -> None:
         msg = "AXTable: Clearing cache."
@@ -100,18 +261,12 @@ class AXTable:
 
         with AXTable._lock:
             AXTable.CAPTIONS.clear()
-            AXTable.PHYSICAL_COORDINATES_FROM_CELL.clear()
-            AXTable.PHYSICAL_COORDINATES_FROM_TABLE.clear()
-            AXTable.PHYSICAL_SPANS_FROM_CELL.clear()
-            AXTable.PHYSICAL_SPANS_FROM_TABLE.clear()
             AXTable.PHYSICAL_COLUMN_COUNT.clear()
             AXTable.PHYSICAL_ROW_COUNT.clear()
             AXTable.PRESENTABLE_COORDINATES.clear()
             AXTable.PRESENTABLE_COORDINATES_LABELS.clear()
             AXTable.PRESENTABLE_COLUMN_COUNT.clear()
             AXTable.PRESENTABLE_ROW_COUNT.clear()
-            AXTable.COLUMN_HEADERS_FOR_CELL.clear()
-            AXTable.ROW_HEADERS_FOR_CELL.clear()
 
     @staticmethod
     def clear_cache_now(reason: str = "") -> None:
@@ -119,6 +274,97 @@ class AXTable:
 
         AXTable._clear_all_dictionaries(reason)
 
+    @staticmethod
+    def _get_model(table: Optional[Atspi.Accessible]) -> Optional[AXTableModel]:
+        """Returns the model for table, creating it if needed."""
+
+        if table is None:
+            return None
+
+        model = AXTable.MODELS.get(hash(table))
+        if model is not None:
+            model.touch()
+            return model
+
+        if len(AXTable.MODELS) >= AXTable.MAX_MODELS:
+            AXTable._remove_model(next(iter(AXTable.MODELS.values())))
+
+        model = AXTable.MODELS[hash(table)] = AXTableModel(table)
+        return model
+
+    @staticmethod
+    def _get_model_for_cell(
+        cell: Atspi.Accessible,
+        table: Optional[Atspi.Accessible] = None
+    ) -> Optional[AXTableModel]:
+        """Returns the model for the table containing cell, creating it if needed."""
+
+        model = AXTable._find_model_for_cell(cell)
+        if model is not None:
+            return model
+
+        model = AXTable._get_model(table or AXTable.get_table(cell))
+        if model is None:
+            return None
+
+        if model.is_full():
+            AXTable._reset_model(model, "model is full")
+
+        model.add_member(hash(cell))
+        AXTable.MODEL_FOR_CELL[hash(cell)] = model
+        return model
+
+    @staticmethod
+    def _find_model_for_cell(cell: Atspi.Accessible) -> Optional[AXTableModel]:
+        """Returns the existing model for the table containing cell, if any."""
+
+        model = AXTable.MODEL_FOR_CELL.get(hash(cell))
+        if model is not None:
+            model.touch()
+        return model
+
+    @staticmethod
+    def _remove_model(model: AXTableModel) -> None:
+        """Removes model and the cell lookups which refer to it."""
+
+        AXTable.MODELS.pop(hash(model.table), None)
+        for cell_hash in list(model.members):
+            AXTable.MODEL_FOR_CELL.pop(cell_hash, None)
+
+    @staticmethod
+    def _reset_model(model: AXTableModel, reason: str = "") -> None:
+        """Removes everything from model, including the cell lookups which refer to it."""
+
+        for cell_hash in list(model.members):
+            AXTable.MODEL_FOR_CELL.pop(cell_hash, None)
+        model.clear()
+
+        tokens = ["AXTable: Reset model for", model.table, f"({reason})."]
+        debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+
+    @staticmethod
+    def invalidate_model(obj: Atspi.Accessible, reason: str = "", first_row: int = -1) -> None:
+        """Invalidates the model of the table containing obj, or of obj if it is a table.
+        If first_row is non-negative, only rows at and after first_row are invalidated."""
+
+        model = AXTable.MODELS.get(hash(obj)) or AXTable.MODEL_FOR_CELL.get(hash(obj))
+        if model is None and AXUtilitiesRole.is_table_related(obj):
+            model = AXTable.MODELS.get(hash(AXTable.get_table(obj)))
+        if model is None:
+            return
+
+        AXTable.PHYSICAL_ROW_COUNT.pop(hash(model.table), None)
+        AXTable.PHYSICAL_COLUMN_COUNT.pop(hash(model.table), None)
+        if first_row >= 0:
+            for cell_hash in model.invalidate_rows(first_row):
+                AXTable.MODEL_FOR_CELL.pop(cell_hash, None)
+        else:
+            AXTable._reset_model(model, reason)
+
+        tokens = ["AXTable: Invalidated model for", model.table, f"from row {first_row}",
+                  f"({reason}).", str(model)]
+        debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+
     @staticmethod
     def get_caption(table: Atspi.Accessible) -> Optional[Atspi.Accessible]:
         """Returns the accessible object containing the caption of table."""
@@ -349,6 +595,11 @@ class AXTable:
         if not AXObject.supports_table(table):
             return None
 
+        model = AXTable._get_model(table)
+        cell = model.cells.get((row, column)) if model is not None else None
+        if cell is not None and AXObject.is_valid(cell):
+            return cell
+
         try:
             cell = Atspi.Table.get_accessible_at(table, row, column)
         except Exception as error:
@@ -359,6 +610,9 @@ class AXTable:
 
         tokens = [f"AXTable: Cell at row: {row} col: {column} in", table, "is", cell]
         debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+        if cell is not None and model is not None:
+            AXTable._get_model_for_cell(cell, table)
+            model.cells[(row, column)] = cell
         return cell
 
     @staticmethod
@@ -423,8 +677,9 @@ class AXTable:
     def _get_cell_spans_from_table(cell: Atspi.Accessible) -> tuple[int, int]:
         """Returns the row and column spans of cell via the table interface."""
 
-        if hash(cell) in AXTable.PHYSICAL_SPANS_FROM_TABLE:
-            return AXTable.PHYSICAL_SPANS_FROM_TABLE.get(hash(cell), (-1, -1))
+        model = AXTable._find_model_for_cell(cell)
+        if model is not None and hash(cell) in model.spans_from_table:
+            return model.spans_from_table[hash(cell)]
 
         index = AXTable._get_cell_index(cell)
         if index < 0:
@@ -471,15 +726,18 @@ class AXTable:
         tokens = ["AXTable: Table iface spans for", cell,
                   f"are rowspan: {row_span}, colspan: {col_span}"]
         debug.print_tokens(debug.LEVEL_INFO, tokens, True)
-        AXTable.PHYSICAL_SPANS_FROM_TABLE[hash(cell)] = row_span, col_span
+        model = AXTable._get_model_for_cell(cell, table)
+        if model is not None:
+            model.set_spans(hash(cell), (row_span, col_span), from_table=True)
         return row_span, col_span
 
     @staticmethod
     def _get_cell_spans_from_table_cell(cell: Atspi.Accessible) -> tuple[int, int]:
         """Returns the row and column spans of cell via the table cell interface."""
 
-        if hash(cell) in AXTable.PHYSICAL_SPANS_FROM_CELL:
-            return AXTable.PHYSICAL_SPANS_FROM_CELL.get(hash(cell), (-1, -1))
+        model = AXTable._find_model_for_cell(cell)
+        if model is not None and hash(cell) in model.spans_from_cell:
+            return model.spans_from_cell[hash(cell)]
 
         if not AXObject.supports_table_cell(cell):
             return -1, -1
@@ -497,7 +755,9 @@ class AXTable:
         tokens = ["AXTable: TableCell iface spans for", cell,
                   f"are rowspan: {row_span}, colspan: {col_span}"]
         debug.print_tokens(debug.LEVEL_INFO, tokens, True)
-        AXTable.PHYSICAL_SPANS_FROM_CELL[hash(cell)] = row_span, col_span
+        model = AXTable._get_model_for_cell(cell)
+        if model is not None:
+            model.set_spans(hash(cell), (row_span, col_span), from_table=False)
         return row_span, col_span
 
     @staticmethod
@@ -643,14 +903,15 @@ class AXTable:
         # TODO - JD: Figure out what the rest do, and then try to get the implementations
         # aligned.
 
-        result = AXTable.ROW_HEADERS_FOR_CELL.get(hash(cell))
-        if result is not None:
-            return result
+        model = AXTable._get_model_for_cell(cell)
+        if model is not None and hash(cell) in model.row_headers:
+            return model.row_headers[hash(cell)]
 
         result = AXTable._get_row_headers(cell)
         # There either are no headers, or we got all of them.
         if len(result) != 1:
-            AXTable.ROW_HEADERS_FOR_CELL[hash(cell)] = result
+            if model is not None:
+                model.row_headers[hash(cell)] = result
             return result
 
         others = AXTable._get_row_headers(result[0])
@@ -658,7 +919,8 @@ class AXTable:
             result.insert(0, others[0])
             others = AXTable._get_row_headers(result[0])
 
-        AXTable.ROW_HEADERS_FOR_CELL[hash(cell)] = result
+        if model is not None:
+            model.row_headers[hash(cell)] = result
         return result
 
     @staticmethod
@@ -720,14 +982,15 @@ class AXTable:
         # TODO - JD: Figure out what the rest do, and then try to get the implementations
         # aligned.
 
-        result = AXTable.COLUMN_HEADERS_FOR_CELL.get(hash(cell))
-        if result is not None:
-            return result
+        model = AXTable._get_model_for_cell(cell)
+        if model is not None and hash(cell) in model.column_headers:
+            return model.column_headers[hash(cell)]
 
         result = AXTable._get_column_headers(cell)
         # There either are no headers, or we got all of them.
         if len(result) != 1:
-            AXTable.COLUMN_HEADERS_FOR_CELL[hash(cell)] = result
+            if model is not None:
+                model.column_headers[hash(cell)] = result
             return result
 
         others = AXTable._get_column_headers(result[0])
@@ -735,7 +998,8 @@ class AXTable:
             result.insert(0, others[0])
             others = AXTable._get_column_headers(result[0])
 
-        AXTable.COLUMN_HEADERS_FOR_CELL[hash(cell)] = result
+        if model is not None:
+            model.column_headers[hash(cell)] = result
         return result
 
     @staticmethod
@@ -808,8 +1072,9 @@ class AXTable:
     def _get_cell_coordinates_from_table(cell: Atspi.Accessible) -> tuple[int, int]:
         """Returns the row and column indices of cell via the table interface."""
 
-        if hash(cell) in AXTable.PHYSICAL_COORDINATES_FROM_TABLE:
-            return AXTable.PHYSICAL_COORDINATES_FROM_TABLE.get(hash(cell), (-1, -1))
+        model = AXTable._find_model_for_cell(cell)
+        if model is not None and hash(cell) in model.coordinates_from_table:
+            return model.coordinates_from_table[hash(cell)]
 
         index = AXTable._get_cell_index(cell)
         if index < 0:
@@ -831,15 +1096,18 @@ class AXTable:
 
         tokens = ["AXTable: Table iface coords for", cell, f"are row: {row}, col: {column}"]
         debug.print_tokens(debug.LEVEL_INFO, tokens, True)
-        AXTable.PHYSICAL_COORDINATES_FROM_TABLE[hash(cell)] = row, column
+        model = AXTable._get_model_for_cell(cell, table)
+        if model is not None:
+            model.set_coordinates(hash(cell), (row, column), from_table=True)
         return row, column
 
     @staticmethod
     def _get_cell_coordinates_from_table_cell(cell: Atspi.Accessible) -> tuple[int, int]:
         """Returns the row and column indices of cell via the table cell interface."""
 
-        if hash(cell) in AXTable.PHYSICAL_COORDINATES_FROM_CELL:
-            return AXTable.PHYSICAL_COORDINATES_FROM_CELL.get(hash(cell), (-1, -1))
+        model = AXTable._find_model_for_cell(cell)
+        if model is not None and hash(cell) in model.coordinates_from_cell:
+            return model.coordinates_from_cell[hash(cell)]
 
         if not AXObject.supports_table_cell(cell):
             return -1, -1
@@ -857,7 +1125,9 @@ class AXTable:
 
         tokens = ["AXTable: TableCell iface coords for", cell, f"are row: {row}, col: {column}"]
         debug.print_tokens(debug.LEVEL_INFO, tokens, True)
-        AXTable.PHYSICAL_COORDINATES_FROM_CELL[hash(cell)] = row, column
+        model = AXTable._get_model_for_cell(cell)
+        if model is not None:
+            model.set_coordinates(hash(cell), (row, column), from_table=False)
         return row, column
 
     @staticmethod
@@ -1264,6 +1534,66 @@ class AXTable:
 
         return start, end
 
+    @staticmethod
+    def _get_visible_column_range(
+        table: Atspi.Accessible, row: int, column_count: int
+    ) -> tuple[int, int]:
+        """Returns the start and (exclusive) end of the visible columns in table."""
+
+        start, end = AXTable._get_visible_cell_range(table)
+        if 0 <= start[1] <= end[1]:
+            return start[1], min(end[1] + 1, column_count)
+
+        # If hit-testing failed, showing cells could be anywhere in the row.
+        msg = f"AXTable: Visible column range unknown. Examining all of row {row}."
+        debug.print_message(debug.LEVEL_INFO, msg, True)
+        return 0, column_count
+
+    @staticmethod
+    def get_showing_cells_in_row(
+        table: Atspi.Accessible,
+        row: int,
+        start_column: int = 0,
+        end_column: Optional[int] = None,
+        limit_to_visible: bool = False
+    ) -> list[Atspi.Accessible]:
+        """Returns the showing cells in row between start_column and end_column (exclusive).
+
+        Spreadsheets can report thousands of columns, almost all of which are empty and
+        offscreen. Getting each cell and its state costs two round trips per column. So
+        if limit_to_visible is True and the requested range is wider than
+        MAX_FULL_ROW_COLUMNS, only the visible columns are examined. Which cells are
+        showing changes on scroll without any event, so the result is not cached.
+        """
+
+        if row < 0 or not AXObject.supports_table(table):
+            return []
+
+        column_count = AXTable.get_column_count(table, prefer_attribute=False)
+        if end_column is None or end_column > column_count:
+            end_column = column_count
+        start_column = max(0, start_column)
+
+        if limit_to_visible and end_column - start_column > AXTable.MAX_FULL_ROW_COLUMNS:
+            visible_start, visible_end = AXTable._get_visible_column_range(
+                table, row, column_count)
+            start_column = max(start_column, visible_start)
+            end_column = min(end_column, visible_end)
+
+        if start_column >= end_column:
+            return []
+
+        cells = []
+        for column in range(start_column, end_column):
+            cell = AXTable.get_cell_at(table, row, column)
+            if AXObject.has_state(cell, Atspi.StateType.SHOWING):
+                cells.append(cell)
+
+        tokens = [f"AXTable: {len(cells)} showing cells in row {row}, columns "
+                  f"{start_column}-{end_column} of", table]
+        debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+        return cells
+
     @staticmethod
     def iter_visible_cells(table: Atspi.Accessible) -> Generator[Atspi.Accessible, None, None]:
         """Yields the visible cells in table."""
@@ -1277,6 +1607,3 @@ class AXTable:
                 cell = AXTable.get_cell_at(table, row, col)
                 if cell is not None:
                     yield cell
-
-
-AXTable.start_cache_clearing_thread()
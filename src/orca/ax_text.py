@@ -39,11 +39,13 @@ __license__   = "LGPL"
 import enum
 import locale
 import re
+import time
 from typing import Generator, Optional
 
 import gi
 gi.require_version("Atspi", "2.0")
 from gi.repository import Atspi
+from gi.repository import GLib
 
 from . import colornames
 from . import debug
@@ -180,10 +182,265 @@ class AXTextAttribute(enum.Enum):
 
         return False
 
+
+class AXTextMirror:
+    """Client-side copy of the text of an object, kept current via text-changed events."""
+
+    def __init__(self, obj: Atspi.Accessible, lines_are_newline_delimited: bool) -> None:
+        self.obj: Atspi.Accessible = obj
+        self.lines_are_newline_delimited: bool = lines_are_newline_delimited
+        self.text: Optional[str] = None
+        self.saved_calls: int = 0
+        self.resyncs: int = 0
+        self.divergences: int = 0
+        self.last_used: float = time.time()
+
+        # Set when the object loses focus, so that the mirror is verified when next used.
+        self.needs_verification: bool = False
+
+        # Events which were queued while the text was being fetched are dispatched after
+        # the fetch and describe changes which the fetched text already includes. Until
+        # those have been dispatched, each event is checked against the object.
+        self.confirmed: bool = False
+
+    def __str__(self) -> str:
+        length = "stale" if self.text is None else f"{len(self.text)} chars"
+        return (
+            f"AXTextMirror ({length}): {self.saved_calls} calls saved, {self.resyncs} resyncs, "
+            f"{self.divergences} divergences"
+        )
+
+    def sync(self) -> bool:
+        """Fetches the text in bulk if the mirror is stale. Returns False on failure."""
+
+        if self.text is not None:
+            return True
+
+        try:
+            length = Atspi.Text.get_character_count(self.obj)
+            self.text = Atspi.Text.get_text(self.obj, 0, length)
+        except Exception as error:
+            msg = f"AXTextMirror: Exception in sync: {error}"
+            debug.print_message(debug.LEVEL_INFO, msg, True)
+            return False
+
+        self.resyncs += 1
+        self.confirmed = False
+        GLib.idle_add(self._confirm, self.resyncs)
+        return True
+
+    def _confirm(self, generation: int) -> bool:
+        if generation == self.resyncs and self.text is not None:
+            self.confirmed = True
+        return False
+
+    def _check_length(self, change: str) -> None:
+        """Invalidates the mirror if its length differs from that of the object's text."""
+
+        try:
+            length = Atspi.Text.get_character_count(self.obj)
+        except Exception as error:
+            self.invalidate(f"exception checking {change}: {error}")
+            return
+
+        if self.text is not None and length != len(self.text):
+            self.divergences += 1
+            self.invalidate(f"{change} predates sync: {length} chars, mirror has {len(self.text)}")
+
+    def get_text(self) -> str:
+        """Returns the mirrored text. The mirror must be synced."""
+
+        assert self.text is not None
+        self.saved_calls += 1
+        return self.text
+
+    def invalidate(self, reason: str) -> None:
+        """Marks the mirror as stale so that the next access refetches the text."""
+
+        self.text = None
+        tokens = ["AXTextMirror: Invalidating mirror of", self.obj, f"({reason}).", str(self)]
+        debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+
+    def verify(self, sample_size: int) -> bool:
+        """Compares the length and the end of the text with the object's, invalidating the
+        mirror if they differ. Returns False if the mirror was found to be out of date."""
+
+        if self.text is None:
+            return True
+
+        try:
+            length = Atspi.Text.get_character_count(self.obj)
+            tail = Atspi.Text.get_text(self.obj, max(0, length - sample_size), length)
+        except Exception as error:
+            self.invalidate(f"exception in verify: {error}")
+            return False
+
+        if length != len(self.text) or not self.text.endswith(tail):
+            self.divergences += 1
+            self.invalidate(f"verification failed: {length} chars, mirror has {len(self.text)}")
+            return False
+
+        return True
+
+    def insert(self, offset: int, length: int, string: str) -> None:
+        """Applies an insertion event payload to the mirror."""
+
+        if self.text is None:
+            return
+
+        if len(string) != length or not 0 <= offset <= len(self.text):
+            self.invalidate(f"unexpected insertion of {length} chars at {offset}")
+            return
+
+        self.text = self.text[:offset] + string + self.text[offset:]
+        if not self.confirmed:
+            self._check_length(f"insertion of {length} chars at {offset}")
+
+    def delete(self, offset: int, length: int, string: str) -> None:
+        """Applies a deletion event payload to the mirror."""
+
+        if self.text is None:
+            return
+
+        # Without the deleted text, the deletion cannot be validated.
+        if offset < 0 or offset + length > len(self.text) \
+           or self.text[offset:offset + length] != string:
+            self.invalidate(f"unexpected deletion of {length} chars at {offset}")
+            return
+
+        self.text = self.text[:offset] + self.text[offset + length:]
+        if not self.confirmed:
+            self._check_length(f"deletion of {length} chars at {offset}")
+
+    def get_line_at_offset(self, offset: int) -> tuple[str, int, int]:
+        """Returns the newline-delimited line, start, and end for offset."""
+
+        text = self.get_text()
+        offset = min(max(0, offset), len(text))
+        start = text.rfind("\n", 0, offset) + 1
+        end = text.find("\n", offset)
+        end = len(text) if end == -1 else end + 1
+        return text[start:end], start, end
+
+
 class AXText:
     """Utilities for obtaining information about accessible text."""
 
     CACHED_TEXT_SELECTION: dict[int, tuple[str, int, int]] = {}
+    MIRRORS: dict[int, AXTextMirror] = {}
+    MAX_MIRRORS = 5
+    MIRROR_THRESHOLD = 5000
+    MIRROR_IDLE_TIME = 30
+    MIRROR_SAMPLE_SIZE = 100
+
+    @staticmethod
+    def _get_mirror(obj: Atspi.Accessible) -> Optional[AXTextMirror]:
+        """Returns the mirror for obj if there is one. The mirror is verified first if obj
+        lost focus since the mirror was last used, or if the mirror has been idle."""
+
+        if not AXText.MIRRORS:
+            return None
+
+        mirror = AXText.MIRRORS.get(hash(obj))
+        if mirror is None:
+            return None
+
+        now = time.time()
+        if mirror.needs_verification or now - mirror.last_used > AXText.MIRROR_IDLE_TIME:
+            mirror.needs_verification = False
+            mirror.verify(AXText.MIRROR_SAMPLE_SIZE)
+
+        mirror.last_used = now
+        if mirror.sync():
+            return mirror
+
+        AXText.disable_mirror(obj)
+        return None
+
+    @staticmethod
+    def enable_mirror(
+        obj: Atspi.Accessible, lines_are_newline_delimited: Optional[bool] = None
+    ) -> bool:
+        """Keeps a client-side copy of the text of obj, updated from text-changed events."""
+
+        if not AXObject.supports_text(obj):
+            return False
+
+        if hash(obj) in AXText.MIRRORS:
+            return True
+
+        if lines_are_newline_delimited is None:
+            attrs = AXText.get_text_attributes_at_offset(obj, 0)[0]
+            lines_are_newline_delimited = attrs.get("wrap-mode") == "none"
+
+        if len(AXText.MIRRORS) >= AXText.MAX_MIRRORS:
+            AXText.disable_mirror(next(iter(AXText.MIRRORS.values())).obj)
+
+        mirror = AXTextMirror(obj, lines_are_newline_delimited)
+        if not mirror.sync():
+            return False
+
+        AXText.MIRRORS[hash(obj)] = mirror
+        tokens = ["AXText: Mirroring text of", obj, "Newline-delimited lines:",
+                  lines_are_newline_delimited]
+        debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+        return True
+
+    @staticmethod
+    def enable_mirror_if_large(obj: Atspi.Accessible) -> bool:
+        """Mirrors the text of obj if it is multi-line text which is large enough to benefit."""
+
+        if hash(obj) in AXText.MIRRORS:
+            return True
+
+        if not AXUtilitiesState.is_multi_line(obj):
+            return False
+
+        if AXText.get_character_count(obj) < AXText.MIRROR_THRESHOLD:
+            return False
+
+        return AXText.enable_mirror(obj)
+
+    @staticmethod
+    def update_mirrors_for_focus(focus: Atspi.Accessible) -> None:
+        """Flags the mirrors of objects other than focus for verification when next used."""
+
+        for key, mirror in AXText.MIRRORS.items():
+            if key != hash(focus):
+                mirror.needs_verification = True
+
+    @staticmethod
+    def disable_mirror(obj: Atspi.Accessible) -> None:
+        """Stops mirroring the text of obj."""
+
+        mirror = AXText.MIRRORS.pop(hash(obj), None)
+        if mirror is not None:
+            tokens = ["AXText: No longer mirroring text of", obj, str(mirror)]
+            debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+
+    @staticmethod
+    def update_mirror_for_event(event: Atspi.Event) -> None:
+        """Updates the mirror of event.source, if any, based on a text-changed event."""
+
+        if not AXText.MIRRORS:
+            return
+
+        mirror = AXText.MIRRORS.get(hash(event.source))
+        if mirror is None:
+            return
+
+        if event.type.startswith("object:text-changed:insert"):
+            mirror.insert(event.detail1, event.detail2, event.any_data or "")
+        elif event.type.startswith("object:text-changed:delete"):
+            mirror.delete(event.detail1, event.detail2, event.any_data or "")
+        elif event.type.startswith("object:state-changed:defunct"):
+            AXText.disable_mirror(event.source)
+
+    @staticmethod
+    def get_mirror_statistics() -> list[str]:
+        """Returns a description of each active mirror, including saved round trips."""
+
+        return [str(mirror) for mirror in AXText.MIRRORS.values()]
 
     @staticmethod
     def get_character_at_offset(
@@ -203,6 +460,11 @@ class AXText:
             debug.print_message(debug.LEVEL_INFO, msg, True)
             return "", 0, 0
 
+        mirror = AXText._get_mirror(obj)
+        if mirror is not None:
+            character = mirror.get_text()[offset:offset + 1]
+            return character, offset, offset + len(character)
+
         try:
             result = Atspi.Text.get_string_at_offset(obj, offset, Atspi.TextGranularity.CHAR)
         except Exception as error:
@@ -338,6 +600,11 @@ class AXText:
             offset = min(max(0, offset), length - 1)
         else:
             offset = max(0, offset)
+
+        mirror = AXText._get_mirror(obj)
+        if mirror is not None and mirror.lines_are_newline_delimited:
+            return mirror.get_line_at_offset(offset)
+
         try:
             result = Atspi.Text.get_string_at_offset(obj, offset, Atspi.TextGranularity.LINE)
         except Exception as error:
@@ -547,6 +814,10 @@ class AXText:
         if not AXObject.supports_text(obj):
             return 0
 
+        mirror = AXText._get_mirror(obj)
+        if mirror is not None:
+            return len(mirror.get_text())
+
         try:
             count = Atspi.Text.get_character_count(obj)
         except Exception as error:
@@ -616,6 +887,10 @@ class AXText:
         if end_offset == -1:
             end_offset = AXText.get_character_count(obj)
 
+        mirror = AXText._get_mirror(obj)
+        if mirror is not None:
+            return mirror.get_text()[max(0, start_offset):end_offset]
+
         try:
             result = Atspi.Text.get_text(obj, start_offset, end_offset)
         except Exception as error:
@@ -636,6 +911,10 @@ class AXText:
         if not length:
             return ""
 
+        mirror = AXText._get_mirror(obj)
+        if mirror is not None:
+            return mirror.get_text()
+
         try:
             result = Atspi.Text.get_text(obj, 0, length)
         except Exception as error:
@@ -99,15 +99,24 @@ class AXUtilities:
             AXUtilities.DISPLAYED_LABEL.clear()
 
     @staticmethod
-    def clear_all_cache_now(obj: Optional[Atspi.Accessible] = None, reason: str = "") -> None:
-        """Clears all cached information immediately."""
+    def clear_all_cache_now(
+        obj: Optional[Atspi.Accessible] = None,
+        reason: str = "",
+        structure_changed: bool = True
+    ) -> None:
+        """Clears all cached information immediately. If structure_changed is False,
+        only the cached relations involving obj are cleared."""
 
         AXUtilities._clear_all_dictionaries(reason)
         AXObject.clear_cache_now(reason)
-        AXUtilitiesRelation.clear_cache_now(reason)
+        if obj is None or structure_changed:
+            AXUtilitiesRelation.clear_cache_now(reason)
+        else:
+            AXUtilitiesRelation.clear_relation_cache_for(obj, reason)
         AXUtilitiesEvent.clear_cache_now(reason)
         if AXUtilitiesRole.is_table_related(obj):
             AXTable.clear_cache_now(reason)
+            AXTable.invalidate_model(obj, reason)
 
     @staticmethod
     def can_be_active_window(window: Atspi.Accessible) -> bool:
@@ -790,5 +799,3 @@ for method_name, method in inspect.getmembers(AXUtilitiesState, predicate=inspec
 for method_name, method in inspect.getmembers(AXUtilitiesCollection, predicate=inspect.isfunction):
     if method_name.startswith("find"):
         setattr(AXUtilities, method_name, method)
-
-AXUtilities.start_cache_clearing_thread()
@@ -49,7 +49,9 @@ class AXUtilities:
     # From ax_utilities.py
     @staticmethod
     def clear_all_cache_now(
-        obj: Optional[Atspi.Accessible] = None, reason: str = ""
+        obj: Optional[Atspi.Accessible] = None,
+        reason: str = "",
+        structure_changed: bool = True
     ) -> None: ...
 
     @staticmethod
@@ -180,6 +182,9 @@ class AXUtilities:
         app: Atspi.Accessible
     ) -> bool: ...
 
+    @staticmethod
+    def update_application_registry_for_event(event: Atspi.Event) -> None: ...
+
     # From ax_utilities_event.py
     @staticmethod
     def save_object_info_for_events(
@@ -1666,6 +1671,20 @@ class AXUtilities:
     def supports_autocompletion(obj: Atspi.Accessible) -> bool: ...
 
     # From ax_utilities_collection.py
+    @staticmethod
+    def find_all_in_buckets(
+        root: Atspi.Accessible,
+        buckets: dict[
+            str,
+            tuple[
+                Optional[list[Atspi.Role]],
+                Optional[list[Atspi.StateType]],
+                Optional[Callable[[Atspi.Accessible], bool]]
+            ]
+        ],
+        exclusive: bool = True
+    ) -> dict[str, list[Atspi.Accessible]]: ...
+
     @staticmethod
     def find_all_with_interfaces(
         root: Atspi.Accessible,
@@ -2811,6 +2830,26 @@ class AXUtilities:
         relation_type: Atspi.ReleationType
     ) -> list[Atspi.Accessible]: ...
 
+    @staticmethod
+    def clear_relation_cache_for(
+        obj: Atspi.Accessible,
+        reason: str = ""
+    ) -> None: ...
+
+    @staticmethod
+    def update_relation_cache_for_event(
+        event: Atspi.Event
+    ) -> None: ...
+
+    @staticmethod
+    def get_relation_cache_statistics() -> str: ...
+
+    @staticmethod
+    def get_objects_with_relation_to(
+        target: Atspi.Accessible,
+        relation_type: Atspi.RelationType
+    ) -> list[Atspi.Accessible]: ...
+
     @staticmethod
     def get_is_controlled_by(
         obj: Atspi.Accessible
@@ -31,7 +31,7 @@ __copyright__ = "Copyright (c) 2023-2024 Igalia, S.L." \
                 "Copyright (c) 2024 GNOME Foundation Inc."
 __license__   = "LGPL"
 
-import subprocess
+import time
 from typing import Optional
 
 import gi
@@ -39,11 +39,131 @@ gi.require_version("Atspi", "2.0")
 from gi.repository import Atspi
 
 from . import debug
+from . import process_health_monitor
 from .ax_object import AXObject
 
 class AXUtilitiesApplication:
     """Utilities for obtaining information about accessible applications."""
 
+    # The registry of the desktop's applications is kept up to date from the desktop's
+    # children-changed events. It is resynchronized when a lookup misses, at most once every
+    # MIN_RESYNC_INTERVAL seconds, and if the desktop's child count no longer matches, which
+    # is checked at most once every CHECK_INTERVAL seconds.
+    APPLICATIONS: dict[int, Atspi.Accessible] = {}
+    APPLICATION_PIDS: dict[int, int] = {}
+    APPLICATIONS_BY_PID: dict[int, Atspi.Accessible] = {}
+    TOOLKIT_NAMES: dict[int, str] = {}
+    DESKTOP_CHILD_COUNT: int = -1
+    LAST_CHECK_TIME: float = 0.0
+    CHECK_INTERVAL = 60
+    MIN_RESYNC_INTERVAL = 5
+
+    @staticmethod
+    def _register_application(app: Atspi.Accessible) -> None:
+        if AXObject.get_name(app) == "mutter-x11-frames":
+            return
+
+        AXUtilitiesApplication.APPLICATIONS[hash(app)] = app
+        pid = AXUtilitiesApplication.get_process_id(app)
+        if pid != -1:
+            AXUtilitiesApplication.APPLICATION_PIDS[hash(app)] = pid
+            AXUtilitiesApplication.APPLICATIONS_BY_PID[pid] = app
+
+    @staticmethod
+    def _unregister_application(app: Atspi.Accessible) -> None:
+        # The app may already be dead, so its pid has to come from the registry.
+        AXUtilitiesApplication.APPLICATIONS.pop(hash(app), None)
+        AXUtilitiesApplication.TOOLKIT_NAMES.pop(hash(app), None)
+        pid = AXUtilitiesApplication.APPLICATION_PIDS.pop(hash(app), -1)
+        if AXUtilitiesApplication.APPLICATIONS_BY_PID.get(pid) == app:
+            AXUtilitiesApplication.APPLICATIONS_BY_PID.pop(pid)
+
+    @staticmethod
+    def _sync_application_registry(reason: str = "") -> None:
+        AXUtilitiesApplication.APPLICATIONS.clear()
+        AXUtilitiesApplication.APPLICATION_PIDS.clear()
+        AXUtilitiesApplication.APPLICATIONS_BY_PID.clear()
+        AXUtilitiesApplication.TOOLKIT_NAMES.clear()
+        AXUtilitiesApplication.DESKTOP_CHILD_COUNT = -1
+        AXUtilitiesApplication.LAST_CHECK_TIME = time.time()
+
+        desktop = AXUtilitiesApplication.get_desktop()
+        if desktop is None:
+            return
+
+        for app in AXObject.iter_children(desktop):
+            AXUtilitiesApplication._register_application(app)
+        AXUtilitiesApplication.DESKTOP_CHILD_COUNT = AXObject.get_child_count(desktop)
+
+        msg = (
+            f"AXUtilitiesApplication: Registry synchronized ({reason}). "
+            f"{len(AXUtilitiesApplication.APPLICATIONS)} apps."
+        )
+        debug.print_message(debug.LEVEL_INFO, msg, True)
+
+    @staticmethod
+    def _ensure_application_registry() -> None:
+        if AXUtilitiesApplication.DESKTOP_CHILD_COUNT == -1:
+            AXUtilitiesApplication._sync_application_registry("registry is empty")
+            return
+
+        now = time.time()
+        if now - AXUtilitiesApplication.LAST_CHECK_TIME < AXUtilitiesApplication.CHECK_INTERVAL:
+            return
+
+        AXUtilitiesApplication.LAST_CHECK_TIME = now
+        desktop = AXUtilitiesApplication.get_desktop()
+        if desktop is None:
+            return
+
+        count = AXObject.get_child_count(desktop)
+        if count != AXUtilitiesApplication.DESKTOP_CHILD_COUNT:
+            reason = (
+                f"desktop has {count} children; "
+                f"expected {AXUtilitiesApplication.DESKTOP_CHILD_COUNT}"
+            )
+            AXUtilitiesApplication._sync_application_registry(reason)
+
+    @staticmethod
+    def _resync_application_registry_after_miss(reason: str) -> bool:
+        """Resynchronizes the registry unless that was done very recently. Returns True if
+        the registry was resynchronized."""
+
+        elapsed = time.time() - AXUtilitiesApplication.LAST_CHECK_TIME
+        if elapsed < AXUtilitiesApplication.MIN_RESYNC_INTERVAL:
+            return False
+
+        AXUtilitiesApplication._sync_application_registry(reason)
+        return True
+
+    @staticmethod
+    def update_application_registry_for_event(event: Atspi.Event) -> None:
+        """Updates the registry of applications based on a desktop children-changed event."""
+
+        if not event.type.startswith("object:children-changed"):
+            return
+
+        if AXUtilitiesApplication.DESKTOP_CHILD_COUNT == -1:
+            return
+
+        if event.source != AXUtilitiesApplication.get_desktop():
+            return
+
+        app = event.any_data
+        if app is None:
+            AXUtilitiesApplication.DESKTOP_CHILD_COUNT = -1
+            return
+
+        if event.type.startswith("object:children-changed:add"):
+            AXUtilitiesApplication._register_application(app)
+            AXUtilitiesApplication.DESKTOP_CHILD_COUNT += 1
+        elif event.type.startswith("object:children-changed:remove"):
+            AXUtilitiesApplication._unregister_application(app)
+            AXUtilitiesApplication.DESKTOP_CHILD_COUNT -= 1
+
+        tokens = ["AXUtilitiesApplication: Registry updated for", event.type, app]
+        debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+
     @staticmethod
     def application_as_string(obj: Atspi.Accessible) -> str:
         """Returns the application details of obj as a string."""
@@ -105,6 +225,10 @@ class AXUtilitiesApplication:
         if app is None:
             return ""
 
+        name = AXUtilitiesApplication.TOOLKIT_NAMES.get(hash(app))
+        if name is not None:
+            return name
+
         try:
             name = Atspi.Accessible.get_toolkit_name(app)
         except Exception as error:
@@ -112,6 +236,8 @@ class AXUtilitiesApplication:
             debug.print_message(debug.LEVEL_INFO, msg, True)
             return ""
 
+        if hash(app) in AXUtilitiesApplication.APPLICATIONS:
+            AXUtilitiesApplication.TOOLKIT_NAMES[hash(app)] = name
         return name
 
     @staticmethod
@@ -135,10 +261,13 @@ class AXUtilitiesApplication:
     def get_application_with_pid(pid: int) -> Optional[Atspi.Accessible]:
         """Returns the accessible application with the specified pid"""
 
-        applications = AXUtilitiesApplication.get_all_applications()
-        for child in applications:
-            if AXUtilitiesApplication.get_process_id(child) == pid:
-                return child
+        AXUtilitiesApplication._ensure_application_registry()
+        app = AXUtilitiesApplication.APPLICATIONS_BY_PID.get(pid)
+        if app is None and AXUtilitiesApplication._resync_application_registry_after_miss(
+                f"no app with pid {pid}"):
+            app = AXUtilitiesApplication.APPLICATIONS_BY_PID.get(pid)
+        if app is not None:
+            return app
 
         tokens = ["WARNING: app with pid", pid, "is not in the accessible desktop"]
         debug.print_tokens(debug.LEVEL_INFO, tokens, True)
@@ -174,10 +303,13 @@ class AXUtilitiesApplication:
     def is_application_in_desktop(app: Atspi.Accessible) -> bool:
         """Returns true if app is known to Atspi"""
 
-        applications = AXUtilitiesApplication.get_all_applications()
-        for child in applications:
-            if child == app:
-                return True
+        AXUtilitiesApplication._ensure_application_registry()
+        if hash(app) in AXUtilitiesApplication.APPLICATIONS:
+            return True
+
+        if AXUtilitiesApplication._resync_application_registry_after_miss("app not found") \
+           and hash(app) in AXUtilitiesApplication.APPLICATIONS:
+            return True
 
         tokens = ["WARNING:", app, "is not in the accessible desktop"]
         debug.print_tokens(debug.LEVEL_INFO, tokens, True)
@@ -188,22 +320,4 @@ class AXUtilitiesApplication:
         """Returns true if app's process is known to be unresponsive."""
 
         pid = AXUtilitiesApplication.get_process_id(app)
-        try:
-            state = subprocess.getoutput(f"cat /proc/{pid}/status | grep State")
-            state = state.split()[1]
-        except Exception as error:
-            tokens = [f"AXUtilitiesApplication: Exception checking state of pid {pid}: {error}"]
-            debug.print_tokens(debug.LEVEL_INFO, tokens, True)
-            return False
-
-        if state == "Z":
-            tokens = [f"AXUtilitiesApplication: pid {pid} is zombie process"]
-            debug.print_tokens(debug.LEVEL_INFO, tokens, True)
-            return True
-
-        if state == "T":
-            tokens = [f"AXUtilitiesApplication: pid {pid} is suspended/stopped process"]
-            debug.print_tokens(debug.LEVEL_INFO, tokens, True)
-            return True
-
-        return False
+        return process_health_monitor.get_monitor().is_unresponsive(pid)
@@ -47,6 +47,14 @@ from .ax_utilities_relation import AXUtilitiesRelation
 from .ax_utilities_role import AXUtilitiesRole
 from .ax_utilities_state import AXUtilitiesState
 
+# An object belongs in a bucket if it has any of the bucket's roles, all of the bucket's
+# states, and satisfies the bucket's predicate. Criteria which are None are ignored.
+MatchBucket = tuple[
+    Optional[list[Atspi.Role]],
+    Optional[list[Atspi.StateType]],
+    Optional[Callable[[Atspi.Accessible], bool]]
+]
+
 
 class AXUtilitiesCollection:
     """Utilities for finding all objects that meet a certain criteria."""
@@ -112,6 +120,56 @@ class AXUtilitiesCollection:
 
         return matches
 
+    @staticmethod
+    def find_all_in_buckets(
+        root: Atspi.Accessible,
+        buckets: dict[str, MatchBucket],
+        exclusive: bool = True
+    ) -> dict[str, list[Atspi.Accessible]]:
+        """Returns the descendants of root sorted into the named buckets using a single
+        query. If exclusive is True, each object is only added to the first bucket it fits."""
+
+        result: dict[str, list[Atspi.Accessible]] = {name: [] for name in buckets}
+        if not (root and buckets):
+            return result
+
+        role_list: set[Atspi.Role] = set()
+        for roles, _states, _pred in buckets.values():
+            if not roles:
+                role_list.clear()
+                break
+            role_list.update(roles)
+
+        tokens = ["AXUtilitiesCollection:", inspect.currentframe(),
+                  "Root:", root, "buckets:", list(buckets.keys())]
+        debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+
+        rule = AXCollection.create_match_rule(roles=list(role_list))
+        matches = AXCollection.get_all_matches(root, rule)
+
+        start = time.time()
+        for obj in matches:
+            role = AXObject.get_role(obj)
+            state_set = None
+            for name, (roles, states, pred) in buckets.items():
+                if roles and role not in roles:
+                    continue
+                if states:
+                    if state_set is None:
+                        state_set = AXObject.get_state_set(obj)
+                    if not all(state_set.contains(state) for state in states):
+                        continue
+                if pred is not None and not pred(obj):
+                    continue
+                result[name].append(obj)
+                if exclusive:
+                    break
+
+        counts = ", ".join(f"{name}: {len(objs)}" for name, objs in result.items())
+        msg = f"AXUtilitiesCollection: Sorted into buckets in {time.time() - start:.4f}s. {counts}"
+        debug.print_message(debug.LEVEL_INFO, msg, True)
+        return result
+
     @staticmethod
     def find_all_with_interfaces(
         root: Atspi.Accessible,
@@ -710,6 +710,3 @@ class AXUtilitiesEvent:
         msg = "AXUtilitiesEvent: Event is presentable."
         debug.print_message(debug.LEVEL_INFO, msg, True)
         return True
-
-
-AXUtilitiesEvent.start_cache_clearing_thread()
@@ -51,6 +51,31 @@ class AXUtilitiesRelation:
     RELATIONS: dict[int, list[Atspi.Relation]] = {}
     TARGETS: dict[int, dict[Atspi.RelationType, list[Atspi.Accessible]]] = {}
 
+    # The reverse index: for each target, the objects whose cached relations include it.
+    SOURCES: dict[int, dict[Atspi.RelationType, dict[int, Atspi.Accessible]]] = {}
+
+    HITS: int = 0
+    MISSES: int = 0
+
+    RECIPROCAL_TYPES = {
+        Atspi.RelationType.CONTROLLED_BY: Atspi.RelationType.CONTROLLER_FOR,
+        Atspi.RelationType.CONTROLLER_FOR: Atspi.RelationType.CONTROLLED_BY,
+        Atspi.RelationType.DESCRIBED_BY: Atspi.RelationType.DESCRIPTION_FOR,
+        Atspi.RelationType.DESCRIPTION_FOR: Atspi.RelationType.DESCRIBED_BY,
+        Atspi.RelationType.DETAILS: Atspi.RelationType.DETAILS_FOR,
+        Atspi.RelationType.DETAILS_FOR: Atspi.RelationType.DETAILS,
+        Atspi.RelationType.EMBEDDED_BY: Atspi.RelationType.EMBEDS,
+        Atspi.RelationType.EMBEDS: Atspi.RelationType.EMBEDDED_BY,
+        Atspi.RelationType.ERROR_FOR: Atspi.RelationType.ERROR_MESSAGE,
+        Atspi.RelationType.ERROR_MESSAGE: Atspi.RelationType.ERROR_FOR,
+        Atspi.RelationType.FLOWS_FROM: Atspi.RelationType.FLOWS_TO,
+        Atspi.RelationType.FLOWS_TO: Atspi.RelationType.FLOWS_FROM,
+        Atspi.RelationType.LABEL_FOR: Atspi.RelationType.LABELLED_BY,
+        Atspi.RelationType.LABELLED_BY: Atspi.RelationType.LABEL_FOR,
+        Atspi.RelationType.NODE_CHILD_OF: Atspi.RelationType.NODE_PARENT_OF,
+        Atspi.RelationType.NODE_PARENT_OF: Atspi.RelationType.NODE_CHILD_OF,
+    }
+
     _lock = threading.Lock()
 
     @staticmethod
@@ -71,6 +96,7 @@ class AXUtilitiesRelation:
         with AXUtilitiesRelation._lock:
             AXUtilitiesRelation.RELATIONS.clear()
             AXUtilitiesRelation.TARGETS.clear()
+            AXUtilitiesRelation.SOURCES.clear()
 
     @staticmethod
     def clear_cache_now(reason: str = "") -> None:
@@ -86,6 +112,59 @@ class AXUtilitiesRelation:
         thread.daemon = True
         thread.start()
 
+    @staticmethod
+    def clear_relation_cache_for(obj: Atspi.Accessible, reason: str = "") -> None:
+        """Clears the cached relations of obj and of the objects which have obj as a target."""
+
+        key = hash(obj)
+        with AXUtilitiesRelation._lock:
+            AXUtilitiesRelation.RELATIONS.pop(key, None)
+            for relation_type, targets in AXUtilitiesRelation.TARGETS.pop(key, {}).items():
+                for target in targets:
+                    sources = AXUtilitiesRelation.SOURCES.get(hash(target), {})
+                    sources.get(relation_type, {}).pop(key, None)
+
+            # The reverse relations of these objects may also have changed. Their stale
+            # entries elsewhere in the reverse index are verified before being used.
+            for sources in AXUtilitiesRelation.SOURCES.pop(key, {}).values():
+                for source_key in sources:
+                    AXUtilitiesRelation.RELATIONS.pop(source_key, None)
+                    AXUtilitiesRelation.TARGETS.pop(source_key, None)
+
+        if reason:
+            tokens = ["AXUtilitiesRelation: Cleared cache for", obj, f"Reason: {reason}"]
+            debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+
+    @staticmethod
+    def update_relation_cache_for_event(event: Atspi.Event) -> None:
+        """Clears the cached relations affected by event, if any."""
+
+        if not (AXUtilitiesRelation.RELATIONS or AXUtilitiesRelation.TARGETS):
+            return
+
+        event_type = event.type
+        if event_type.startswith("object:children-changed:remove"):
+            if event.any_data is not None:
+                AXUtilitiesRelation.clear_relation_cache_for(event.any_data, event_type)
+        elif event_type.startswith("object:attributes-changed") \
+           or event_type.startswith("object:property-change:accessible-name") \
+           or event_type.startswith("object:property-change:accessible-description") \
+           or event_type.startswith("object:state-changed:defunct"):
+            AXUtilitiesRelation.clear_relation_cache_for(event.source, event_type)
+
+    @staticmethod
+    def get_relation_cache_statistics() -> str:
+        """Returns a summary of the size and effectiveness of the relation cache."""
+
+        total = max(1, AXUtilitiesRelation.HITS + AXUtilitiesRelation.MISSES)
+        return (
+            f"{len(AXUtilitiesRelation.RELATIONS)} relation sets, "
+            f"{len(AXUtilitiesRelation.TARGETS)} objects with targets, "
+            f"{len(AXUtilitiesRelation.SOURCES)} reverse entries. "
+            f"{AXUtilitiesRelation.HITS} hits, {AXUtilitiesRelation.MISSES} misses "
+            f"({100 * AXUtilitiesRelation.HITS / total:.1f}% hits)"
+        )
+
     @staticmethod
     def get_relations(obj: Atspi.Accessible) -> list[Atspi.Relation]:
         """Returns the list of Atspi.Relation objects associated with obj"""
@@ -95,8 +174,10 @@ class AXUtilitiesRelation:
 
         relations = AXUtilitiesRelation.RELATIONS.get(hash(obj))
         if relations is not None:
+            AXUtilitiesRelation.HITS += 1
             return relations
 
+        AXUtilitiesRelation.MISSES += 1
         try:
             relations = Atspi.Accessible.get_relation_set(obj)
         except Exception as error:
@@ -138,8 +219,10 @@ class AXUtilitiesRelation:
         cached_targets = AXUtilitiesRelation.TARGETS.get(hash(obj), {})
         cached_relation = cached_targets.get(relation_type)
         if isinstance(cached_relation, list):
+            AXUtilitiesRelation.HITS += 1
             return cached_relation
 
+        AXUtilitiesRelation.MISSES += 1
         relation = AXUtilitiesRelation._get_relation(obj, relation_type)
         if relation is None:
             cached_targets[relation_type] = []
@@ -161,6 +244,34 @@ class AXUtilitiesRelation:
         result = list(targets)
         cached_targets[relation_type] = result
         AXUtilitiesRelation.TARGETS[hash(obj)] = cached_targets
+        for target in result:
+            sources = AXUtilitiesRelation.SOURCES.setdefault(hash(target), {})
+            sources.setdefault(relation_type, {})[hash(obj)] = obj
+        return result
+
+    @staticmethod
+    def get_objects_with_relation_to(
+        target: Atspi.Accessible,
+        relation_type: Atspi.RelationType
+    ) -> list[Atspi.Accessible]:
+        """Returns the objects which have target in their relation_type targets. This is
+        based on target's reciprocal relation and on the relations which have been cached,
+        i.e. it does not search the accessibility tree."""
+
+        result = []
+        reciprocal_type = AXUtilitiesRelation.RECIPROCAL_TYPES.get(relation_type)
+        if reciprocal_type is not None:
+            result = AXUtilitiesRelation._get_relation_targets(target, reciprocal_type)
+
+        sources = AXUtilitiesRelation.SOURCES.get(hash(target), {}).get(relation_type, {})
+        for source in list(sources.values()):
+            if source in result:
+                continue
+            if target in AXUtilitiesRelation._get_relation_targets(source, relation_type):
+                result.append(source)
+
+        tokens = ["AXUtilitiesRelation:", result, "have", relation_type, "relation to", target]
+        debug.print_tokens(debug.LEVEL_INFO, tokens, True)
         return result
 
     @staticmethod
@@ -376,5 +487,3 @@ class AXUtilitiesRelation:
         """Returns True if obj does not have any relations."""
 
         return not AXUtilitiesRelation.get_relations(obj)
-
-AXUtilitiesRelation.start_cache_clearing_thread()
@@ -204,5 +204,3 @@ class AXValue:
         tokens = ["AXValue: Maximum value of", obj, f"is {value}"]
         debug.print_tokens(debug.LEVEL_INFO, tokens, True)
         return value
-
-AXValue.start_cache_clearing_thread()
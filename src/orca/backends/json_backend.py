@@ -27,8 +27,10 @@ __date__      = "$Date$"
 __copyright__ = "Copyright (c) 2010-2011 Consorcio Fernando de los Rios."
 __license__   = "LGPL"
 
-from json import load, dump
+import copy
+from json import dumps, load, loads
 import os
+import tempfile
 from orca import settings, acss
 
 class Backend:
@@ -43,6 +45,12 @@ class Backend:
         self.settingsFile = os.path.join(prefsDir, "user-settings.conf")
         self.appPrefsDir = os.path.join(prefsDir, "app-settings")
 
+        # Parsed files, keyed by file name, along with the (mtime, size, inode)
+        # of the file when it was parsed.
+        self._cache = {}
+        self.readCount = 0
+        self.writeCount = 0
+
         self._defaultProfiles = {'default': { 'profile':  settings.profile,
                                                           'pronunciations': {},
                                                           'keybindings': {}
@@ -62,16 +70,62 @@ class Backend:
         self.pronunciations = pronunciations
         self.keybindings = keybindings
 
-        settingsFile = open(self.settingsFile, 'w')
-        dump(prefs, settingsFile, indent=4)
-        settingsFile.close()
+        self._writeFile(self.settingsFile, prefs)
+
+    @staticmethod
+    def _getFileKey(fileName):
+        stat = os.stat(fileName)
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _readFile(self, fileName):
+        """ Returns a copy of the parsed contents of fileName, which is
+            only read from disk if it changed since it was last read. """
+        key = self._getFileKey(fileName)
+        cached = self._cache.get(fileName)
+        if cached is None or cached[0] != key:
+            with open(fileName, 'r') as settingsFile:
+                prefs = load(settingsFile)
+            self.readCount += 1
+            cached = self._cache[fileName] = key, prefs
+
+        # Callers modify what they are given, e.g. when converting voices.
+        return copy.deepcopy(cached[1])
+
+    def _writeFile(self, fileName, prefs):
+        """ Writes prefs to a temporary file which then replaces fileName,
+            so that fileName is never left partially written. If fileName
+            is a symbolic link, the file it points to is replaced. """
+        text = dumps(prefs, indent=4)
+        targetName = os.path.realpath(fileName)
+        fd, tempName = tempfile.mkstemp(dir=os.path.dirname(targetName),
+                                        prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as settingsFile:
+                settingsFile.write(text)
+                settingsFile.flush()
+                os.fsync(settingsFile.fileno())
+            # The temporary file is only readable by the user. Keep the
+            # permissions of an existing file, should they differ.
+            if os.path.exists(targetName):
+                os.chmod(tempName, os.stat(targetName).st_mode & 0o777)
+            os.replace(tempName, targetName)
+        except BaseException:
+            if os.path.exists(tempName):
+                os.remove(tempName)
+            raise
+
+        self.writeCount += 1
+        self._cache[fileName] = self._getFileKey(fileName), loads(text)
+
+    def get_io_counts(self):
+        """ Returns the number of settings files read from and written to
+            disk, e.g. to verify that unchanged files are not reread. """
+        return {'reads': self.readCount, 'writes': self.writeCount}
 
     def get_app_settings(self, appName):
         fileName = os.path.join(self.appPrefsDir, f"{appName}.conf")
         if os.path.exists(fileName):
-            settingsFile = open(fileName, 'r')
-            prefs = load(settingsFile)
-            settingsFile.close()
+            prefs = self._readFile(fileName)
         else:
             prefs = {}
 
@@ -86,9 +140,7 @@ class Backend:
         prefs['profiles'] = profiles
 
         fileName = os.path.join(self.appPrefsDir, f"{appName}.conf")
-        settingsFile = open(fileName, 'w')
-        dump(prefs, settingsFile, indent=4)
-        settingsFile.close()
+        self._writeFile(fileName, prefs)
 
     def saveProfileSettings(self, profile, general,
                                   pronunciations, keybindings):
@@ -100,18 +152,14 @@ class Backend:
         general['pronunciations'] = pronunciations
         general['keybindings'] = keybindings
 
-        with open(self.settingsFile, 'r+') as settingsFile:
-            prefs = load(settingsFile)
-            prefs['profiles'][profile] = general
-            settingsFile.seek(0)
-            settingsFile.truncate()
-            dump(prefs, settingsFile, indent=4)
+        prefs = self._readFile(self.settingsFile)
+        prefs['profiles'][profile] = general
+        self._writeFile(self.settingsFile, prefs)
 
     def _getSettings(self):
         """ Load from config file all settings """
-        settingsFile = open(self.settingsFile)
         try:
-            prefs = load(settingsFile)
+            prefs = self._readFile(self.settingsFile)
         except ValueError:
             return
         self.general = prefs['general'].copy()
@@ -169,12 +217,9 @@ class Backend:
     def _setProfileKey(self, key, value):
         self.general[key] = value
 
-        with open(self.settingsFile, 'r+') as settingsFile:
-            prefs = load(settingsFile)
-            prefs['general'][key] = value
-            settingsFile.seek(0)
-            settingsFile.truncate()
-            dump(prefs, settingsFile, indent=4)
+        prefs = self._readFile(self.settingsFile)
+        prefs['general'][key] = value
+        self._writeFile(self.settingsFile, prefs)
 
     def available_profiles(self):
         """ List available profiles. """
@@ -199,10 +244,7 @@ class Backend:
         if profile in self.profiles:
             removeProfileFrom(self.profiles)
 
-        with open(self.settingsFile, 'r+') as settingsFile:
-            prefs = load(settingsFile)
-            if profile in prefs['profiles']:
-                removeProfileFrom(prefs['profiles'])
-                settingsFile.seek(0)
-                settingsFile.truncate()
-                dump(prefs, settingsFile, indent=4)
+        prefs = self._readFile(self.settingsFile)
+        if profile in prefs['profiles']:
+            removeProfileFrom(prefs['profiles'])
+            self._writeFile(self.settingsFile, prefs)
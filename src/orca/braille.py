@@ -34,6 +34,7 @@ __license__   = "LGPL"
 import locale
 import os
 import re
+from collections import OrderedDict
 
 from gi.repository import GLib
 
@@ -151,6 +152,22 @@ _regionWithFocus = None
 #
 _lastTextInfo = (None, 0, 0, 0)
 
+# The cells last written to BrlAPI: (text, cursor cell, attribute mask). Used to
+# avoid rewriting the display when nothing on it would change. Reset to None
+# whenever the display contents might no longer match what we last wrote.
+#
+_lastWrite = None
+
+# Recently-computed liblouis translations, keyed by (table, text, cursor offset,
+# mode), in least-recently-used order. Regions are frequently recreated for the
+# same text (e.g. each time the caret moves within a line), and contracting the
+# line again is pointless.
+#
+_contractionCache = OrderedDict()
+_CONTRACTION_CACHE_SIZE = 500
+_contractionCacheHits = 0
+_contractionCacheMisses = 0
+
 # The viewport is a rectangular region of size _displaySize whose upper left
 # corner is defined by the point (x, line number).  As such, the viewport is
 # identified solely by its upper left point.
@@ -300,6 +317,47 @@ if louis:
     tokens = ["BRAILLE: Default contraction table is:", _defaultContractionTable]
     debug.print_tokens(debug.LEVEL_INFO, tokens, True)
 
+def _translate(table, line, cursorOffset, mode):
+    """Returns the liblouis translation of line, using the cached result if
+    the same text was recently translated with the same table, cursor offset,
+    and mode. The returned inPos and outPos lists are shared and must not be
+    modified by the caller."""
+
+    global _contractionCacheHits
+    global _contractionCacheMisses
+
+    key = table, line, cursorOffset, mode
+    result = _contractionCache.get(key)
+    if result is not None:
+        _contractionCacheHits += 1
+        _contractionCache.move_to_end(key)
+        return result
+
+    _contractionCacheMisses += 1
+    result = tuple(louis.translate([table], line, cursorPos=cursorOffset, mode=mode))
+    _contractionCache[key] = result
+    if len(_contractionCache) > _CONTRACTION_CACHE_SIZE:
+        _contractionCache.popitem(last=False)
+
+    return result
+
+def clearContractionCache():
+    """Clears the cached liblouis translations, e.g. because the tables changed."""
+
+    msg = (
+        f"BRAILLE: Clearing contraction cache. Size: {len(_contractionCache)} "
+        f"Hits: {_contractionCacheHits} Misses: {_contractionCacheMisses}"
+    )
+    debug.print_message(debug.LEVEL_INFO, msg, True)
+    _contractionCache.clear()
+
+def _invalidateLastWrite():
+    """Forces the next refresh to write to the display, even if the cells are
+    unchanged. Needed when something other than refresh changed the display."""
+
+    global _lastWrite
+    _lastWrite = None
+
 class Region:
     """A Braille region to be displayed on the display.  The width of
     each region is determined by its string.
@@ -409,10 +467,7 @@ class Region:
             mode = louis.compbrlAtCursor
 
         contracted, inPos, outPos, cursorPos = \
-            louis.translate([self.contractionTable],
-                            line,
-                            cursorPos=cursorOffset,
-                            mode=mode)
+            _translate(self.contractionTable, line, cursorOffset, mode)
 
         # Make sure the cursor is at a realistic spot.
         # Note that if cursorOffset is beyond the end of the buffer,
@@ -1173,6 +1228,7 @@ def _clearBraille():
     if _brlAPIRunning:
         try:
             _brlAPI.writeText("", 0)
+            _invalidateLastWrite()
             _idleBraille()
         except Exception:
             msg = "BRAILLE: BrlTTY seems to have disappeared."
@@ -1201,6 +1257,7 @@ def _enableBraille():
                 debug.print_message(debug.LEVEL_INFO, msg, True)
                 _brlAPI.setParameter(brlapi.PARAM_CLIENT_PRIORITY, 0, False, brlapi_priority)
                 idle = False
+                _invalidateLastWrite()
             except Exception:
                 msg = "BRAILLE: could not restore priority"
                 debug.print_message(debug.LEVEL_WARNING, msg, True)
@@ -1265,6 +1322,7 @@ def refresh(panToCursor=True, targetCursorCell=0, getLinkMask=True, stopFlash=Tr
     global cursorCell
     global _monitor
     global _lastTextInfo
+    global _lastWrite
 
     msg = f"BRAILLE: Refresh. Pan: {panToCursor} target: {targetCursorCell}"
     debug.print_message(debug.LEVEL_INFO, msg, True)
@@ -1452,12 +1510,22 @@ def refresh(panToCursor=True, targetCursorCell=0, getLinkMask=True, stopFlash=Tr
         if attributeMask:
             writeStruct.attrOr = submask
 
-        try:
-            _brlAPI.write(writeStruct)
-        except Exception:
-            msg = "BRAILLE: BrlTTY seems to have disappeared."
-            debug.print_message(debug.LEVEL_WARNING, msg, True)
-            shutdown()
+        # Moving the caret within a line, or refreshing in response to an
+        # event which didn't change what is displayed, frequently results in
+        # exactly the same cells. There's no point in sending them again.
+        thisWrite = (substring, cursorCell, submask if attributeMask else None)
+        if thisWrite == _lastWrite:
+            msg = "BRAILLE: Not writing to display. Cells and cursor are unchanged."
+            debug.print_message(debug.LEVEL_INFO, msg, True)
+        else:
+            try:
+                _brlAPI.write(writeStruct)
+            except Exception:
+                msg = "BRAILLE: BrlTTY seems to have disappeared."
+                debug.print_message(debug.LEVEL_WARNING, msg, True)
+                shutdown()
+            else:
+                _lastWrite = thisWrite
 
     if settings.enableBrailleMonitor:
         if not _monitor:
@@ -1982,6 +2050,7 @@ def init(callback=None):
         return False
 
     _displaySize = [x, 1]
+    _invalidateLastWrite()
 
     # The monitor will be created in refresh if needed.
     if _monitor:
@@ -2046,6 +2115,8 @@ def shutdown():
             _monitor.destroy()
             _monitor = None
         _displaySize = [DEFAULT_DISPLAY_SIZE, 1]
+        _invalidateLastWrite()
+        clearContractionCache()
     else:
         msg = "BRAILLE: Braille was not running."
         debug.print_message(debug.LEVEL_INFO, msg, True)
@@ -38,50 +38,7 @@ from . import settings
 from . import settings_manager
 from .ax_object import AXObject
 from .ax_utilities import AXUtilities
-
-#############################################################################
-#                                                                           #
-# Ring List. A fixed size circular list by Flavio Catalani                  #
-# http://aspn.activestate.com/ASPN/Cookbook/Python/Recipe/435902            #
-#                                                                           #
-# Included here to keep track of conversation histories.                    #
-#                                                                           #
-#############################################################################
-
-class RingList:
-    def __init__(self, length):
-        self.__data__ = []
-        self.__full__ = 0
-        self.__max__ = length
-        self.__cur__ = 0
-
-    def append(self, x):
-        if self.__full__ == 1:
-            for i in range (0, self.__cur__ - 1):
-                self.__data__[i] = self.__data__[i + 1]
-            self.__data__[self.__cur__ - 1] = x
-        else:
-            self.__data__.append(x)
-            self.__cur__ += 1
-            if self.__cur__ == self.__max__:
-                self.__full__ = 1
-
-    def get(self):
-        return self.__data__
-
-    def remove(self):
-        if (self.__cur__ > 0):
-            del self.__data__[self.__cur__ - 1]
-            self.__cur__ -= 1
-
-    def size(self):
-        return self.__cur__
-
-    def maxsize(self):
-        return self.__max__
-
-    def __str__(self):
-        return ''.join(self.__data__)
+from .message_history import MessageHistory
 
 #############################################################################
 #                                                                           #
@@ -111,14 +68,7 @@ class Conversation:
 
         # A cyclic list to hold the chat room history for this conversation
         #
-        self._messageHistory = RingList(Conversation.MESSAGE_LIST_LENGTH)
-
-        # Initially populate the cyclic lists with empty strings.
-        #
-        i = 0
-        while i < self._messageHistory.maxsize():
-            self.addMessage("")
-            i += 1
+        self._messageHistory = MessageHistory(Conversation.MESSAGE_LIST_LENGTH)
 
         # Keep track of the last typing status because some platforms (e.g.
         # MSN) seem to issue the status constantly and even though it has
@@ -142,9 +92,10 @@ class Conversation:
         - messageNumber: the index of the message to get.
         """
 
-        messages = self._messageHistory.get()
-
-        return messages[messageNumber]
+        # The number is relative to the oldest slot of a full history. Slots
+        # which have not yet been filled contain empty strings.
+        age = self._messageHistory.max_size() - (messageNumber + 1)
+        return self._messageHistory.get_by_age(age, "")
 
     def getTypingStatus(self):
         """Returns the typing status of the buddy in this conversation."""
@@ -177,23 +128,13 @@ class ConversationList:
         """
 
         self.conversations = []
+        self._conversationIds = set()
 
         # A cyclic list to hold the most recent (messageListLength) previous
-        # messages for all conversations in the ConversationList.
+        # messages for all conversations in the ConversationList, each with
+        # the name of the conversation associated with that message.
         #
-        self._messageHistory = RingList(messageListLength)
-
-        # A corresponding cyclic list to hold the name of the conversation
-        # associated with each message in the messageHistory.
-        #
-        self._roomHistory = RingList(messageListLength)
-
-        # Initially populate the cyclic lists with empty strings.
-        #
-        i = 0
-        while i < self._messageHistory.maxsize():
-            self.addMessage("", None)
-            i += 1
+        self._messageHistory = MessageHistory(messageListLength)
 
     def addMessage(self, message, conversation):
         """Adds the current message to the message history.
@@ -211,8 +152,7 @@ class ConversationList:
                 self.addConversation(conversation)
             name = conversation.name
 
-        self._messageHistory.append(message)
-        self._roomHistory.append(name)
+        self._messageHistory.append(message, name)
 
     def getNthMessageAndName(self, messageNumber):
         """Returns a list containing the specified message from the message
@@ -223,10 +163,13 @@ class ConversationList:
         - messageNumber: the index of the message to get.
         """
 
-        messages = self._messageHistory.get()
-        rooms = self._roomHistory.get()
+        # The number is relative to the oldest slot of a full history. Slots
+        # which have not yet been filled contain empty strings.
+        age = self._messageHistory.max_size() - (messageNumber + 1)
+        if not 0 <= age < len(self._messageHistory):
+            return "", ""
 
-        return messages[messageNumber], rooms[messageNumber]
+        return self._messageHistory[-(age + 1)], self._messageHistory.get_key(-(age + 1))
 
     def hasConversation(self, conversation):
         """Returns True if we know about this conversation.
@@ -235,7 +178,7 @@ class ConversationList:
         - conversation: the conversation of interest
         """
 
-        return conversation in self.conversations
+        return id(conversation) in self._conversationIds
 
     def getNConversations(self):
         """Returns the number of conversations we currently know about."""
@@ -250,6 +193,7 @@ class ConversationList:
         """
 
         self.conversations.append(conversation)
+        self._conversationIds.add(id(conversation))
 
     def removeConversation(self, conversation):
         """Removes conversation from the list of conversations.
@@ -271,6 +215,7 @@ class ConversationList:
         except Exception:
             return False
         else:
+            self._conversationIds.discard(id(conversation))
             return True
 
 #############################################################################
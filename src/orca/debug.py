@@ -27,10 +27,18 @@ __date__      = "$Date$"
 __copyright__ = "Copyright (c) 2005-2008 Sun Microsystems Inc."
 __license__   = "LGPL"
 
+import atexit
+import gzip
 import inspect
+import os
+import queue
+import shutil
+import threading
+import time
 import traceback
 import re
 import sys
+from collections import deque
 from datetime import datetime
 from typing import Any, Optional, TextIO
 
@@ -48,34 +56,99 @@ debugLevel: int = LEVEL_SEVERE
 debugFile: Optional[TextIO] = None
 # pylint: enable=invalid-name
 
+# When enabled, the flight recorder holds the most recent messages, regardless of debugLevel,
+# so that the user can dump them to disk when something goes wrong while full logging is off.
+# It is off by default because those messages include what was typed and spoken.
+FLIGHT_RECORDER_SIZE = 5000
+FLIGHT_RECORDER_LEVEL = LEVEL_INFO
+
+MAX_LOG_FILE_SIZE = 50 * 1024 * 1024
+MAX_ROTATED_LOG_FILES = 5
+MAX_BATCH_SIZE = 500
+MAX_QUEUE_SIZE = 20000
+
+_flight_recorder: deque[tuple[float, int, str]] = deque(maxlen=FLIGHT_RECORDER_SIZE)
+_flight_recorder_enabled: bool = False
+_queue: queue.Queue = queue.Queue(MAX_QUEUE_SIZE)
+_dropped: int = 0
+_writer: Optional[threading.Thread] = None
+_writer_lock: threading.Lock = threading.Lock()
+
 def print_exception(level: int) -> None:
     """Prints out information regarding the current exception."""
+
+    text = traceback.format_exc(100)
+    _record(level, text)
     if level >= debugLevel:
-        _print_text(level)
-        traceback.print_exc(100, debugFile)
-        _print_text(level)
+        _print_text(level, f"\n{text}")
 
 def print_tokens(
     level: int, tokens: list[Any], timestamp: bool = False, stack: bool = False
 ) -> None:
     """Prints out each token as a human-consumable string."""
 
-    if level < debugLevel:
+    # Converting the tokens to strings can require AT-SPI calls. So tokens which will not be
+    # printed are only converted when the flight recorder is enabled and would record them.
+    if level < debugLevel and not (_flight_recorder_enabled and level >= FLIGHT_RECORDER_LEVEL):
         return
 
     text = " ".join(map(AXUtilitiesDebugging.as_string, tokens))
     text = re.sub(r"[ \u00A0]+", " ", text)
     text = re.sub(r" (?=[,.:)])(?![\n])", "", text)
+    _record(level, text)
     _print_text(level, text, timestamp, stack)
 
 def print_message(level: int, text: str, timestamp: bool = False, stack: bool = False) -> None:
     """Prints out text."""
 
+    _record(level, text)
     if level < debugLevel:
         return
 
     _print_text(level, text, timestamp, stack)
 
+def set_flight_recorder_enabled(enabled: bool) -> None:
+    """Sets whether recent messages are kept in the flight recorder."""
+
+    global _flight_recorder_enabled
+
+    _flight_recorder_enabled = enabled
+    if not enabled:
+        _flight_recorder.clear()
+
+def is_flight_recorder_enabled() -> bool:
+    """Returns True if recent messages are kept in the flight recorder."""
+
+    return _flight_recorder_enabled
+
+def _record(level: int, text: str) -> None:
+    if _flight_recorder_enabled and level >= FLIGHT_RECORDER_LEVEL:
+        _flight_recorder.append((time.time(), level, text))
+
+def _get_dump_dir() -> str:
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(cache_dir, "orca")
+
+def dump_flight_recorder(path: Optional[str] = None) -> str:
+    """Writes the flight recorder's messages, gzip-compressed, to path. Returns the path."""
+
+    if path is None:
+        name = time.strftime("flight-recorder-%Y-%m-%d-%H:%M:%S.out.gz")
+        path = os.path.join(_get_dump_dir(), name)
+
+    _enqueue(("dump", path, _flight_recorder.copy()))
+    return path
+
+def flush(timeout: float = 1.0) -> None:
+    """Waits up to timeout seconds for all queued messages to be written."""
+
+    if _writer is None:
+        return
+
+    done = threading.Event()
+    if _enqueue(("flush", done)):
+        done.wait(timeout)
+
 def _stack_as_string(max_frames: int = 4) -> str:
     callers = []
     current_module = inspect.getmodule(inspect.currentframe())
@@ -100,25 +173,136 @@ def _print_text(level: int, text: str = "", timestamp: bool = False, stack: bool
     if level < debugLevel:
         return
 
-    if timestamp:
-        text = text.replace("\n", f"\n{' ' * 18}")
-        text = f"{datetime.now().strftime('%H:%M:%S.%f')} - {text}"
+    # The stack must be captured by the calling thread. Everything else is left to the writer.
     if stack:
         text += f" {_stack_as_string()}"
 
-    if debugFile:
+    _enqueue(("text", time.time(), text, timestamp))
+
+    # Severe messages often precede a crash or kill, so don't leave them in the queue.
+    if level >= LEVEL_SEVERE:
+        flush()
+
+def _enqueue(item: tuple) -> bool:
+    """Queues item for the writer, starting it if needed. Returns True if item was queued."""
+
+    global _writer, _dropped
+
+    if _writer is None or not _writer.is_alive():
+        with _writer_lock:
+            if _writer is None or not _writer.is_alive():
+                _writer = threading.Thread(
+                    target=_write_queued_items, name="orca-debug-writer", daemon=True)
+                _writer.start()
+
+    try:
+        if item[0] == "text":
+            _queue.put_nowait(item)
+        else:
+            _queue.put(item, timeout=1.0)
+    except queue.Full:
+        _dropped += 1
+        return False
+
+    return True
+
+def _format_text(when: float, text: str, timestamp: bool) -> str:
+    if timestamp:
+        text = text.replace("\n", f"\n{' ' * 18}")
+        text = f"{datetime.fromtimestamp(when).strftime('%H:%M:%S.%f')} - {text}"
+    return f"{text}\n"
+
+def _write_queued_items() -> None:
+    while True:
+        items = [_queue.get()]
         try:
-            debugFile.writelines([text, "\n"])
-        except (AttributeError, OSError):
-            return
-        except (TypeError, ValueError, UnicodeEncodeError) as error:
-            text = f"Exception trying to write text to file: {error}"
-            debugFile.writelines([text, "\n"])
-    else:
+            while len(items) < MAX_BATCH_SIZE:
+                items.append(_queue.get_nowait())
+        except queue.Empty:
+            pass
+
         try:
-            sys.stderr.writelines([text, "\n"])
-        except (AttributeError, OSError):
+            _write_items(items)
+        except Exception as error: # pylint: disable=broad-exception-caught
+            sys.stderr.write(f"Exception trying to write debug output: {error}\n")
+        finally:
+            for item in items:
+                if item[0] == "flush":
+                    item[1].set()
+
+def _write_items(items: list[tuple]) -> None:
+    global _dropped
+
+    lines: list[str] = []
+    if _dropped:
+        lines.append(f"DEBUG: {_dropped} messages dropped because the queue was full.\n")
+        _dropped = 0
+
+    for item in items:
+        if item[0] == "text":
+            lines.append(_format_text(*item[1:]))
+            continue
+
+        _write_lines(lines)
+        lines = []
+        if item[0] == "dump":
+            _write_dump(item[1], item[2])
+
+    _write_lines(lines)
+
+def _write_lines(lines: list[str]) -> None:
+    if not lines:
+        return
+
+    target = debugFile or sys.stderr
+    destination = "file" if debugFile else "stderr"
+    try:
+        target.writelines(lines)
+    except (AttributeError, OSError):
+        return
+    except (TypeError, ValueError, UnicodeEncodeError):
+        for line in lines:
+            try:
+                target.write(line)
+            except (TypeError, ValueError, UnicodeEncodeError) as error:
+                target.write(f"Exception trying to write text to {destination}: {error}\n")
+            except (AttributeError, OSError):
+                return
+
+    try:
+        target.flush()
+    except (AttributeError, OSError, ValueError):
+        return
+
+    if debugFile:
+        _rotate_if_needed(debugFile)
+
+def _rotate_if_needed(log: TextIO) -> None:
+    # Rotate by copying and truncating so that the file object, and the file descriptor
+    # given to faulthandler, remain valid.
+    try:
+        if log.tell() < MAX_LOG_FILE_SIZE:
             return
-        except (TypeError, ValueError, UnicodeEncodeError) as error:
-            text = f"Exception trying to write text to stderr: {error}"
-            sys.stderr.writelines([text, "\n"])
+
+        name = log.name
+        for i in range(MAX_ROTATED_LOG_FILES - 1, 0, -1):
+            if os.path.exists(f"{name}.{i}.gz"):
+                os.replace(f"{name}.{i}.gz", f"{name}.{i + 1}.gz")
+
+        with open(name, "rb") as source, gzip.open(f"{name}.1.gz", "wb") as target:
+            shutil.copyfileobj(source, target)
+        log.seek(0)
+        log.truncate()
+    except (AttributeError, OSError, ValueError) as error:
+        sys.stderr.write(f"Exception trying to rotate debug file: {error}\n")
+
+def _write_dump(path: str, records: deque[tuple[float, int, str]]) -> None:
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8", errors="replace") as dump:
+            for when, level, text in records:
+                dump.write(f"{level:<5} {_format_text(when, text, True)}")
+    except OSError as error:
+        sys.stderr.write(f"Exception trying to dump flight recorder to {path}: {error}\n")
+
+atexit.register(flush)
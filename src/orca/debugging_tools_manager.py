@@ -50,10 +50,14 @@ from . import debug
 from . import focus_manager
 from . import input_event
 from . import keybindings
+from . import main_loop_watchdog
 from . import messages
 from . import orca_platform
+from . import process_health_monitor
 from . import settings_manager
+from .ax_collection import AXCollection
 from .ax_object import AXObject
+from .ax_text import AXText
 from .ax_utilities import AXUtilities
 from .ax_utilities_debugging import AXUtilitiesDebugging
 
@@ -220,6 +224,25 @@ class DebuggingToolsManager:
         msg = f"CUSTOMIZED SETTINGS: {info}"
         debug.print_message(debug.debugLevel, msg, True)
 
+        for entry in process_health_monitor.get_monitor().get_history():
+            msg = f"PROCESS HEALTH: {entry}"
+            debug.print_message(debug.debugLevel, msg, True)
+
+        msg = f"COLLECTION: {AXCollection.get_statistics()}"
+        debug.print_message(debug.debugLevel, msg, True)
+
+        msg = f"RELATIONS: {AXUtilities.get_relation_cache_statistics()}"
+        debug.print_message(debug.debugLevel, msg, True)
+
+        for mirror_info in AXText.get_mirror_statistics():
+            msg = f"TEXT MIRROR: {mirror_info}"
+            debug.print_message(debug.debugLevel, msg, True)
+
+        self.print_stall_report(force=True)
+
+        if debug.is_flight_recorder_enabled():
+            msg = f"FLIGHT RECORDER: Dumped to {debug.dump_flight_recorder()}"
+            debug.print_message(debug.debugLevel, msg, True)
         debug.print_message(debug.debugLevel, "DEBUGGING SNAPSHOT FINISHED", True)
         script.presentMessage(messages.DEBUG_CAPTURE_SNAPSHOT_END)
         debug.debugLevel = old_level
@@ -275,6 +298,26 @@ class DebuggingToolsManager:
             else:
                 debug.print_message(level, app_string, True)
 
+    def print_stall_report(self, force: bool = False, limit: int = 10) -> None:
+        """Prints the locations where the main loop stalled the longest, in descending order."""
+
+        if force:
+            level = debug.LEVEL_SEVERE
+        else:
+            level = debug.LEVEL_INFO
+
+        if level < debug.debugLevel:
+            return
+
+        records = main_loop_watchdog.get_watchdog().get_report(limit)
+        msg = f"DEBUGGING TOOLS MANAGER: {len(records)} main loop stall locations."
+        debug.print_message(level, msg, True)
+        for i, record in enumerate(records):
+            msg = f"{i+1:3}. {record}"
+            debug.print_message(level, msg, True)
+            for entry in record.stack:
+                debug.print_message(level, f"       {entry}", False)
+
     def print_session_details(self, is_command_line: bool = False) -> None:
         """Prints basic details about the current session."""
 
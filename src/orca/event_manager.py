@@ -52,9 +52,11 @@ from . import debug
 from . import focus_manager
 from . import input_event
 from . import input_event_manager
+from . import main_loop_watchdog
 from . import script_manager
 from . import settings
 from .ax_object import AXObject
+from .ax_text import AXText
 from .ax_utilities import AXUtilities
 from .ax_utilities_debugging import AXUtilitiesDebugging
 
@@ -503,6 +505,13 @@ class EventManager:
     def _enqueue_object_event(self, e: Atspi.Event) -> None:
         """Callback for Atspi object events."""
 
+        # This must happen before any filtering so that text mirrors, role and state
+        # snapshots, the registry of applications, and cached relations see every change.
+        AXText.update_mirror_for_event(e)
+        AXObject.update_snapshot_for_event(e)
+        AXUtilities.update_application_registry_for_event(e)
+        AXUtilities.update_relation_cache_for_event(e)
+
         if self._ignore(e):
             return
 
@@ -549,7 +558,12 @@ class EventManager:
                 f"(queue size: {self._event_queue.qsize()}) vvvvv"
             )
             debug.print_message(debug.LEVEL_INFO, msg, False)
-            self._process_object_event(event)
+            watchdog = main_loop_watchdog.get_watchdog()
+            watchdog.set_activity(f"object event: {event.type}")
+            try:
+                self._process_object_event(event)
+            finally:
+                watchdog.clear_activity()
             msg = (
                 f"TOTAL PROCESSING TIME: {time.time() - start_time:.4f}"
                 f"\n^^^^^ FINISHED PRIORITY-{priority} OBJECT EVENT {event.type.upper()} ^^^^^\n"
@@ -27,6 +27,7 @@ __copyright__ = "Copyright (c) 2005-2008 Sun Microsystems Inc." \
                 "Copyright (c) 2016 Igalia, S.L."
 __license__   = "LGPL"
 
+import bisect
 import gi
 gi.require_version("Atspi", "2.0")
 from gi.repository import Atspi
@@ -488,6 +489,11 @@ class Context:
         self.focusObj = focus_manager.get_manager().get_locus_of_focus()
         self.topLevel = None
         self.bounds = Atspi.Rect()
+        self._flattenedText = None
+        self._flattenedStarts = []
+        self._flattenedEnds = []
+        self._flattenedLocations = []
+        self._flattenedOffsets = {}
 
         frame, dialog = script.utilities.frameAndDialog(self.focusObj)
         if root is not None:
@@ -805,6 +811,78 @@ class Context:
         debug.print_tokens(debug.LEVEL_INFO, tokens, True)
         return lines
 
+    @staticmethod
+    def _getWordSpansForIndex(zone):
+        """Returns the zone string and the (start, end) spans of its words, computed
+        without obtaining the extents of each word."""
+
+        if isinstance(zone, TextZone):
+            string = AXText.get_substring(zone.accessible, zone.startOffset, zone.endOffset)
+        else:
+            string = zone.string or ""
+
+        if isinstance(zone, TextZone) or zone._shouldFakeText():
+            return string, [m.span() for m in re.finditer(Zone.WORDS_RE, string)]
+
+        return string, []
+
+    def getFlattenedText(self):
+        """Returns the text of the entire context as a single string, with zones
+        separated by spaces and lines separated by newlines. The result is computed
+        once per context; use getLocationAtFlattenedOffset to map offsets back."""
+
+        if self._flattenedText is not None:
+            return self._flattenedText
+
+        pieces, length = [], 0
+        for lineIndex, line in enumerate(self.lines):
+            if lineIndex:
+                pieces.append("\n")
+                length += 1
+            for zoneIndex, zone in enumerate(line.zones):
+                if zoneIndex:
+                    pieces.append(" ")
+                    length += 1
+                string, spans = self._getWordSpansForIndex(zone)
+                for wordIndex, (start, end) in enumerate(spans or [(0, len(string))]):
+                    self._flattenedStarts.append(length + start)
+                    self._flattenedEnds.append(length + end)
+                    self._flattenedLocations.append((lineIndex, zoneIndex, wordIndex))
+                    self._flattenedOffsets[(lineIndex, zoneIndex, wordIndex)] = length + start
+                pieces.append(string)
+                length += len(string)
+
+        self._flattenedText = "".join(pieces)
+        msg = (
+            f"FLAT REVIEW: Flattened {len(self.lines)} lines into {length} chars "
+            f"({len(self._flattenedStarts)} words)"
+        )
+        debug.print_message(debug.LEVEL_INFO, msg, True)
+        return self._flattenedText
+
+    def getLocationAtFlattenedOffset(self, offset):
+        """Returns the (line, zone, word, char) indices for offset in the flattened text."""
+
+        self.getFlattenedText()
+        i = bisect.bisect_right(self._flattenedStarts, offset) - 1
+        if i < 0:
+            return 0, 0, 0, 0
+
+        lineIndex, zoneIndex, wordIndex = self._flattenedLocations[i]
+        wordLength = self._flattenedEnds[i] - self._flattenedStarts[i]
+        charIndex = max(0, min(offset - self._flattenedStarts[i], wordLength - 1))
+        return lineIndex, zoneIndex, wordIndex, charIndex
+
+    def getFlattenedOffset(self, lineIndex, zoneIndex, wordIndex, charIndex):
+        """Returns the offset in the flattened text of the specified location, or -1."""
+
+        self.getFlattenedText()
+        start = self._flattenedOffsets.get((lineIndex, zoneIndex, wordIndex))
+        if start is None:
+            return -1
+
+        return start + charIndex
+
     def getCurrent(self, flatReviewType=ZONE):
         """Returns the current string, offset, and extent information."""
 
@@ -45,39 +45,10 @@ from . import guilabels
 from . import input_event
 from . import keybindings
 from . import messages
-from . import script_manager
 
 from .flat_review import Context
 
 
-class _SearchQueryMatch:
-    """Represents a SearchQuery match."""
-
-    def __init__(self, context: Context, pattern: re.Pattern) -> None:
-        self._line: int = context.lineIndex
-        self._zone: int = context.zoneIndex
-        self._word: int = context.wordIndex
-        self._char: int = context.charIndex
-        self._pattern: re.Pattern = pattern
-        self._line_string: str = context.getCurrent(Context.LINE)[0]
-
-    def __str__(self) -> str:
-        return (
-            f"SEARCH QUERY MATCH: '{self._line_string}' "
-            f"(line {self._line}, zone {self._zone}, word {self._word}, char {self._char}) "
-            f"for '{self._pattern}'"
-        )
-
-    def __eq__(self, other: object) -> bool:
-        if not isinstance(other, _SearchQueryMatch):
-            return False
-
-        return self._line_string == other._line_string and \
-               self._line == other._line and \
-               self._zone == other._zone and \
-               self._word == other._word and \
-               self._char == other._char
-
 class SearchQuery:
     """Represents a search that the user wants to perform."""
 
@@ -115,9 +86,8 @@ class FlatReviewFinder:
         self._desktop_bindings: keybindings.KeyBindings = keybindings.KeyBindings()
         self._laptop_bindings: keybindings.KeyBindings = keybindings.KeyBindings()
         self._last_query: Optional[SearchQuery] = None
-        self._location: list[int] = [0, 0, 0, 0]
-        self._wrapped: bool = False
-        self._match: Optional[_SearchQueryMatch] = None
+        self._match_context: Optional[Context] = None
+        self._match_offset: int = -1
 
     def get_bindings(
         self, refresh: bool = False, is_desktop: bool = True
@@ -279,117 +249,22 @@ class FlatReviewFinder:
             return
 
         context = script.getFlatReviewContext()
-        location = self._do_find(query, context)
+        location = self._do_find(script, query, context)
         if not location:
             script.presentMessage(messages.STRING_NOT_FOUND)
         else:
-            context.setCurrent(location.lineIndex, location.zoneIndex, \
-                                location.wordIndex, location.charIndex)
+            context.setCurrent(*location)
             script.get_flat_review_presenter().present_item(script)
             script.targetCursorCell = script.getBrailleCursorCell()
 
-    def _move(self, query: SearchQuery, context: Context, context_type: int) -> bool:
-        """Moves within the flat review context while looking for a match."""
-
-        if context_type == Context.WORD:
-            if query.search_backwards:
-                return context.goPrevious(Context.WORD, Context.WRAP_LINE)
-            return context.goNext(Context.WORD, Context.WRAP_LINE)
-
-        if context_type == Context.ZONE:
-            if query.search_backwards:
-                moved = context.goPrevious(Context.ZONE, Context.WRAP_LINE)
-                context.goEnd(Context.ZONE)
-                return moved
-            return context.goNext(Context.ZONE, Context.WRAP_LINE)
-
-        if context_type == Context.LINE:
-            if query.search_backwards:
-                moved = context.goPrevious(Context.LINE, Context.WRAP_LINE)
-                context.goEnd(Context.LINE)
-            else:
-                moved = context.goNext(Context.LINE, Context.WRAP_LINE)
-            if moved:
-                return True
-            if not query.window_wrap or self._wrapped:
-                return False
-            self._wrapped = True
-            script = script_manager.get_manager().get_active_script()
-            assert script is not None
-            if query.search_backwards:
-                script.presentMessage(messages.WRAPPING_TO_BOTTOM)
-                moved = context.goPrevious(Context.LINE, Context.WRAP_ALL)
-            else:
-                script.presentMessage(messages.WRAPPING_TO_TOP)
-                moved = context.goNext(Context.LINE, Context.WRAP_ALL)
-            return moved
-
-        return False
-
-    def _find_match_in(
-        self, query: SearchQuery, context: Context, pattern: re.Pattern, context_type: int
-    ) -> bool:
-        """Searches for a match of pattern in context for the given type."""
-
-        def matches(context, pattern, context_type):
-            if context_type == Context.LINE:
-                type_string = "LINE"
-            elif context_type == Context.ZONE:
-                type_string = "ZONE"
-            elif context_type == Context.WORD:
-                type_string = "WORD"
-            else:
-                return False
-
-            string = context.getCurrent(context_type)[0]
-            match = re.search(pattern, string)
-            debug_string = string.replace("\n", "\\n")
-            msg = f"FLAT REVIEW FINDER: Looking in {type_string}='{debug_string}'. Match: {match}"
-            debug.print_message(debug.LEVEL_INFO, msg, True)
-            return bool(match)
-
-        found = matches(context, pattern, context_type)
-        while not found:
-            if not self._move(query, context, context_type):
-                break
-            found = matches(context, pattern, context_type)
-
-        return found
-
-    def _find_match(self, query: SearchQuery, context: Context, pattern: re.Pattern) -> bool:
-        """Searches for a match of pattern in context."""
-
-        if not self._find_match_in(query, context, pattern, Context.LINE):
-            return False
-
-        if not self._find_match_in(query, context, pattern, Context.ZONE):
-            return False
-
-        if not self._find_match_in(query, context, pattern, Context.WORD):
-            return False
-
-        if self._match != _SearchQueryMatch(context, pattern):
-            return True
-
-        if self._move(query, context, Context.WORD) \
-           and self._find_match_in(query, context, pattern, Context.WORD):
-            return True
-
-        if self._move(query, context, Context.ZONE) \
-           and self._find_match_in(query, context, pattern, Context.ZONE):
-            return True
-
-        if self._move(query, context, Context.LINE):
-            return self._find_match(query, context, pattern)
-
-        return False
-
-    def _do_find(self, query: SearchQuery, context: Context) -> Optional[Context]:
-        """Performs the actual search."""
+    def _do_find(
+        self, script, query: SearchQuery, context: Context
+    ) -> Optional[tuple[int, int, int, int]]:
+        """Performs the actual search, returning the (line, zone, word, char) of the match."""
 
         msg = f"FLAT REVIEW FINDER: Searching for {str(query)}"
-        if self._match:
-            msg += f". Last match: {self._match}"
+        if self._match_context is context:
+            msg += f". Last match at offset: {self._match_offset}"
         debug.print_message(debug.LEVEL_INFO, msg, True)
 
         flags = re.U
@@ -400,35 +275,50 @@ class FlatReviewFinder:
         else:
             regexp = query.search_string
         pattern = re.compile(regexp, flags)
-
-        self._save_location(context)
-        if query.start_at_top:
-            context.goBegin(Context.WINDOW)
-
-        location = None
-        if self._find_match(query, context, pattern):
-            self._save_location(context)
-            self._match = _SearchQueryMatch(context, pattern)
-            self._wrapped = False
-            location = copy.copy(context)
-        else:
-            self._restore_location(context)
         self._last_query = copy.copy(query)
-        return location
 
-    def _save_location(self, context: Context) -> None:
-        """Saves the context location."""
-
-        self._location = [context.lineIndex,
-                          context.zoneIndex,
-                          context.wordIndex,
-                          context.charIndex]
+        # The flattened text is cached by the context, so it is only rebuilt when
+        # the context is.
+        text = context.getFlattenedText()
+        starts = [match.start() for match in pattern.finditer(text)]
+        msg = f"FLAT REVIEW FINDER: {len(starts)} matches in {len(text)} chars"
+        debug.print_message(debug.LEVEL_INFO, msg, True)
+        if not starts:
+            return None
 
-    def _restore_location(self, context: Context) -> None:
-        """Restores the context location."""
+        last_match = self._match_offset if self._match_context is context else -1
+        line, zone, word, char = \
+            context.lineIndex, context.zoneIndex, context.wordIndex, context.charIndex
+        if query.start_at_top:
+            candidates = starts
+        elif query.search_backwards:
+            current = context.getFlattenedOffset(line, zone, word, char)
+            if current < 0:
+                current = context.getFlattenedOffset(line, zone, 0, 0)
+            candidates = [x for x in reversed(starts) if x <= current and x != last_match]
+        else:
+            current = context.getFlattenedOffset(line, zone, word, 0)
+            if current < 0:
+                current = context.getFlattenedOffset(line, zone, 0, 0)
+            candidates = [x for x in starts if x >= current and x != last_match]
+
+        if candidates:
+            offset = candidates[0]
+        elif not query.window_wrap:
+            return None
+        elif query.search_backwards:
+            script.presentMessage(messages.WRAPPING_TO_BOTTOM)
+            offset = starts[-1]
+        else:
+            script.presentMessage(messages.WRAPPING_TO_TOP)
+            offset = starts[0]
 
-        context.setCurrent(*self._location)
-        self._location = [0, 0, 0, 0]
+        self._match_context = context
+        self._match_offset = offset
+        location = context.getLocationAtFlattenedOffset(offset)
+        msg = f"FLAT REVIEW FINDER: Match at offset {offset}: {location}"
+        debug.print_message(debug.LEVEL_INFO, msg, True)
+        return location
 
 class FlatReviewFinderGUI:
     """The dialog containing the find options."""
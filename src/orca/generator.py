@@ -1991,5 +1991,3 @@ class Generator:
         """Generates presentation for the window role."""
 
         return []
-
-Generator.start_cache_clearing_thread()
@@ -439,6 +439,12 @@ KB_MODIFIED = C_("keybindings", "Modified")
 # Translators: This label refers to the keyboard layout (desktop or laptop).
 KEYBOARD_LAYOUT_DESKTOP = _("_Desktop")
 
+# Translators: Orca has a number of commands which present a list of objects,
+# such as all the links or headings in a document, in a dialog. This is the
+# label for a text entry in that dialog. Typing into the entry hides all the
+# items in the list which do not contain the typed text.
+NAVLIST_FILTER = _("_Filter:")
+
 # Translators: Orca has a feature to list all of the notification messages
 # received, similar to the functionality gnome-shell provides when you press
 # Super+M, but it works in all desktop environments. Orca's list is a table
@@ -45,6 +45,7 @@ from gi.repository import Gdk
 from . import debug
 from . import focus_manager
 from . import input_event
+from . import main_loop_watchdog
 from . import script_manager
 from . import settings
 from .ax_object import AXObject
@@ -221,6 +222,20 @@ class InputEventManager:
             debug.print_message(debug.LEVEL_INFO, msg, True)
             return False
 
+        watchdog = main_loop_watchdog.get_watchdog()
+        watchdog.set_activity(f"keyboard event: {'pressed' if pressed else 'released'}")
+        try:
+            self._process_keyboard_event(event, pressed)
+        finally:
+            watchdog.clear_activity()
+        return True
+
+    # pylint: enable=too-many-arguments
+    # pylint: enable=too-many-positional-arguments
+
+    def _process_keyboard_event(self, event: input_event.KeyboardEvent, pressed: bool) -> None:
+        """Sets the context of event and processes it."""
+
         manager = focus_manager.get_manager()
         if pressed:
             window = manager.get_active_window()
@@ -259,10 +274,6 @@ class InputEventManager:
         else:
             self._last_non_modifier_key_event = event
         self._last_input_event = event
-        return True
-
-    # pylint: enable=too-many-arguments
-    # pylint: enable=too-many-positional-arguments
 
     def _determine_keyboard_event_click_count(self, event: input_event.KeyboardEvent) -> int:
         """Determines the click count of event."""
@@ -30,6 +30,11 @@ __date__      = "$Date$"
 __copyright__ = "Copyright (C) 2011-2013 Igalia, S.L."
 __license__   = "LGPL"
 
+import gi
+gi.require_version("Atspi", "2.0")
+from gi.repository import Atspi
+from gi.repository import GLib
+
 from . import debug
 from .ax_component import AXComponent
 from .ax_hypertext import AXHypertext
@@ -40,6 +45,12 @@ from .ax_utilities import AXUtilities
 
 class LabelInference:
 
+    # The number of widgets to infer labels for in each idle callback of a batch.
+    BATCH_SIZE = 20
+
+    # The number of invalidated roots to track before discarding all stored labels.
+    MAX_INVALIDATED_ROOTS = 50
+
     def __init__(self, script):
         """Creates an instance of the LabelInference class.
 
@@ -51,6 +62,12 @@ class LabelInference:
         self._lineCache = {}
         self._extentsCache = {}
         self._isWidgetCache = {}
+        self._inferredLabels = {}
+        self._invalidatedRoots = {}
+        self._generation = 0
+        self._pendingRoot = None
+        self._pending = []
+        self._batchId = 0
 
     def infer(self, obj, focusedOnly=True):
         """Attempt to infer the functional/displayed label of obj.
@@ -72,6 +89,21 @@ class LabelInference:
             debug.print_tokens(debug.LEVEL_INFO, tokens, True)
             return None, []
 
+        stored = self._getStoredLabel(obj)
+        if stored is not None:
+            rv = stored[1:3]
+            tokens = ["LABEL INFERENCE: Using previously-inferred label '", rv[0], "'"]
+            debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+            return rv
+
+        rv = self._infer(obj)
+        self.clearCache()
+        return rv
+
+    def _infer(self, obj):
+        """Infers and stores the label of obj, reusing whatever is in the line and
+        extents caches. The caller is responsible for clearing those caches."""
+
         result, objects = None, []
         if not result:
             result, objects = self.inferFromTextLeft(obj)
@@ -108,9 +140,127 @@ class LabelInference:
                 debug.LEVEL_INFO,
                 f"LABEL INFERENCE: Text Left with proximity of 200: '{result}'", True)
 
-        self.clearCache()
+        self._inferredLabels[hash(obj)] = obj, result, objects, self._generation
         return result, objects
 
+    def _getStoredLabel(self, obj):
+        """Returns the stored (obj, label, objects, generation) for obj, or None if there
+        is no stored label or if it was derived from an object which has since changed."""
+
+        stored = self._inferredLabels.get(hash(obj))
+        if stored is None:
+            return None
+
+        generation = stored[3]
+        roots = [root for gen, root in self._invalidatedRoots.values() if gen > generation]
+        if not roots:
+            return stored
+
+        def isAffected(x):
+            if not AXObject.is_valid(x):
+                return True
+            return any(AXObject.is_ancestor(x, root, True) for root in roots)
+
+        if isAffected(stored[0]) or any(map(isAffected, stored[2])):
+            tokens = ["LABEL INFERENCE: Stored label for", obj, "is no longer valid"]
+            debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+            del self._inferredLabels[hash(obj)]
+            return None
+
+        stored = stored[:3] + (self._generation,)
+        self._inferredLabels[hash(obj)] = stored
+        return stored
+
+    def inferAll(self, root):
+        """Infers, in batches during idle time, the labels of all unlabeled form
+        fields in root so that inferring the label of one later is a lookup."""
+
+        self._pendingRoot = root
+        self._pending = []
+        if not self._batchId:
+            self._batchId = GLib.idle_add(self._inferNextBatch, priority=GLib.PRIORITY_LOW)
+
+    def _findUnlabeled(self, root):
+        """Returns the unlabeled form fields in root."""
+
+        def isUnlabeled(x):
+            if AXObject.get_name(x) or AXUtilities.has_role_from_aria(x):
+                return False
+            return not AXUtilities.get_displayed_label(x)
+
+        roles = [Atspi.Role.CHECK_BOX,
+                 Atspi.Role.COMBO_BOX,
+                 Atspi.Role.ENTRY,
+                 Atspi.Role.LIST_BOX,
+                 Atspi.Role.PASSWORD_TEXT,
+                 Atspi.Role.RADIO_BUTTON]
+
+        rv = AXUtilities.find_all_with_role(root, roles, isUnlabeled)
+        tokens = ["LABEL INFERENCE:", len(rv), "unlabeled fields in", root]
+        debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+        return rv
+
+    def _inferNextBatch(self):
+        """Finds the unlabeled widgets in the pending root, if any, or else infers
+        the labels of the next BATCH_SIZE pending widgets. Widgets on the same line
+        share the line contents and extents computed for each other."""
+
+        if self._pendingRoot is not None:
+            root, self._pendingRoot = self._pendingRoot, None
+            if AXObject.is_valid(root):
+                self._pending = self._findUnlabeled(root)
+            if self._pending:
+                return True
+
+        batch = self._pending[:self.BATCH_SIZE]
+        self._pending = self._pending[self.BATCH_SIZE:]
+        for obj in batch:
+            if AXObject.is_valid(obj) and self._getStoredLabel(obj) is None:
+                self._infer(obj)
+
+        # Extents are in screen coordinates and become stale if the user scrolls
+        # between batches. So only the inferred labels are kept.
+        self.clearCache()
+        if self._pending:
+            return True
+
+        msg = f"LABEL INFERENCE: Batch complete. {len(self._inferredLabels)} labels stored."
+        debug.print_message(debug.LEVEL_INFO, msg, True)
+        self._batchId = 0
+        return False
+
+    def invalidate(self, root=None):
+        """Invalidates the stored labels for widgets in root and labels derived from
+        objects in root. If root is None, all stored labels are removed. Otherwise
+        root is recorded, and each stored label is checked against it when next used."""
+
+        if root is None:
+            self._inferredLabels = {}
+            self._invalidatedRoots = {}
+            self._pendingRoot = None
+            self._pending = []
+            return
+
+        if not self._inferredLabels:
+            self._invalidatedRoots = {}
+            return
+
+        # Changes to the contents of a widget, e.g. the user typing in an entry,
+        # cannot change the labels, because widgets are never used as labels.
+        if self._isWidget(root):
+            return
+
+        self._generation += 1
+        self._invalidatedRoots[hash(root)] = self._generation, root
+        self._isWidgetCache = {}
+        if len(self._invalidatedRoots) <= self.MAX_INVALIDATED_ROOTS:
+            return
+
+        msg = f"LABEL INFERENCE: Too many changes. Removing {len(self._inferredLabels)} labels."
+        debug.print_message(debug.LEVEL_INFO, msg, True)
+        self._inferredLabels = {}
+        self._invalidatedRoots = {}
+
     def clearCache(self):
         """Dumps whatever we've stored for performance purposes."""
 
@@ -250,6 +400,11 @@ class LabelInference:
         rv = self._script.utilities.getLineContentsAtOffset(obj, start, True, False)
         self._lineCache[key] = rv
 
+        # The other widgets on this line will be looked up by their own hash.
+        for content in rv:
+            if self._isWidget(content[0]):
+                self._lineCache.setdefault(hash(content[0]), rv)
+
         return rv
 
     def inferFromTextLeft(self, obj, proximity=75):
@@ -14,6 +14,7 @@ from .ax_collection import AXCollection
 from .ax_object import AXObject
 from .ax_text import AXText
 from .ax_utilities import AXUtilities
+from .message_history import MessageHistory
 
 LIVE_OFF       = -1
 LIVE_NONE      = 0
@@ -94,7 +95,7 @@ class LiveRegionManager:
 
         # Message cache.  Used to store up to 9 previous messages so user can
         # review if desired.
-        self.msg_cache = []
+        self.msg_cache = MessageHistory(CACHE_SIZE)
 
         # User overrides for politeness settings.
         self._politenessOverrides = None
@@ -582,8 +583,6 @@ class LiveRegionManager:
     def _cacheMessage(self, utts):
         """Cache a message in our cache list of length CACHE_SIZE"""
         self.msg_cache.append(utts)
-        if len(self.msg_cache) > CACHE_SIZE:
-            self.msg_cache.pop(0)
 
     def _getLivevent_type(self, obj):
         """Returns the live politeness setting for a given object. Also,
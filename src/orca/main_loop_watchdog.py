@@ -0,0 +1,222 @@
+# Orca
+#
+# Copyright 2024 Igalia, S.L.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+# Free Software Foundation, Inc., Franklin Street, Fifth Floor,
+# Boston MA  02110-1301 USA.
+
+# pylint: disable=wrong-import-position
+
+"""Detects and attributes stalls of the main loop."""
+
+__id__        = "$Id$"
+__version__   = "$Revision$"
+__date__      = "$Date$"
+__copyright__ = "Copyright (c) 2024 Igalia, S.L."
+__license__   = "LGPL"
+
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+import gi
+gi.require_version("GLib", "2.0")
+from gi.repository import GLib
+
+from . import debug
+
+
+class StallRecord:
+    """Aggregated information about the stalls which occurred at the same location."""
+
+    MAX_ACTIVITIES = 5
+
+    def __init__(self, stack: list[str]) -> None:
+        self.stack: list[str] = stack
+        self.count: int = 0
+        self.total_time: float = 0.0
+        self.max_time: float = 0.0
+        self.activities: list[str] = []
+
+    def __str__(self) -> str:
+        return (
+            f"{self.count} stalls, total: {self.total_time:.3f}s, "
+            f"max: {self.max_time:.3f}s, during: {', '.join(self.activities) or 'unknown'}"
+        )
+
+    def add(self, duration: float, activity: str) -> None:
+        """Adds a stall of duration seconds which occurred while processing activity."""
+
+        self.count += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+        if activity and activity not in self.activities \
+           and len(self.activities) < self.MAX_ACTIVITIES:
+            self.activities.append(activity)
+
+
+class MainLoopWatchdog:
+    """Heartbeats the main loop from a background thread and records where it stalls.
+
+    Because the heartbeat wakes the main loop every HEARTBEAT_INTERVAL milliseconds,
+    the watchdog only runs if it has been enabled, e.g. via --monitor-main-loop.
+    """
+
+    HEARTBEAT_INTERVAL = 100
+    STALL_THRESHOLD = 0.5
+    STACK_DEPTH = 8
+    MAX_RECORDS = 100
+
+    def __init__(self) -> None:
+        self._enabled: bool = False
+        self._lock: threading.Lock = threading.Lock()
+        self._stop_event: threading.Event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._heartbeat_id: int = 0
+        self._main_thread_id: int = threading.main_thread().ident or 0
+        self._last_heartbeat: float = 0.0
+        self._activity: str = ""
+        self._pending_stack: Optional[list[str]] = None
+        self._pending_activity: str = ""
+        self._records: dict[tuple[str, ...], StallRecord] = {}
+
+    def set_enabled(self, enabled: bool) -> None:
+        """Sets whether the watchdog runs when started, stopping it if it is disabled."""
+
+        self._enabled = enabled
+        if not enabled:
+            self.stop()
+
+    def is_enabled(self) -> bool:
+        """Returns True if the watchdog runs when started."""
+
+        return self._enabled
+
+    def is_running(self) -> bool:
+        """Returns True if the watchdog is running."""
+
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Starts heartbeating the main loop and monitoring it for stalls, if enabled."""
+
+        if not self._enabled or self.is_running():
+            return
+
+        msg = "MAIN LOOP WATCHDOG: Starting."
+        debug.print_message(debug.LEVEL_INFO, msg, True)
+
+        self._main_thread_id = threading.get_ident()
+        self._last_heartbeat = time.monotonic()
+        self._stop_event.clear()
+        self._heartbeat_id = GLib.timeout_add(self.HEARTBEAT_INTERVAL, self._on_heartbeat)
+        self._thread = threading.Thread(
+            target=self._monitor, name="orca-main-loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops monitoring the main loop."""
+
+        if not self.is_running():
+            return
+
+        msg = "MAIN LOOP WATCHDOG: Stopping."
+        debug.print_message(debug.LEVEL_INFO, msg, True)
+
+        self._stop_event.set()
+        if self._heartbeat_id:
+            GLib.source_remove(self._heartbeat_id)
+            self._heartbeat_id = 0
+        self._thread = None
+
+    def set_activity(self, activity: str) -> None:
+        """Records what the main loop is currently processing, e.g. an event or keystroke."""
+
+        # Assigning a string is atomic, so the main thread never needs to take the lock here.
+        self._activity = activity
+
+    def clear_activity(self) -> None:
+        """Records that the main loop has finished processing the current activity."""
+
+        self._activity = ""
+
+    def _on_heartbeat(self) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            delay = now - self._last_heartbeat - self.HEARTBEAT_INTERVAL / 1000
+            self._last_heartbeat = now
+            stack, self._pending_stack = self._pending_stack, None
+            activity, self._pending_activity = self._pending_activity, ""
+            if stack is not None:
+                self._add_stall(stack, delay, activity)
+
+        if stack is not None:
+            msg = f"MAIN LOOP WATCHDOG: Main loop stalled for {delay:.3f}s during: {activity}"
+            debug.print_message(debug.LEVEL_INFO, msg, True)
+
+        return True
+
+    def _monitor(self) -> None:
+        while not self._stop_event.wait(self.HEARTBEAT_INTERVAL / 1000):
+            with self._lock:
+                if self._pending_stack is not None:
+                    continue
+                delay = time.monotonic() - self._last_heartbeat
+                if delay - self.HEARTBEAT_INTERVAL / 1000 < self.STALL_THRESHOLD:
+                    continue
+                self._pending_stack = self._capture_main_thread_stack()
+                self._pending_activity = self._activity or "idle or unknown handler"
+
+    def _capture_main_thread_stack(self) -> list[str]:
+        frame = sys._current_frames().get(self._main_thread_id) # pylint: disable=protected-access
+        if frame is None:
+            return ["<main thread stack unavailable>"]
+
+        summary = traceback.extract_stack(frame, limit=self.STACK_DEPTH)
+        return [f"{entry.filename}:{entry.lineno} in {entry.name}" for entry in summary]
+
+    def _add_stall(self, stack: list[str], duration: float, activity: str) -> None:
+        key = tuple(stack)
+        record = self._records.get(key)
+        if record is None:
+            if len(self._records) >= self.MAX_RECORDS:
+                least = min(self._records, key=lambda k: self._records[k].total_time)
+                self._records.pop(least)
+            record = self._records[key] = StallRecord(stack)
+
+        record.add(duration, activity)
+
+    def get_report(self, limit: int = 10) -> list[StallRecord]:
+        """Returns the stall records with the highest total stall time, in descending order."""
+
+        with self._lock:
+            records = sorted(self._records.values(), key=lambda r: r.total_time, reverse=True)
+        return records[:limit]
+
+    def clear(self) -> None:
+        """Discards all recorded stalls."""
+
+        with self._lock:
+            self._records.clear()
+
+
+_watchdog: MainLoopWatchdog = MainLoopWatchdog()
+
+def get_watchdog() -> MainLoopWatchdog:
+    """Returns the main loop watchdog."""
+
+    return _watchdog
@@ -2232,23 +2232,21 @@ _all.update(_arrows)
 _all.update(_operators)
 _all.update(_shapes)
 _RE = None
-_RE_COMBINING = None
+
+# Maps each symbol, and each symbol + combining character pair, to its replacement
+# for the speakStyle and fallbackOnUnicodeData settings the table was built for.
+_replacements: dict[str, str] = {}
+_replacementsKey = None
 
 def __compileRE():
     global _RE
+    combining = ''.join(map(re.escape, _combining.keys()))
+    symbols = ''.join(map(re.escape, _all.keys()))
     try:
-        _RE = re.compile(f"[{''.join(list(_all.keys()))}]", re.UNICODE)
+        _RE = re.compile(f"(.)([{combining}])|[{symbols}]", re.UNICODE)
     except Exception:
         _RE = None
 
-def __compileRE_COMBINING():
-    global _RE_COMBINING
-    try:
-        _RE_COMBINING = re.compile(f".[{''.join(list(_combining.keys()))}]",
-                                   re.UNICODE)
-    except Exception:
-        _RE_COMBINING = None
-
 def _getStyleString(symbol):
     o = ord(symbol)
     if o in _bold or o in _boldGreek or o in _boldDigits:
@@ -2283,8 +2281,11 @@ def _getStyleString(symbol):
     return "%s"
 
 def updateSymbols(symbolDict):
-    global _all
+    global _all, _RE
+    if any(symbol not in _all for symbol in symbolDict):
+        _RE = None
     _all.update(symbolDict)
+    _replacements.clear()
 
 def _getSpokenName(symbol, includeStyle):
     if symbol not in _all:
@@ -2307,26 +2308,52 @@ def getCharacterName(symbol):
     debug.print_message(debug.LEVEL_INFO, msg, True, True)
     return result
 
+def _getSpeechReplacement(symbol):
+    if symbol not in _all:
+        return symbol
+
+    name = _all.get(symbol)
+    if not name:
+        name = _getSpokenName(symbol, False)
+    elif symbol in _alnum:
+        # Styled characters, e.g. bold nabla, are named using their plain form,
+        # which may itself be a symbol.
+        plainName = _getSpokenName(name, False) if name in _all else ""
+        if plainName:
+            name = f" {plainName} "
+        if speakStyle == SPEAK_ALWAYS:
+            name = _getStyleString(symbol) % name
+
+    return f" {name} " if name else symbol
+
+def _getReplacement(match):
+    text = match.group(0)
+    replacement = _replacements.get(text)
+    if replacement is not None:
+        return replacement
+
+    symbol, combiningChar = match.group(1, 2)
+    if combiningChar is None:
+        replacement = _getSpeechReplacement(text)
+    else:
+        name = _combining.get(combiningChar)
+        replacement = f" {name % _getSpeechReplacement(symbol)} " if name else text
+
+    _replacements[text] = replacement
+    return replacement
+
 def adjustForSpeech(string):
+    global _replacementsKey
+
+    key = speakStyle, fallbackOnUnicodeData
+    if key != _replacementsKey:
+        _replacements.clear()
+        _replacementsKey = key
+
     if _RE is None:
         __compileRE()
 
-    if _RE_COMBINING is None:
-        __compileRE_COMBINING()
-
-    if _RE_COMBINING is not None:
-        combiningPairs = set(re.findall(_RE_COMBINING, string))
-        for pair in combiningPairs:
-            name = _combining.get(pair[1])
-            if name:
-                string = re.sub(pair, f" {name % pair[0]} ", string)
-
-    if _RE is not None:
-        chars = set(re.findall(_RE, string))
-        includeStyle = speakStyle == SPEAK_ALWAYS
-        for char in chars:
-            name = _getSpokenName(char, includeStyle)
-            if name:
-                string = re.sub(char, f" {name} ", string)
-
-    return string
+    if _RE is None:
+        return string
+
+    return _RE.sub(_getReplacement, string)
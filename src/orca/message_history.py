@@ -0,0 +1,122 @@
+# Orca
+#
+# Copyright 2024 Igalia, S.L.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+# Free Software Foundation, Inc., Franklin Street, Fifth Floor,
+# Boston MA  02110-1301 USA.
+
+"""Bounded history of presented messages, such as chat messages and notifications."""
+
+__id__        = "$Id$"
+__version__   = "$Revision$"
+__date__      = "$Date$"
+__copyright__ = "Copyright (c) 2024 Igalia, S.L."
+__license__   = "LGPL"
+
+import time
+from typing import Any, Generic, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class MessageHistory(Generic[T]):
+    """A fixed-size ring of messages, each with an optional key and a timestamp.
+
+    Indexing works like it does for a Python list ordered from oldest to newest,
+    i.e. history[-1] is the newest message, and raises IndexError when out of range.
+    Adding a message and accessing a message by index or by age are O(1).
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size: int = max(1, max_size)
+        self._messages: list[Optional[T]] = [None] * self._max_size
+        self._keys: list[Any] = [None] * self._max_size
+        self._timestamps: list[float] = [0.0] * self._max_size
+        self._start: int = 0
+        self._size: int = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    def __str__(self) -> str:
+        return f"MessageHistory: {self._size} of {self._max_size} messages"
+
+    def _position(self, index: int) -> int:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("message history index out of range")
+
+        return (self._start + index) % self._max_size
+
+    def __getitem__(self, index: int) -> T:
+        return self._messages[self._position(index)]  # type: ignore[return-value]
+
+    def __iter__(self) -> Iterator[T]:
+        for i in range(self._size):
+            yield self[i]
+
+    def __reversed__(self) -> Iterator[T]:
+        for i in range(self._size - 1, -1, -1):
+            yield self[i]
+
+    def max_size(self) -> int:
+        """Returns the number of messages which can be stored."""
+
+        return self._max_size
+
+    def append(self, message: T, key: Any = None) -> None:
+        """Adds message, associated with key, replacing the oldest one if full."""
+
+        if self._size == self._max_size:
+            position = self._start
+            self._start = (self._start + 1) % self._max_size
+        else:
+            position = (self._start + self._size) % self._max_size
+            self._size += 1
+
+        self._messages[position] = message
+        self._keys[position] = key
+        self._timestamps[position] = time.time()
+
+    def get_by_age(self, age: int, default: Optional[T] = None) -> Optional[T]:
+        """Returns the message age messages before the newest, or default."""
+
+        if not 0 <= age < self._size:
+            return default
+
+        return self[-(age + 1)]
+
+    def get_key(self, index: int) -> Any:
+        """Returns the key of the message at index."""
+
+        return self._keys[self._position(index)]
+
+    def get_timestamp(self, index: int) -> float:
+        """Returns the time at which the message at index was added."""
+
+        return self._timestamps[self._position(index)]
+
+    def clear(self) -> None:
+        """Removes all messages."""
+
+        self._messages = [None] * self._max_size
+        self._keys = [None] * self._max_size
+        self._timestamps = [0.0] * self._max_size
+        self._start = 0
+        self._size = 0
@@ -341,6 +341,21 @@ CLI_DEBUG_FILE = _("Send debug output to the specified file")
 # using the '--debug-file' command line option.
 CLI_DEBUG_FILE_NAME = _("FILE")
 
+# Translators: This is the description of command line option '--profile-startup'
+# which causes Orca to report how long it took to load each of its modules and to
+# complete each step of starting up.
+CLI_PROFILE_STARTUP = _("Report the time spent importing modules and starting up")
+
+# Translators: This is the description of command line option '--monitor-main-loop'
+# which causes Orca to record where it was busy whenever it stopped responding for
+# a noticeable amount of time.
+CLI_MONITOR_MAIN_LOOP = _("Record where Orca was busy when it stopped responding")
+
+# Translators: This is the description of command line option '--flight-recorder'
+# which causes Orca to keep its most recent debug messages in memory so that they
+# can be saved to a file when the user captures a debugging snapshot.
+CLI_FLIGHT_RECORDER = _("Keep recent debug messages for debugging snapshots")
+
 # Translators: This is the description of command line option '-t, --text-setup'
 # that will initially display a list of questions in text form, that the user
 # will need to answer, before Orca will startup. For this to happen properly,
@@ -43,14 +43,29 @@ gi.require_version("Atspi", "2.0")
 from gi.repository import Atspi
 from gi.repository import GLib
 
-_MOUSE_REVIEW_CAPABLE = False
-try:
-    if os.environ.get("XDG_SESSION_TYPE", "").lower() != "wayland":
-        gi.require_version("Wnck", "3.0")
-        from gi.repository import Wnck
-        _MOUSE_REVIEW_CAPABLE = Wnck.Screen.get_default() is not None
-except Exception:
-    pass
+# Wnck is only loaded once mouse review is actually used.
+Wnck = None
+_MOUSE_REVIEW_CAPABLE = None
+
+def _is_mouse_review_capable():
+    """Returns True if Wnck is available, loading it if needed."""
+
+    global Wnck, _MOUSE_REVIEW_CAPABLE
+
+    if _MOUSE_REVIEW_CAPABLE is not None:
+        return _MOUSE_REVIEW_CAPABLE
+
+    _MOUSE_REVIEW_CAPABLE = False
+    try:
+        if os.environ.get("XDG_SESSION_TYPE", "").lower() != "wayland":
+            gi.require_version("Wnck", "3.0")
+            from gi.repository import Wnck as _Wnck
+            Wnck = _Wnck
+            _MOUSE_REVIEW_CAPABLE = Wnck.Screen.get_default() is not None
+    except Exception:
+        pass
+
+    return _MOUSE_REVIEW_CAPABLE
 
 from . import cmdnames
 from . import debug
@@ -340,6 +355,13 @@ class _ItemContext:
 class MouseReviewer:
     """Main class for the mouse-review feature."""
 
+    # How long, in milliseconds, the pointer must rest before we examine it.
+    SAMPLING_DELAY = 50
+
+    # How long, in seconds, a descendant found at a point is assumed to still be there.
+    HIT_CACHE_TIME = 1.0
+    HIT_CACHE_SIZE = 20
+
     def __init__(self):
         self._active = settings_manager.get_manager().get_setting("enableMouseReview")
         self._current_mouse_over = _ItemContext()
@@ -347,17 +369,18 @@ class MouseReviewer:
         self._windows = []
         self._all_windows = []
         self._handler_ids = {}
+        self._window_handler_ids = {}
+        self._window_index = None
+        self._accessible_windows = {}
+        self._recent_hits = deque(maxlen=self.HIT_CACHE_SIZE)
         self._event_listener = Atspi.EventListener.new(self._listener)
         self.in_mouse_event = False
-        self._event_queue = deque()
+        self._pending_event = None
+        self._pending_event_time = 0
+        self._sampling_id = 0
         self._handlers = self.get_handlers(True)
         self._bindings = keybindings.KeyBindings()
 
-        if not _MOUSE_REVIEW_CAPABLE:
-            msg = "MOUSE REVIEW ERROR: Wnck is not available"
-            debug.print_message(debug.LEVEL_INFO, msg, True)
-            self._active = False
-
         if not self._active:
             return
 
@@ -416,7 +439,7 @@ class MouseReviewer:
     def activate(self):
         """Activates mouse review."""
 
-        if not _MOUSE_REVIEW_CAPABLE:
+        if not _is_mouse_review_capable():
             msg = "MOUSE REVIEW ERROR: Wnck is not available"
             debug.print_message(debug.LEVEL_INFO, msg, True)
             self._active = False
@@ -464,18 +487,20 @@ class MouseReviewer:
         for key, value in self._handler_ids.items():
             value.disconnect(key)
         self._handler_ids = {}
+        self._disconnect_window_signals()
         self._workspace = None
         self._windows = []
         self._all_windows = []
-        self._event_queue.clear()
+        self._invalidate_window_index("deactivation")
+        self._pending_event = None
+        if self._sampling_id:
+            GLib.source_remove(self._sampling_id)
+            self._sampling_id = 0
         self._active = False
 
     def get_current_item(self):
         """Returns the accessible object being reviewed."""
 
-        if not _MOUSE_REVIEW_CAPABLE:
-            return None
-
         if not self._active:
             return None
 
@@ -491,7 +516,7 @@ class MouseReviewer:
     def toggle(self, script=None, _event=None):
         """Toggle mouse reviewing on or off."""
 
-        if not _MOUSE_REVIEW_CAPABLE:
+        if not _is_mouse_review_capable():
             return
 
         self._active = not self._active
@@ -512,6 +537,46 @@ class MouseReviewer:
         self._windows = [w for w in self._all_windows
                          if w.is_on_workspace(self._workspace)]
 
+        # Moving, resizing, or (un)minimizing a window doesn't change the stacking.
+        self._disconnect_window_signals()
+        for window in self._windows:
+            self._window_handler_ids[window] = [
+                window.connect("geometry-changed", self._on_window_changed),
+                window.connect("state-changed", self._on_window_changed),
+            ]
+
+        self._invalidate_window_index("workspace windows updated")
+
+    def _disconnect_window_signals(self):
+        for window, ids in self._window_handler_ids.items():
+            for i in ids:
+                window.disconnect(i)
+        self._window_handler_ids = {}
+
+    def _on_window_changed(self, _window, *_args):
+        """Callback for Wnck's geometry-changed and state-changed window signals."""
+
+        self._invalidate_window_index("window changed")
+
+    def _invalidate_window_index(self, reason):
+        msg = f"MOUSE REVIEW: Invalidating window index: {reason}"
+        debug.print_message(debug.LEVEL_INFO, msg, True)
+        self._window_index = None
+        self._accessible_windows = {}
+        self._recent_hits.clear()
+
+    def _get_window_index(self):
+        """Returns the (window, x, y, width, height) of the unminimized workspace
+        windows, topmost first."""
+
+        if self._window_index is None:
+            self._window_index = []
+            for w in self._windows:
+                if not w.is_minimized():
+                    self._window_index.append((w, *w.get_client_window_geometry()))
+
+        return self._window_index
+
     def _on_stacking_changed(self, screen):
         """Callback for Wnck's window-stacking-changed signal."""
 
@@ -531,11 +596,7 @@ class MouseReviewer:
         """Returns the accessible window and window based coordinates for the screen coordinates."""
 
         window = None
-        for w in self._windows:
-            if w.is_minimized():
-                continue
-
-            x, y, width, height = w.get_client_window_geometry()
+        for w, x, y, width, height in self._get_window_index():
             if x <= point_x <= x + width and y <= point_y <= y + height:
                 window = w
                 break
@@ -543,6 +604,15 @@ class MouseReviewer:
         if not window:
             return None, -1, -1
 
+        # Adjust the pointer screen coordinates to be relative to the window. This is
+        # needed because we won't be able to get the screen coordinates in Wayland.
+        relative_x = point_x - x
+        relative_y = point_y - y
+
+        accessible_window = self._accessible_windows.get(window)
+        if AXObject.is_valid(accessible_window):
+            return accessible_window, relative_x, relative_y
+
         window_app = window.get_application()
         if not window_app:
             return None, -1, -1
@@ -551,27 +621,45 @@ class MouseReviewer:
         if not app:
             return None, -1, -1
 
-        # Adjust the pointer screen coordinates to be relative to the window. This is
-        # needed because we won't be able to get the screen coordinates in Wayland.
-        relative_x = point_x - x
-        relative_y = point_y - y
-
         candidates = list(AXObject.iter_children(
             app, lambda x: AXComponent.object_contains_point(x, relative_x, relative_y)))
         if len(candidates) == 1:
+            self._accessible_windows[window] = candidates[0]
             return candidates[0], relative_x, relative_y
 
         name = window.get_name()
         matches = [o for o in candidates if AXObject.get_name(o) == name]
         if len(matches) == 1:
+            self._accessible_windows[window] = matches[0]
             return matches[0], relative_x, relative_y
 
         matches = [o for o in matches if AXUtilities.is_active(o)]
         if len(matches) == 1:
+            self._accessible_windows[window] = matches[0]
             return matches[0], relative_x, relative_y
 
         return None, -1, -1
 
+    def _get_descendant_at_point(self, window, x, y):
+        """Returns the descendant of window at (x, y), reusing a recent result if
+        the point is inside an object we found recently and which has no children."""
+
+        now = time.time()
+        for hit_time, hit_window, rect, obj in self._recent_hits:
+            if hit_window != window or now - hit_time > self.HIT_CACHE_TIME:
+                continue
+            if rect.x <= x < rect.x + rect.width and rect.y <= y < rect.y + rect.height \
+               and AXObject.is_valid(obj):
+                tokens = ["MOUSE REVIEW: Using recent hit", obj, f"for ({x}, {y})"]
+                debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+                return obj
+
+        obj = AXComponent.get_descendant_at_point(window, x, y)
+        if obj is not None and not AXObject.get_child_count(obj):
+            self._recent_hits.append((now, window, AXComponent.get_rect(obj), obj))
+
+        return obj
+
     def _is_multi_paragraph_object(self, obj):
         """Returns True if obj has multiple paragraphs of text."""
 
@@ -608,7 +696,7 @@ class MouseReviewer:
             debug.print_tokens(debug.LEVEL_INFO, tokens, True)
 
         if obj is None:
-            obj = AXComponent.get_descendant_at_point(window, window_x, window_y)
+            obj = self._get_descendant_at_point(window, window_x, window_y)
             tokens = ["MOUSE REVIEW: Object in", window, f"at ({window_x}, {window_y}) is", obj]
             debug.print_tokens(debug.LEVEL_INFO, tokens, True)
 
@@ -624,7 +712,7 @@ class MouseReviewer:
         if y <= window_y <= y + height and self._current_mouse_over.get_string():
             granularity = Atspi.TextGranularity.WORD
 
-        if len(self._event_queue):
+        if self._pending_event is not None:
             msg = "MOUSE REVIEW: Mouse moved again."
             debug.print_message(debug.LEVEL_INFO, msg, True)
             return
@@ -634,13 +722,18 @@ class MouseReviewer:
             self._current_mouse_over = new
 
     def _process_event(self):
-        if not self._event_queue:
-            return
+        self._sampling_id = 0
+        event = self._pending_event
+        if event is None:
+            return False
 
-        event = self._event_queue.popleft()
-        if len(self._event_queue):
-            return
+        # Only examine the pointer once it has stopped moving for SAMPLING_DELAY.
+        remaining = self.SAMPLING_DELAY - int((time.time() - self._pending_event_time) * 1000)
+        if remaining > 0:
+            self._sampling_id = GLib.timeout_add(remaining, self._process_event)
+            return False
 
+        self._pending_event = None
         start_time = time.time()
         tokens = ["\nvvvvv PROCESS OBJECT EVENT", event.type, "vvvvv"]
         debug.print_tokens(debug.LEVEL_INFO, tokens, False)
@@ -652,13 +745,16 @@ class MouseReviewer:
         msg = f"TOTAL PROCESSING TIME: {time.time() - start_time:.4f}\n"
         msg += f"^^^^^ PROCESS OBJECT EVENT {event.type} ^^^^^\n"
         debug.print_message(debug.LEVEL_INFO, msg, False)
+        return False
 
     def _listener(self, event):
         """Generic listener for events of interest."""
 
         if event.type.startswith("mouse:abs"):
-            self._event_queue.append(event)
-            GLib.timeout_add(50, self._process_event)
+            self._pending_event = event
+            self._pending_event_time = time.time()
+            if not self._sampling_id:
+                self._sampling_id = GLib.timeout_add(self.SAMPLING_DELAY, self._process_event)
 
 
 _reviewer = MouseReviewer()
@@ -49,6 +49,7 @@ from . import guilabels
 from . import input_event
 from . import keybindings
 from . import messages
+from .message_history import MessageHistory
 
 if TYPE_CHECKING:
     from .scripts import default
@@ -62,11 +63,11 @@ class NotificationPresenter:
         self._bindings: keybindings.KeyBindings = keybindings.KeyBindings()
         self._max_size: int = 55
 
-        # The list is arranged with the most recent message being at the end of
-        # the list. The current index is relative to, and used directly, with the
-        # python list, i.e. self._notifications[-3] would return the third-to-last
-        # notification message.
-        self._notifications: list[tuple[str, float]] = []
+        # The history is arranged with the most recent message being at the end.
+        # The current index is relative to, and used directly, with the history,
+        # i.e. self._notifications[-3] would return the third-to-last notification
+        # message.
+        self._notifications: MessageHistory[str] = MessageHistory(self._max_size)
         self._current_index: int = -1
 
     def get_bindings(
@@ -98,16 +99,19 @@ class NotificationPresenter:
 
         tokens = ["NOTIFICATION PRESENTER: Adding '", message, "'."]
         debug.print_tokens(debug.LEVEL_INFO, tokens, True)
-        to_remove = max(len(self._notifications) - self._max_size + 1, 0)
-        self._notifications = self._notifications[to_remove:]
-        self._notifications.append((message, time.time()))
+        self._notifications.append(message)
+
+    def _get_notification(self, index: int) -> tuple[str, float]:
+        """Returns the message and timestamp of the notification at index."""
+
+        return self._notifications[index], self._notifications.get_timestamp(index)
 
     def clear_list(self) -> None:
         """Clears the notifications list."""
 
         msg = "NOTIFICATION PRESENTER: Clearing list."
         debug.print_message(debug.LEVEL_INFO, msg, True)
-        self._notifications = []
+        self._notifications.clear()
         self._current_index = -1
 
     def _setup_handlers(self) -> None:
@@ -204,7 +208,7 @@ class NotificationPresenter:
         msg = "NOTIFICATION PRESENTER: Presenting last notification."
         debug.print_message(debug.LEVEL_INFO, msg, True)
 
-        message, timestamp = self._notifications[-1]
+        message, timestamp = self._get_notification(-1)
         string = f"{message} {self._timestamp_to_string(timestamp)}"
         script.presentMessage(string)
         self._current_index = -1
@@ -230,17 +234,17 @@ class NotificationPresenter:
         # This is the first (oldest) message in the list.
         if self._current_index == 0 :
             script.presentMessage(messages.NOTIFICATION_LIST_TOP)
-            message, timestamp = self._notifications[self._current_index]
+            message, timestamp = self._get_notification(self._current_index)
         else:
             try:
                 index = self._current_index - 1
-                message, timestamp = self._notifications[index]
+                message, timestamp = self._get_notification(index)
                 self._current_index -= 1
             except IndexError:
                 msg = "NOTIFICATION PRESENTER: Handling IndexError exception."
                 debug.print_message(debug.LEVEL_INFO, msg, True)
                 script.presentMessage(messages.NOTIFICATION_LIST_TOP)
-                message, timestamp = self._notifications[self._current_index]
+                message, timestamp = self._get_notification(self._current_index)
 
         string = f"{message} {self._timestamp_to_string(timestamp)}"
         script.presentMessage(string)
@@ -266,17 +270,17 @@ class NotificationPresenter:
         # This is the last (newest) message in the list.
         if self._current_index == -1:
             script.presentMessage(messages.NOTIFICATION_LIST_BOTTOM)
-            message, timestamp = self._notifications[self._current_index]
+            message, timestamp = self._get_notification(self._current_index)
         else:
             try:
                 index = self._current_index + 1
-                message, timestamp = self._notifications[index]
+                message, timestamp = self._get_notification(index)
                 self._current_index += 1
             except IndexError:
                 msg = "NOTIFICATION PRESENTER: Handling IndexError exception."
                 debug.print_message(debug.LEVEL_INFO, msg, True)
                 script.presentMessage(messages.NOTIFICATION_LIST_BOTTOM)
-                message, timestamp = self._notifications[self._current_index]
+                message, timestamp = self._get_notification(self._current_index)
 
         string = f"{message} {self._timestamp_to_string(timestamp)}"
         script.presentMessage(string)
@@ -300,8 +304,10 @@ class NotificationPresenter:
         msg = "NOTIFICATION PRESENTER: Showing notification list."
         debug.print_message(debug.LEVEL_INFO, msg, True)
 
-        rows = [(message, self._timestamp_to_string(timestamp)) \
-                    for message, timestamp in reversed(self._notifications)]
+        rows = []
+        for i in range(len(self._notifications) - 1, -1, -1):
+            message, timestamp = self._get_notification(i)
+            rows.append((message, self._timestamp_to_string(timestamp)))
         title = guilabels.notifications_count(len(self._notifications))
         column_headers = [guilabels.NOTIFICATIONS_COLUMN_HEADER,
                           guilabels.NOTIFICATIONS_RECEIVED_TIME]
@@ -38,6 +38,7 @@ gi.require_version("Atspi", "2.0")
 gi.require_version("Gdk", "3.0")
 from gi.repository import Atspi
 from gi.repository import Gdk
+from gi.repository import GLib
 from gi.repository.Gio import Settings
 
 from . import braille
@@ -47,6 +48,7 @@ from . import debugging_tools_manager
 from . import event_manager
 from . import focus_manager
 from . import input_event_manager
+from . import main_loop_watchdog
 from . import messages
 from . import mouse_review
 from . import orca_modifier_manager
@@ -55,7 +57,14 @@ from . import settings
 from . import settings_manager
 from . import speech_and_verbosity_manager
 from . import sound
+from . import startup_profiler
+from .ax_object import AXObject
+from .ax_table import AXTable
 from .ax_utilities import AXUtilities
+from .ax_utilities_event import AXUtilitiesEvent
+from .ax_utilities_relation import AXUtilitiesRelation
+from .ax_value import AXValue
+from .generator import Generator
 
 # The user-settings module (see loadUserSettings).
 #
@@ -116,6 +125,7 @@ def timeout(signum=None, frame=None):
     msg = 'TIMEOUT: something has hung. Aborting.'
     debug.print_message(debug.LEVEL_SEVERE, msg, True)
     debugging_tools_manager.get_manager().print_running_applications(force=True)
+    debug.flush()
     os.kill(os.getpid(), signal.SIGKILL)
 
 def shutdown(script=None, inputEvent=None, signum=None):
@@ -156,12 +166,40 @@ def shutdown(script=None, inputEvent=None, signum=None):
         player = sound.getPlayer()
         player.shutdown()
 
+    main_loop_watchdog.get_watchdog().stop()
     signal.alarm(0)
     debug.print_message(debug.LEVEL_INFO, 'ORCA: Quitting Atspi main event loop', True)
     Atspi.event_quit()
     debug.print_message(debug.LEVEL_INFO, 'ORCA: Shutdown complete', True)
     return True
 
+def _startCacheMaintenance():
+    """Starts the threads which periodically clear cached details."""
+
+    debug.print_message(debug.LEVEL_INFO, "ORCA: Starting cache maintenance", True)
+    AXObject.start_cache_clearing_thread()
+    AXTable.start_cache_clearing_thread()
+    AXUtilities.start_cache_clearing_thread()
+    AXUtilitiesEvent.start_cache_clearing_thread()
+    AXUtilitiesRelation.start_cache_clearing_thread()
+    AXValue.start_cache_clearing_thread()
+    Generator.start_cache_clearing_thread()
+
+def _onStartupComplete():
+    """Finishes the work deferred until Orca is up and running."""
+
+    _startCacheMaintenance()
+
+    profiler = startup_profiler.get_profiler()
+    if profiler.is_active():
+        profiler.mark("Main loop running")
+        profiler.stop()
+        for line in profiler.get_report():
+            print(line)
+            debug.print_message(debug.LEVEL_INFO, line, True)
+
+    return False
+
 def shutdownOnSignal(signum, frame):
     signalString = f'({signal.strsignal(signum)})'
     msg = f"ORCA: Shutting down and exiting due to signal={signum} {signalString}"
@@ -194,6 +232,7 @@ def main():
         settings_manager.get_manager().set_accessibility(True)
 
     loadUserSettings()
+    startup_profiler.get_profiler().mark("User settings loaded")
 
     def _on_enabled_changed(gsetting, key):
         enabled = gsetting.get_boolean(key)
@@ -213,6 +252,7 @@ def main():
 
     script = script_manager.get_manager().get_default_script()
     script.presentMessage(messages.START_ORCA)
+    startup_profiler.get_profiler().mark("Start message presented")
 
     event_manager.get_manager().activate()
     window = AXUtilities.find_active_window()
@@ -236,6 +276,9 @@ def main():
     script_manager.get_manager().activate()
     clipboard.get_presenter().activate()
     Gdk.notify_startup_complete()
+    main_loop_watchdog.get_watchdog().start()
+    startup_profiler.get_profiler().mark("Scripts activated")
+    GLib.idle_add(_onStartupComplete)
 
     try:
         debug.print_message(debug.LEVEL_INFO, "ORCA: Starting Atspi main event loop", True)
@@ -32,7 +32,7 @@ import time
 import gi
 gi.require_version("Gdk", "3.0")
 gi.require_version("Gtk", "3.0")
-from gi.repository import GObject, Gdk, Gtk
+from gi.repository import GLib, GObject, Gdk, Gtk
 
 from . import debug
 from . import guilabels
@@ -43,11 +43,22 @@ from .ax_object import AXObject
 
 class OrcaNavListGUI:
 
-    def __init__(self, title, columnHeaders, rows, selectedRow):
+    # The number of pending rows to add to the list each time the main loop is idle.
+    BATCH_SIZE = 50
+
+    def __init__(self, title, columnHeaders, rows, selectedRow,
+                 pendingRows=None, titleForCount=None):
         self._tree = None
+        self._model = None
+        self._filter = None
+        self._filterEntry = None
         self._activateButton = None
         self._jumpToButton = None
+        self._pendingRows = pendingRows
+        self._titleForCount = titleForCount
+        self._populateId = 0
         self._gui = self._createNavListDialog(columnHeaders, rows, selectedRow)
+        self._gui.connect('destroy', self._onDestroy)
         self._gui.set_title(title)
         self._gui.set_modal(True)
         self._gui.set_keep_above(True)
@@ -64,8 +75,17 @@ class OrcaNavListGUI:
         contentArea = dialog.get_content_area()
         contentArea.add(grid)
 
+        label = Gtk.Label(label=guilabels.NAVLIST_FILTER, use_underline=True)
+        self._filterEntry = Gtk.Entry()
+        self._filterEntry.set_hexpand(True)
+        self._filterEntry.set_activates_default(True)
+        self._filterEntry.connect('changed', self._onFilterChanged)
+        label.set_mnemonic_widget(self._filterEntry)
+        grid.attach(label, 0, 0, 1, 1)
+        grid.attach(self._filterEntry, 1, 0, 1, 1)
+
         scrolledWindow = Gtk.ScrolledWindow()
-        grid.add(scrolledWindow)
+        grid.attach(scrolledWindow, 0, 1, 2, 1)
 
         self._tree = Gtk.TreeView()
         self._tree.set_hexpand(True)
@@ -93,11 +113,14 @@ class OrcaNavListGUI:
             self._tree.append_column(column)
 
         for row in rows:
-            rowIter = model.append(None)
-            for i, cell in enumerate(row):
-                model.set_value(rowIter, i, cell)
-
-        self._tree.set_model(model)
+            self._addRow(model, row)
+
+        # The filter model hides rows which do not match the filter entry; the sort
+        # model on top of it keeps the column headers sortable.
+        self._model = model
+        self._filter = model.filter_new()
+        self._filter.set_visible_func(self._rowMatchesFilter)
+        self._tree.set_model(Gtk.TreeModelSort(model=self._filter))
         selection = self._tree.get_selection()
         selection.select_path(selectedRow)
 
@@ -118,9 +141,77 @@ class OrcaNavListGUI:
 
         return dialog
 
+    @staticmethod
+    def _addRow(model, row, position=-1):
+        # The values are converted before the row is inserted, so a bad row is not added.
+        model.insert(position, row)
+
     def showGUI(self):
         self._gui.show_all()
+        self._tree.grab_focus()
         self._gui.present_with_time(time.time())
+        if self._pendingRows is not None:
+            self._populateId = GLib.idle_add(self._populate)
+
+    def _populate(self):
+        """Adds the next batch of pending rows. Returns True if rows remain."""
+
+        # An exception raised by the generator ends it, so the pending rows should skip
+        # any they cannot create. A row which cannot be added is skipped here.
+        done = False
+        for _i in range(self.BATCH_SIZE):
+            try:
+                position, row = next(self._pendingRows)
+            except StopIteration:
+                done = True
+                break
+            except Exception as error:
+                msg = f"ERROR: Exception getting pending navlist row: {error}"
+                debug.print_message(debug.LEVEL_INFO, msg, True)
+                done = True
+                break
+            try:
+                self._addRow(self._model, row, position)
+            except Exception as error:
+                msg = f"ERROR: Exception adding navlist row: {error}"
+                debug.print_message(debug.LEVEL_INFO, msg, True)
+
+        if self._titleForCount is not None:
+            self._gui.set_title(self._titleForCount(len(self._model)))
+        if not done:
+            return True
+
+        self._populateId = 0
+        self._pendingRows = None
+        msg = f"INFO: Navlist fully populated with {len(self._model)} rows"
+        debug.print_message(debug.LEVEL_INFO, msg, True)
+        return False
+
+    def _onDestroy(self, widget):
+        if self._populateId:
+            msg = "INFO: Navlist closed before being fully populated"
+            debug.print_message(debug.LEVEL_INFO, msg, True)
+            GLib.source_remove(self._populateId)
+            self._populateId = 0
+        self._pendingRows = None
+
+    def _rowMatchesFilter(self, model, rowIter, data=None):
+        text = self._filterEntry.get_text().strip().casefold()
+        if not text:
+            return True
+
+        for i in range(2, model.get_n_columns()):
+            value = model.get_value(rowIter, i)
+            if value and text in value.casefold():
+                return True
+
+        return False
+
+    def _onFilterChanged(self, widget):
+        self._filter.refilter()
+        selection = self._tree.get_selection()
+        if not selection.count_selected_rows():
+            selection.select_path(0)
 
     def _onCursorChanged(self, widget):
         obj, offset = self._getSelectedAccessibleAndOffset()
@@ -182,6 +273,11 @@ class OrcaNavListGUI:
         offset = model.get_value(model.get_iter(paths[0]), 1)
         return obj, max(0, offset)
 
-def showUI(title='', columnHeaders=[], rows=[()], selectedRow=0):
-    gui = OrcaNavListGUI(title, columnHeaders, rows, selectedRow)
+def showUI(title='', columnHeaders=[], rows=[()], selectedRow=0,
+           pendingRows=None, titleForCount=None):
+    """Shows the list. If pendingRows is provided, it should yield (position, row)
+    tuples which will be added to the list in batches once the dialog is shown.
+    titleForCount, if provided, is used to update the title once all are added."""
+
+    gui = OrcaNavListGUI(title, columnHeaders, rows, selectedRow, pendingRows, titleForCount)
     gui.showGUI()
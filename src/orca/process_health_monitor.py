@@ -0,0 +1,124 @@
+# Orca
+#
+# Copyright 2024 Igalia, S.L.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+# Free Software Foundation, Inc., Franklin Street, Fifth Floor,
+# Boston MA  02110-1301 USA.
+
+"""Monitors the health of the processes of accessible applications."""
+
+__id__        = "$Id$"
+__version__   = "$Revision$"
+__date__      = "$Date$"
+__copyright__ = "Copyright (c) 2024 Igalia, S.L."
+__license__   = "LGPL"
+
+import os
+import time
+from collections import deque
+
+from . import debug
+
+
+class ProcessHealthMonitor:
+    """Reads process states from /proc, caching them briefly and recording changes."""
+
+    STATE_TTL = 2.0
+    HISTORY_SIZE = 100
+    MAX_CACHED_PIDS = 256
+
+    # See proc_pid_stat(5).
+    STATE_NAMES = {
+        "Z": "zombie",
+        "T": "suspended/stopped",
+        "t": "stopped by tracing",
+        "X": "dead",
+    }
+
+    def __init__(self, proc_root: str = "/proc") -> None:
+        self._proc_root: str = proc_root
+        self._states: dict[int, tuple[float, str]] = {}
+        self._history: deque[tuple[float, int, str]] = deque(maxlen=self.HISTORY_SIZE)
+
+    def _read_state(self, pid: int) -> str:
+        path = os.path.join(self._proc_root, str(pid), "stat")
+        try:
+            with open(path, "rb") as stat_file:
+                data = stat_file.read()
+            # The command name is in parentheses and may itself contain spaces and
+            # parentheses, so the state is the first field after the last ")".
+            return data[data.rindex(b")") + 1:].split()[0].decode()
+        except (OSError, ValueError, IndexError) as error:
+            msg = f"PROCESS HEALTH MONITOR: Exception reading state of pid {pid}: {error}"
+            debug.print_message(debug.LEVEL_INFO, msg, True)
+            return ""
+
+    def _add_to_history(self, pid: int, description: str) -> None:
+        self._history.append((time.time(), pid, description))
+        msg = f"PROCESS HEALTH MONITOR: pid {pid} {description}"
+        debug.print_message(debug.LEVEL_INFO, msg, True)
+
+    def get_state(self, pid: int) -> str:
+        """Returns the single-character state of pid, or an empty string if unknown."""
+
+        if pid <= 0:
+            return ""
+
+        now = time.monotonic()
+        cached = self._states.get(pid)
+        if cached is not None and now - cached[0] < self.STATE_TTL:
+            return cached[1]
+
+        if len(self._states) >= self.MAX_CACHED_PIDS:
+            self._states = {k: v for k, v in self._states.items() if now - v[0] < self.STATE_TTL}
+
+        state = self._read_state(pid)
+        self._states[pid] = now, state
+        previous = cached[1] if cached is not None else None
+        if state != previous and state in self.STATE_NAMES:
+            self._add_to_history(pid, f"is {self.STATE_NAMES[state]} process")
+        elif previous in self.STATE_NAMES and state not in self.STATE_NAMES:
+            self._add_to_history(pid, f"is no longer {self.STATE_NAMES[previous]} process")
+
+        return state
+
+    def is_unresponsive(self, pid: int) -> bool:
+        """Returns True if pid is a zombie or a suspended/stopped process."""
+
+        return self.get_state(pid) in ("Z", "T")
+
+    def record_slow_response(self, pid: int, reason: str = "") -> None:
+        """Records that pid failed to answer an AT-SPI call in time."""
+
+        if pid <= 0:
+            return
+
+        self._add_to_history(pid, f"was slow to respond ({reason})")
+
+    def get_history(self) -> list[str]:
+        """Returns descriptions of the recorded changes in process health, oldest first."""
+
+        return [
+            f"{time.strftime('%H:%M:%S', time.localtime(when))} pid {pid} {description}"
+            for when, pid, description in self._history
+        ]
+
+
+_monitor: ProcessHealthMonitor = ProcessHealthMonitor()
+
+def get_monitor() -> ProcessHealthMonitor:
+    """Returns the process health monitor."""
+
+    return _monitor
@@ -30,6 +30,8 @@ __copyright__ = "Copyright (c) 2011-2024 Igalia, S.L."
 __license__   = "LGPL"
 
 import importlib
+import pkgutil
+from types import ModuleType
 from typing import Optional
 
 import gi
@@ -51,6 +53,9 @@ from .scripts import apps, default, sleepmode, toolkits
 class ScriptManager:
     """Manages Orca's scripts."""
 
+    # In order of precedence.
+    SCRIPT_PACKAGES = ["orca-scripts", "orca.scripts", "orca.scripts.apps", "orca.scripts.toolkits"]
+
     def __init__(self) -> None:
         debug.print_message(debug.LEVEL_INFO, "SCRIPT MANAGER: Initializing", True)
         self.app_scripts: dict = {}
@@ -60,6 +65,8 @@ class ScriptManager:
         self._default_script: Optional[default.Script] = None
         self._active_script: Optional[default.Script] = None
         self._active: bool = False
+        self._script_module_names: Optional[dict[str, list[str]]] = None
+        self._script_modules: dict[str, list[ModuleType]] = {}
         debug.print_message(debug.LEVEL_INFO, "SCRIPT MANAGER: Initialized", True)
 
     def activate(self) -> None:
@@ -70,6 +77,7 @@ class ScriptManager:
             debug.print_message(debug.LEVEL_INFO, "SCRIPT MANAGER: Already activated", True)
             return
 
+        self._scan_script_modules()
         self._default_script = self.get_default_script(None)
         self._default_script.register_event_listeners()
         self.set_active_script(self._default_script, "activate")
@@ -149,26 +157,62 @@ class ScriptManager:
 
         return ""
 
-    def _new_named_script(self, app: Atspi.Accessible, name: str) -> Optional[default.Script]:
-        """Returns a script based on this module if it was located and loadable."""
+    def _scan_script_modules(self) -> dict[str, list[str]]:
+        """Returns a dict of script names and the modules which provide them, without
+        importing those modules."""
 
-        if not (app and name):
-            return None
+        if self._script_module_names is not None:
+            return self._script_module_names
 
-        packages = ["orca-scripts", "orca.scripts", "orca.scripts.apps", "orca.scripts.toolkits"]
-        script = None
-        for package in packages:
-            module_name = ".".join((package, name))
+        self._script_module_names = {}
+        for package in self.SCRIPT_PACKAGES:
             try:
-                module = importlib.import_module(module_name)
+                module = importlib.import_module(package)
             except ImportError:
                 continue
             except OSError as error:
+                tokens = ["EXCEPTION: Could not import", package, ":", error]
+                debug.print_tokens(debug.LEVEL_INFO, tokens, True, True)
+                continue
+
+            for info in pkgutil.iter_modules(getattr(module, "__path__", [])):
+                names = self._script_module_names.setdefault(info.name, [])
+                names.append(".".join((package, info.name)))
+
+        msg = f"SCRIPT MANAGER: Found {len(self._script_module_names)} script modules"
+        debug.print_message(debug.LEVEL_INFO, msg, True)
+        return self._script_module_names
+
+    def _get_script_modules(self, name: str) -> list[ModuleType]:
+        """Returns the loadable modules providing the script with this name."""
+
+        if name in self._script_modules:
+            return self._script_modules[name]
+
+        modules = []
+        for module_name in self._scan_script_modules().get(name, []):
+            try:
+                modules.append(importlib.import_module(module_name))
+            except (ImportError, OSError) as error:
                 tokens = ["EXCEPTION: Could not import", module_name, ":", error]
                 debug.print_tokens(debug.LEVEL_INFO, tokens, True, True)
+                continue
 
             tokens = ["SCRIPT MANAGER: Found", module_name]
             debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+
+        # Misses are stored too, so that names without a script are only looked up once.
+        self._script_modules[name] = modules
+        return modules
+
+    def _new_named_script(self, app: Atspi.Accessible, name: str) -> Optional[default.Script]:
+        """Returns a script based on this module if it was located and loadable."""
+
+        if not (app and name):
+            return None
+
+        script = None
+        for module in self._get_script_modules(name):
             try:
                 if hasattr(module, "getScript"):
                     script = module.get_script(app)
@@ -176,7 +220,7 @@ class ScriptManager:
                     script = module.Script(app)
                 break
             except Exception as error:
-                tokens = ["EXCEPTION: Could not load", module_name, ":", error]
+                tokens = ["EXCEPTION: Could not load", module.__name__, ":", error]
                 debug.print_tokens(debug.LEVEL_INFO, tokens, True, True)
 
         return script
@@ -1278,13 +1278,8 @@ class Utilities:
         if startIndex == endIndex:
             return []
 
-        cells = []
-        for i in range(startIndex, endIndex):
-            cell = AXTable.get_cell_at(table, row, i)
-            if AXUtilities.is_showing(cell):
-                cells.append(cell)
-
-        return cells
+        return AXTable.get_showing_cells_in_row(
+            table, row, startIndex, endIndex, limit_to_visible=self.isSpreadSheetTable(table))
 
     def clearCachedCommandState(self):
         self._script.point_of_reference['undo'] = False
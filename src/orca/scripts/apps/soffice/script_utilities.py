@@ -38,6 +38,70 @@ from orca.ax_table import AXTable
 from orca.ax_text import AXText
 from orca.ax_utilities import AXUtilities
 
+# Selections are tracked as lists of disjoint rectangles of cells, each being an
+# inclusive (top, left, bottom, right) tuple. Selecting an entire column in Calc
+# results in a single rectangle of more than a million cells; we never want to
+# expand such ranges into individual cells. Selected rows and columns are tracked
+# the same way, as runs of indices in (start, 0, end, 0) rectangles.
+
+def _subtract_rectangle(rect, other):
+    """Returns the disjoint rectangles covering the cells in rect but not in other."""
+
+    top, left, bottom, right = rect
+    o_top, o_left, o_bottom, o_right = other
+    if o_top > bottom or o_bottom < top or o_left > right or o_right < left:
+        return [rect]
+
+    result = []
+    if top < o_top:
+        result.append((top, left, o_top - 1, right))
+    if o_bottom < bottom:
+        result.append((o_bottom + 1, left, bottom, right))
+
+    middle_top, middle_bottom = max(top, o_top), min(bottom, o_bottom)
+    if left < o_left:
+        result.append((middle_top, left, middle_bottom, o_left - 1))
+    if o_right < right:
+        result.append((middle_top, o_right + 1, middle_bottom, right))
+
+    return result
+
+def _rectangles_difference(rects, others):
+    """Returns the disjoint rectangles covering the cells in rects but not in others."""
+
+    result = list(rects)
+    for other in others:
+        result = [piece for rect in result for piece in _subtract_rectangle(rect, other)]
+
+    return result
+
+def _rectangles_cell_count(rects):
+    """Returns the number of cells in the disjoint rectangles."""
+
+    return sum((bottom - top + 1) * (right - left + 1) for top, left, bottom, right in rects)
+
+def _rectangles_first_cell(rects):
+    """Returns the (row, col) which would sort first among the cells in rects."""
+
+    return min((top, left) for top, left, _bottom, _right in rects)
+
+def _rectangles_last_cell(rects):
+    """Returns the (row, col) which would sort last among the cells in rects."""
+
+    return max((bottom, right) for _top, _left, bottom, right in rects)
+
+def _index_runs(indices):
+    """Returns the rectangles for the runs of consecutive values in indices."""
+
+    runs = []
+    for index in sorted(set(indices)):
+        if runs and runs[-1][2] == index - 1:
+            runs[-1] = (runs[-1][0], 0, index, 0)
+        else:
+            runs.append((index, 0, index, 0))
+
+    return runs
+
 class Utilities(script_utilities.Utilities):
     """Custom script utilities for LibreOffice"""
 
@@ -166,38 +230,42 @@ class Utilities(script_utilities.Utilities):
             return True
 
         current = []
-        for r in range(first_coords[0], last_coords[0]+1):
-            current.extend((r, c) for c in range(first_coords[1], last_coords[1]+1))
-
-        current = set(current)
-        previous = set(self._calc_selected_cells)
-        current.discard((-1, -1))
-        previous.discard((-1, -1))
+        if first_coords[0] <= last_coords[0] and first_coords[1] <= last_coords[1]:
+            current.append((*first_coords, *last_coords))
 
-        unselected = sorted(previous.difference(current))
-        selected = sorted(current.difference(previous))
+        previous = self._calc_selected_cells
+        unselected = _rectangles_difference(previous, current)
+        selected = _rectangles_difference(current, previous)
         focus_coords = AXTable.get_cell_coordinates(
             focus_manager.get_manager().get_locus_of_focus())
-        if focus_coords in selected:
-            selected.remove(focus_coords)
+        if focus_coords != (-1, -1):
+            selected = _rectangles_difference(selected, [(*focus_coords, *focus_coords)])
 
-        self._calc_selected_cells = sorted(current)
+        self._calc_selected_cells = current
 
         msgs = []
-        if len(unselected) == 1:
-            cell = self._get_cell_name_for_coordinates(obj, *unselected[0], True)
+        count = _rectangles_cell_count(unselected)
+        if count == 1:
+            cell = self._get_cell_name_for_coordinates(
+                obj, *_rectangles_first_cell(unselected), True)
             msgs.append(messages.CELL_UNSELECTED % cell)
-        elif len(unselected) > 1:
-            cell1 = self._get_cell_name_for_coordinates(obj, *unselected[0], True)
-            cell2 = self._get_cell_name_for_coordinates(obj, *unselected[-1], True)
+        elif count > 1:
+            cell1 = self._get_cell_name_for_coordinates(
+                obj, *_rectangles_first_cell(unselected), True)
+            cell2 = self._get_cell_name_for_coordinates(
+                obj, *_rectangles_last_cell(unselected), True)
             msgs.append(messages.CELL_RANGE_UNSELECTED % (cell1, cell2))
 
-        if len(selected) == 1:
-            cell = self._get_cell_name_for_coordinates(obj, *selected[0], True)
+        count = _rectangles_cell_count(selected)
+        if count == 1:
+            cell = self._get_cell_name_for_coordinates(
+                obj, *_rectangles_first_cell(selected), True)
             msgs.append(messages.CELL_SELECTED % cell)
-        elif len(selected) > 1:
-            cell1 = self._get_cell_name_for_coordinates(obj, *selected[0], True)
-            cell2 = self._get_cell_name_for_coordinates(obj, *selected[-1], True)
+        elif count > 1:
+            cell1 = self._get_cell_name_for_coordinates(
+                obj, *_rectangles_first_cell(selected), True)
+            cell2 = self._get_cell_name_for_coordinates(
+                obj, *_rectangles_last_cell(selected), True)
             msgs.append(messages.CELL_RANGE_SELECTED % (cell1, cell2))
 
         if msgs:
@@ -214,11 +282,16 @@ class Utilities(script_utilities.Utilities):
         if not (AXObject.supports_table(obj) and AXObject.supports_selection(obj)):
             return True
 
-        cols = set(AXTable.get_selected_columns(obj))
-        rows = set(AXTable.get_selected_rows(obj))
+        cols = _index_runs(AXTable.get_selected_columns(obj))
+        rows = _index_runs(AXTable.get_selected_rows(obj))
 
-        selected_cols = sorted(cols.difference(set(self._calc_selected_columns)))
-        unselected_cols = sorted(set(self._calc_selected_columns).difference(cols))
+        def describe(runs, convert):
+            count = _rectangles_cell_count(runs)
+            if not count:
+                return count, None, None
+            first = convert(_rectangles_first_cell(runs)[0])
+            last = convert(_rectangles_last_cell(runs)[0])
+            return count, first, last
 
         def convert_column(x):
             return self.columnConvert(x+1)
@@ -226,50 +299,51 @@ class Utilities(script_utilities.Utilities):
         def convert_row(x):
             return x + 1
 
-        selected_cols = list(map(convert_column, selected_cols))
-        unselected_cols = list(map(convert_column, unselected_cols))
-
-        selected_rows = sorted(rows.difference(set(self._calc_selected_rows)))
-        unselected_rows = sorted(set(self._calc_selected_rows).difference(rows))
-
-        selected_rows = list(map(convert_row, selected_rows))
-        unselected_rows = list(map(convert_row, unselected_rows))
+        selected_cols = describe(
+            _rectangles_difference(cols, self._calc_selected_columns), convert_column)
+        unselected_cols = describe(
+            _rectangles_difference(self._calc_selected_columns, cols), convert_column)
+        selected_rows = describe(
+            _rectangles_difference(rows, self._calc_selected_rows), convert_row)
+        unselected_rows = describe(
+            _rectangles_difference(self._calc_selected_rows, rows), convert_row)
 
-        self._calc_selected_columns = list(cols)
-        self._calc_selected_rows = list(rows)
+        self._calc_selected_columns = cols
+        self._calc_selected_rows = rows
 
         column_count = AXTable.get_column_count(obj)
-        if len(cols) == column_count:
+        if _rectangles_cell_count(cols) == column_count:
             self._script.speakMessage(messages.DOCUMENT_SELECTED_ALL)
             return True
 
-        if not cols and len(unselected_cols) == column_count:
+        if not cols and unselected_cols[0] == column_count:
             self._script.speakMessage(messages.DOCUMENT_UNSELECTED_ALL)
             return True
 
         msgs = []
-        if len(unselected_cols) == 1:
-            msgs.append(messages.TABLE_COLUMN_UNSELECTED % unselected_cols[0])
-        elif len(unselected_cols) > 1:
-            msgs.append(messages.TABLE_COLUMN_RANGE_UNSELECTED % \
-                        (unselected_cols[0], unselected_cols[-1]))
-
-        if len(unselected_rows) == 1:
-            msgs.append(messages.TABLE_ROW_UNSELECTED % unselected_rows[0])
-        elif len(unselected_rows) > 1:
-            msgs.append(messages.TABLE_ROW_RANGE_UNSELECTED % \
-                        (unselected_rows[0], unselected_rows[-1]))
-
-        if len(selected_cols) == 1:
-            msgs.append(messages.TABLE_COLUMN_SELECTED % selected_cols[0])
-        elif len(selected_cols) > 1:
-            msgs.append(
-                messages.TABLE_COLUMN_RANGE_SELECTED % (selected_cols[0], selected_cols[-1]))
-
-        if len(selected_rows) == 1:
-            msgs.append(messages.TABLE_ROW_SELECTED % selected_rows[0])
-        elif len(selected_rows) > 1:
-            msgs.append(messages.TABLE_ROW_RANGE_SELECTED % (selected_rows[0], selected_rows[-1]))
+        count, first, last = unselected_cols
+        if count == 1:
+            msgs.append(messages.TABLE_COLUMN_UNSELECTED % first)
+        elif count > 1:
+            msgs.append(messages.TABLE_COLUMN_RANGE_UNSELECTED % (first, last))
+
+        count, first, last = unselected_rows
+        if count == 1:
+            msgs.append(messages.TABLE_ROW_UNSELECTED % first)
+        elif count > 1:
+            msgs.append(messages.TABLE_ROW_RANGE_UNSELECTED % (first, last))
+
+        count, first, last = selected_cols
+        if count == 1:
+            msgs.append(messages.TABLE_COLUMN_SELECTED % first)
+        elif count > 1:
+            msgs.append(messages.TABLE_COLUMN_RANGE_SELECTED % (first, last))
+
+        count, first, last = selected_rows
+        if count == 1:
+            msgs.append(messages.TABLE_ROW_SELECTED % first)
+        elif count > 1:
+            msgs.append(messages.TABLE_ROW_RANGE_SELECTED % (first, last))
 
         if msgs:
             self._script.presentationInterrupt()
@@ -42,7 +42,6 @@ from orca import input_event
 from orca import keybindings
 from orca import messages
 from orca import orca
-from orca import orca_gui_prefs
 from orca import orca_modifier_manager
 from orca import phonnames
 from orca import script
@@ -202,10 +201,15 @@ class Script(script.Script):
         listeners["object:attributes-changed"] = self.on_object_attributes_changed
         listeners["object:children-changed:add"] = self.on_children_added
         listeners["object:children-changed:remove"] = self.on_children_removed
+        listeners["object:column-deleted"] = self.on_column_deleted
+        listeners["object:column-inserted"] = self.on_column_inserted
         listeners["object:column-reordered"] = self.on_column_reordered
+        listeners["object:model-changed"] = self.on_model_changed
         listeners["object:property-change:accessible-description"] = self.on_description_changed
         listeners["object:property-change:accessible-name"] = self.on_name_changed
         listeners["object:property-change:accessible-value"] =  self.on_value_changed
+        listeners["object:row-deleted"] = self.on_row_deleted
+        listeners["object:row-inserted"] = self.on_row_inserted
         listeners["object:row-reordered"] = self.on_row_reordered
         listeners["object:selection-changed"] = self.on_selection_changed
         listeners["object:state-changed:active"] = self.on_active_changed
@@ -640,6 +644,9 @@ class Script(script.Script):
         if AXUtilities.is_defunct(new_focus):
             return
 
+        AXText.update_mirrors_for_focus(new_focus)
+        AXText.enable_mirror_if_large(new_focus)
+
         if old_focus == new_focus:
             msg = 'DEFAULT: old focus == new focus'
             debug.print_message(debug.LEVEL_INFO, msg, True)
@@ -737,6 +744,8 @@ class Script(script.Script):
         for key in settings.userCustomizableSettings:
             prefs[key] = manager.get_setting(key)
 
+        # The preferences dialog is only loaded when it is first shown.
+        from orca import orca_gui_prefs
         ui = orca_gui_prefs.OrcaSetupGUI(self, prefs)
         ui.showGUI()
         return True
@@ -746,6 +755,7 @@ class Script(script.Script):
 
         manager = settings_manager.get_manager()
         prefs = manager.get_general_settings(manager.profile)
+        from orca import orca_gui_prefs
         ui = orca_gui_prefs.OrcaSetupGUI(script_manager.get_manager().get_default_script(), prefs)
         ui.showGUI()
         return True
@@ -1215,7 +1225,8 @@ class Script(script.Script):
     def on_object_attributes_changed(self, event):
         """Callback for object:attributes-changed accessibility events."""
 
-        AXUtilities.clear_all_cache_now(event.source, "object-attributes-changed event.")
+        AXUtilities.clear_all_cache_now(
+            event.source, "object-attributes-changed event.", structure_changed=False)
 
     def on_pressed_changed(self, event):
         """Callback for object:state-changed:pressed accessibility events."""
@@ -1569,10 +1580,36 @@ class Script(script.Script):
         self.utilities.handleTextSelectionChange(event.source)
         self.update_braille(event.source)
 
+    def on_column_deleted(self, event):
+        """Callback for object:column-deleted accessibility events."""
+
+        AXTable.invalidate_model(event.source, "column-deleted event.")
+
+    def on_column_inserted(self, event):
+        """Callback for object:column-inserted accessibility events."""
+
+        AXTable.invalidate_model(event.source, "column-inserted event.")
+
+    def on_model_changed(self, event):
+        """Callback for object:model-changed accessibility events."""
+
+        AXTable.invalidate_model(event.source, "model-changed event.")
+
+    def on_row_deleted(self, event):
+        """Callback for object:row-deleted accessibility events."""
+
+        AXTable.invalidate_model(event.source, "row-deleted event.", event.detail1)
+
+    def on_row_inserted(self, event):
+        """Callback for object:row-inserted accessibility events."""
+
+        AXTable.invalidate_model(event.source, "row-inserted event.", event.detail1)
+
     def on_column_reordered(self, event):
         """Callback for object:column-reordered accessibility events."""
 
-        AXUtilities.clear_all_cache_now(event.source, "column-reordered event.")
+        AXUtilities.clear_all_cache_now(
+            event.source, "column-reordered event.", structure_changed=False)
         if not input_event_manager.get_manager().last_event_was_table_sort():
             return
 
@@ -1584,7 +1621,8 @@ class Script(script.Script):
     def on_row_reordered(self, event):
         """Callback for object:row-reordered accessibility events."""
 
-        AXUtilities.clear_all_cache_now(event.source, "row-reordered event.")
+        AXUtilities.clear_all_cache_now(
+            event.source, "row-reordered event.", structure_changed=False)
         if not input_event_manager.get_manager().last_event_was_table_sort():
             return
 
@@ -0,0 +1,273 @@
+# Orca
+#
+# Copyright 2024 Igalia, S.L.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+# Free Software Foundation, Inc., Franklin Street, Fifth Floor,
+# Boston MA  02110-1301 USA.
+
+# pylint: disable=wrong-import-position
+
+"""Caches the computed line layout of a web document."""
+
+__id__        = "$Id$"
+__version__   = "$Revision$"
+__date__      = "$Date$"
+__copyright__ = "Copyright (c) 2024 Igalia, S.L."
+__license__   = "LGPL"
+
+import time
+from typing import Optional
+
+import gi
+gi.require_version("Atspi", "2.0")
+from gi.repository import Atspi
+
+from orca import debug
+from orca.ax_component import AXComponent
+from orca.ax_object import AXObject
+
+# A line is a list of [obj, start, end, string] contents, as returned by
+# the web script utilities' getLineContentsAtOffset.
+LineKey = tuple[bool, int, int]
+
+
+class LineModel:
+    """Caches the computed lines of a single document, along with their adjacency."""
+
+    MAX_LINES = 5000
+
+    # Orca does not listen for bounds-changed events, so the size of the document is
+    # checked instead, at most this often.
+    LAYOUT_CHECK_INTERVAL = 1.0
+
+    def __init__(self, document: Atspi.Accessible) -> None:
+        self._document: Atspi.Accessible = document
+        self._rect: Atspi.Rect = AXComponent.get_rect(document)
+        self._last_layout_check: float = time.monotonic()
+        self._lines: dict[LineKey, list] = {}
+        self._index: dict[tuple[bool, int], list[LineKey]] = {}
+        self._ancestors: dict[LineKey, set[int]] = {}
+        self._descendant_index: dict[int, set[LineKey]] = {}
+        self._next: dict[tuple[LineKey, bool], LineKey] = {}
+        self._previous: dict[tuple[LineKey, bool], LineKey] = {}
+        self._hits: int = 0
+        self._misses: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f"LineModel: {len(self._lines)} lines, {len(self._next)} next links, "
+            f"{self._hits} hits, {self._misses} misses"
+        )
+
+    @staticmethod
+    def _key_for_line(line: list, layout_mode: bool) -> Optional[LineKey]:
+        if not (line and line[0]):
+            return None
+
+        return layout_mode, hash(line[0][0]), line[0][1]
+
+    def layout_has_changed(self) -> bool:
+        """Returns True if the document's size changed since the model was created."""
+
+        now = time.monotonic()
+        if now - self._last_layout_check < self.LAYOUT_CHECK_INTERVAL:
+            return False
+
+        self._last_layout_check = now
+        rect = AXComponent.get_rect(self._document)
+        return (rect.width, rect.height) != (self._rect.width, self._rect.height)
+
+    def _line_is_valid(self, line: list) -> bool:
+        return all(AXObject.is_valid(content[0]) for content in line)
+
+    def get_line(self, obj: Atspi.Accessible, offset: int, layout_mode: bool) -> list:
+        """Returns the cached line containing obj at offset, or an empty list."""
+
+        offset = max(0, offset)
+        for key in self._index.get((layout_mode, hash(obj)), []):
+            line = self._lines.get(key)
+            if not line:
+                continue
+            for content in line:
+                if content[0] == obj and content[1] <= offset < content[2]:
+                    if not self._line_is_valid(line):
+                        self._remove_line(key)
+                        break
+                    self._hits += 1
+                    return line
+
+        self._misses += 1
+        return []
+
+    def _get_adjacent_line(
+        self,
+        links: dict[tuple[LineKey, bool], LineKey],
+        line: list,
+        layout_mode: bool,
+        skip_space: bool
+    ) -> list:
+        key = self._key_for_line(line, layout_mode)
+        if key is None or self._lines.get(key) != line:
+            return []
+
+        adjacent_key = links.get((key, skip_space))
+        adjacent = self._lines.get(adjacent_key) if adjacent_key is not None else None
+        if not adjacent or not self._line_is_valid(adjacent):
+            self._misses += 1
+            return []
+
+        self._hits += 1
+        return adjacent
+
+    def get_next_line(self, line: list, layout_mode: bool, skip_space: bool) -> list:
+        """Returns the cached line which follows line, or an empty list."""
+
+        return self._get_adjacent_line(self._next, line, layout_mode, skip_space)
+
+    def get_previous_line(self, line: list, layout_mode: bool, skip_space: bool) -> list:
+        """Returns the cached line which precedes line, or an empty list."""
+
+        return self._get_adjacent_line(self._previous, line, layout_mode, skip_space)
+
+    def add_line(self, line: list, layout_mode: bool) -> None:
+        """Adds line to the model, replacing any overlapping cached line."""
+
+        key = self._key_for_line(line, layout_mode)
+        if key is None:
+            return
+
+        if self._lines.get(key) == line:
+            return
+
+        for content in line:
+            for stale in self._index.get((layout_mode, hash(content[0])), [])[:]:
+                stale_line = self._lines.get(stale, [])
+                if any(x[0] == content[0] and x[1] < content[2] and content[1] < x[2]
+                       for x in stale_line):
+                    self._remove_line(stale)
+
+        if len(self._lines) >= self.MAX_LINES:
+            self._remove_line(next(iter(self._lines)))
+
+        self._lines[key] = line
+        for content in line:
+            keys = self._index.setdefault((layout_mode, hash(content[0])), [])
+            if key not in keys:
+                keys.append(key)
+
+        ancestors = self._get_ancestors(line)
+        self._ancestors[key] = ancestors
+        for ancestor in ancestors:
+            self._descendant_index.setdefault(ancestor, set()).add(key)
+
+    def _get_ancestors(self, line: list) -> set[int]:
+        """Returns the hashes of the objects in line and of their ancestors in the document."""
+
+        result: set[int] = set()
+        for content in line:
+            obj = content[0]
+            while obj is not None and hash(obj) not in result:
+                result.add(hash(obj))
+                if obj == self._document:
+                    break
+                obj = AXObject.get_parent(obj)
+
+        return result
+
+    def _unlink(self, key: LineKey, skip_space: bool) -> None:
+        next_key = self._next.pop((key, skip_space), None)
+        if next_key is not None and self._previous.get((next_key, skip_space)) == key:
+            self._previous.pop((next_key, skip_space))
+
+        previous_key = self._previous.pop((key, skip_space), None)
+        if previous_key is not None and self._next.get((previous_key, skip_space)) == key:
+            self._next.pop((previous_key, skip_space))
+
+    def set_adjacent(
+        self, line: list, next_line: list, layout_mode: bool, skip_space: bool
+    ) -> None:
+        """Records that next_line immediately follows line."""
+
+        key = self._key_for_line(line, layout_mode)
+        next_key = self._key_for_line(next_line, layout_mode)
+        if key is None or next_key is None or key == next_key:
+            return
+
+        self.add_line(line, layout_mode)
+        self.add_line(next_line, layout_mode)
+
+        # Remove the links which this one replaces, so that no stale reverse link remains.
+        old_next = self._next.get((key, skip_space))
+        if old_next is not None and self._previous.get((old_next, skip_space)) == key:
+            self._previous.pop((old_next, skip_space))
+        old_previous = self._previous.get((next_key, skip_space))
+        if old_previous is not None and self._next.get((old_previous, skip_space)) == next_key:
+            self._next.pop((old_previous, skip_space))
+
+        self._next[(key, skip_space)] = next_key
+        self._previous[(next_key, skip_space)] = key
+
+    def _remove_line(self, key: LineKey) -> None:
+        line = self._lines.pop(key, [])
+        for content in line:
+            index_key = key[0], hash(content[0])
+            keys = self._index.get(index_key, [])
+            if key in keys:
+                keys.remove(key)
+            if not keys:
+                self._index.pop(index_key, None)
+
+        for ancestor in self._ancestors.pop(key, set()):
+            keys_for_ancestor = self._descendant_index.get(ancestor)
+            if keys_for_ancestor is None:
+                continue
+            keys_for_ancestor.discard(key)
+            if not keys_for_ancestor:
+                self._descendant_index.pop(ancestor)
+
+        for skip_space in (True, False):
+            self._unlink(key, skip_space)
+
+    def invalidate_subtree(self, root: Atspi.Accessible, reason: str = "") -> None:
+        """Removes lines containing root or its descendants, along with their adjacency."""
+
+        # If no cached line contains root, its new content can only appear within the
+        # nearest ancestor which has cached lines, e.g. between two of them.
+        ancestor = root
+        while ancestor is not None and hash(ancestor) not in self._descendant_index:
+            if ancestor == self._document:
+                ancestor = None
+                break
+            ancestor = AXObject.get_parent(ancestor)
+
+        to_remove = []
+        if ancestor is not None:
+            to_remove = list(self._descendant_index[hash(ancestor)])
+        for key in to_remove:
+            self._remove_line(key)
+
+        tokens = ["WEB LINE MODEL: Removed", len(to_remove), "lines for", root,
+                  "in", self._document, f"({reason}).", str(self)]
+        debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+
+    def clear(self) -> None:
+        """Removes everything from the model."""
+
+        self._lines.clear()
+        self._index.clear()
+        self._ancestors.clear()
+        self._descendant_index.clear()
+        self._next.clear()
+        self._previous.clear()
@@ -135,6 +135,8 @@ class Script(default.Script):
         self._preMouseOverContext = None, -1
         self._inMouseOverObject = False
         self.utilities.clearCachedObjects()
+        self.utilities.clearLineModel()
+        self.label_inference.invalidate()
         reason = "script deactivation"
         self.caret_navigation.suspend_commands(self, False, reason)
         self.structural_navigation.suspend_commands(self, False, reason)
@@ -1487,6 +1489,7 @@ class Script(default.Script):
             return True
 
         self.utilities.clearCachedObjects()
+        self.utilities.clearLineModel(event.source)
         if AXObject.is_dead(obj):
             obj = None
 
@@ -1735,6 +1738,8 @@ class Script(default.Script):
         """Callback for object:children-changed:add accessibility events."""
 
         AXUtilities.clear_all_cache_now(event.source, "children-changed event.")
+        self.utilities.invalidateLineModel(event.source, "children-changed event.")
+        self.label_inference.invalidate(event.source)
 
         if self.utilities.eventIsBrowserUINoise(event):
             msg = "WEB: Ignoring event believed to be browser UI noise"
@@ -1819,6 +1824,8 @@ class Script(default.Script):
         """Callback for object:children-changed:removed accessibility events."""
 
         AXUtilities.clear_all_cache_now(event.source, "children-changed event.")
+        self.utilities.invalidateLineModel(event.source, "children-changed event.")
+        self.label_inference.invalidate(event.source)
 
         if not self.utilities.inDocumentContent(event.source):
             msg = "WEB: Event source is not in document content."
@@ -1900,6 +1907,8 @@ class Script(default.Script):
         debug.print_message(debug.LEVEL_INFO, msg, True)
         self._loadingDocumentContent = False
         self.live_region_manager.reset()
+        self.label_inference.invalidate()
+        self.label_inference.inferAll(event.source)
         return True
 
     def on_document_load_stopped(self, event):
@@ -2238,6 +2247,9 @@ class Script(default.Script):
     def on_text_deleted(self, event):
         """Callback for object:text-changed:delete accessibility events."""
 
+        self.utilities.invalidateLineModel(event.source, "text deletion")
+        self.label_inference.invalidate(event.source)
+
         reason = AXUtilities.get_text_event_reason(event)
         if reason == TextEventReason.PAGE_SWITCH:
             msg = "WEB: Deletion is believed to be due to page switch"
@@ -2327,6 +2339,9 @@ class Script(default.Script):
     def on_text_inserted(self, event):
         """Callback for object:text-changed:insert accessibility events."""
 
+        self.utilities.invalidateLineModel(event.source, "text insertion")
+        self.label_inference.invalidate(event.source)
+
         reason = AXUtilities.get_text_event_reason(event)
         if reason == TextEventReason.PAGE_SWITCH:
             msg = "WEB: Insertion is believed to be due to page switch"
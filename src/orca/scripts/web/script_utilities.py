@@ -28,6 +28,7 @@ __license__   = "LGPL"
 import gi
 gi.require_version("Atspi", "2.0")
 from gi.repository import Atspi
+from gi.repository import GLib
 
 import functools
 import re
@@ -48,6 +49,8 @@ from orca.ax_text import AXText
 from orca.ax_utilities import AXUtilities
 from orca.ax_utilities_debugging import AXUtilitiesDebugging
 
+from .line_model import LineModel
+
 
 class Utilities(script_utilities.Utilities):
 
@@ -95,6 +98,8 @@ class Utilities(script_utilities.Utilities):
         self._currentLineContents = None
         self._currentWordContents = None
         self._currentCharacterContents = None
+        self._lineModels = {}
+        self._linePrefetchId = 0
         self._findContainer = None
         self._validChildRoles = {Atspi.Role.LIST: [Atspi.Role.LIST_ITEM]}
 
@@ -119,6 +124,7 @@ class Utilities(script_utilities.Utilities):
 
         self._script.structural_navigation.clearCache(documentFrame)
         self.clearCaretContext(documentFrame)
+        self.clearLineModel(documentFrame)
         self.clearCachedObjects()
 
         if preserveContext and context:
@@ -173,6 +179,85 @@ class Utilities(script_utilities.Utilities):
         self._currentWordContents = None
         self._currentCharacterContents = None
 
+    def _getLineModel(self, obj, create=True):
+        document = self.getTopLevelDocumentForObject(obj)
+        if document is None:
+            return None
+
+        model = self._lineModels.get(hash(document))
+        if model is not None and model.layout_has_changed():
+            tokens = ["WEB: Layout of", document, "changed. Discarding line model."]
+            debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+            self._lineModels.pop(hash(document))
+            model = None
+
+        if model is None and create:
+            model = LineModel(document)
+            self._lineModels[hash(document)] = model
+
+        return model
+
+    def clearLineModel(self, documentFrame=None):
+        if documentFrame is None:
+            self._lineModels = {}
+            return
+
+        document = self.getTopLevelDocumentForObject(documentFrame) or documentFrame
+        self._lineModels.pop(hash(document), None)
+
+    def invalidateLineModel(self, obj, reason=""):
+        model = self._getLineModel(obj, create=False)
+        if model is not None:
+            model.invalidate_subtree(obj, reason)
+
+    def _resolveLayoutMode(self, layoutMode):
+        if layoutMode is None:
+            layoutMode = settings_manager.get_manager().get_setting('layoutMode') \
+                or self._script.inFocusMode()
+        return bool(layoutMode)
+
+    def _scheduleLinePrefetch(self, line, layoutMode, skipSpace, forward=True):
+        if self._linePrefetchId:
+            GLib.source_remove(self._linePrefetchId)
+
+        self._linePrefetchId = GLib.idle_add(
+            self._prefetchAdjacentLine, line, layoutMode, skipSpace, forward,
+            priority=GLib.PRIORITY_LOW)
+
+    def _prefetchAdjacentLine(self, line, layoutMode, skipSpace, forward):
+        self._linePrefetchId = 0
+        if not (line and line[0]) or not all(AXObject.is_valid(x[0]) for x in line):
+            return False
+
+        model = self._getLineModel(line[0][0])
+        if model is None:
+            return False
+
+        # The line contents are computed without the cache, so that doing so has no effect
+        # on the current line, and the caches are not cleared if there is no adjacent line.
+        if forward:
+            if model.get_next_line(line, layoutMode, skipSpace):
+                return False
+            lastObj, lastOffset = self._getLastContextOnLine(line)
+            contents = self._getLineAfter(
+                line, lastObj, lastOffset, layoutMode, skipSpace, False, False)
+        else:
+            if model.get_previous_line(line, layoutMode, skipSpace):
+                return False
+            contents = self._getLineBefore(line, layoutMode, skipSpace, False, False)
+
+        if not contents or contents == line:
+            return False
+
+        if forward:
+            model.set_adjacent(line, contents, layoutMode, skipSpace)
+        else:
+            model.set_adjacent(contents, line, layoutMode, skipSpace)
+
+        tokens = ["WEB: Prefetched", "next" if forward else "previous", "line.", str(model)]
+        debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+        return False
+
     def isDocument(self, obj, excludeDocumentFrame=True):
         if AXUtilities.is_document_web(obj) or AXUtilities.is_embedded(obj):
             return True
@@ -1208,9 +1293,14 @@ class Utilities(script_utilities.Utilities):
                     obj, offset, self._currentLineContents, "Line (cached)")
                 return self._currentLineContents
 
-        if layoutMode is None:
-            layoutMode = settings_manager.get_manager().get_setting('layoutMode') \
-                or self._script.inFocusMode()
+        layoutMode = self._resolveLayoutMode(layoutMode)
+        if useCache:
+            model = self._getLineModel(obj)
+            contents = model.get_line(obj, offset, layoutMode) if model else []
+            if contents:
+                self._currentLineContents = contents
+                self._debugContentsInfo(obj, offset, contents, "Line (cached in line model)")
+                return contents
 
         objects = []
         if offset > 0 and self.treatAsEndOfLine(obj, offset):
@@ -1267,6 +1357,7 @@ class Utilities(script_utilities.Utilities):
         if not layoutMode:
             if useCache:
                 self._currentLineContents = objects
+                self._storeLine(obj, objects, layoutMode)
 
             self._debugContentsInfo(obj, offset, objects, "Line (not layout mode)")
             return objects
@@ -1353,6 +1444,7 @@ class Utilities(script_utilities.Utilities):
 
         if useCache:
             self._currentLineContents = objects
+            self._storeLine(obj, objects, layoutMode)
 
         msg = f"INFO: Time to get line contents: {time.time() - start_time:.4f}s"
         debug.print_message(debug.LEVEL_INFO, msg, True)
@@ -1362,6 +1454,11 @@ class Utilities(script_utilities.Utilities):
         self._canHaveCaretContextDecision = {}
         return objects
 
+    def _storeLine(self, obj, contents, layoutMode):
+        model = self._getLineModel(obj)
+        if model is not None:
+            model.add_line(contents, layoutMode)
+
     def getPreviousLineContents(self, obj=None, offset=-1, layoutMode=None, useCache=True):
         if obj is None:
             obj, offset = self.getCaretContext()
@@ -1387,8 +1484,34 @@ class Utilities(script_utilities.Utilities):
         debug.print_tokens(debug.LEVEL_INFO, tokens, True)
 
         skipSpace = not settings_manager.get_manager().get_setting("speakBlankLines")
+        layoutMode = self._resolveLayoutMode(layoutMode)
+        model = self._getLineModel(firstObj) if useCache else None
+        if model is not None:
+            contents = model.get_previous_line(line, layoutMode, skipSpace)
+            if contents:
+                self._currentLineContents = contents
+                self._debugContentsInfo(
+                    contents[0][0], contents[0][1], contents, "Previous line (cached)")
+                self._scheduleLinePrefetch(contents, layoutMode, skipSpace, forward=False)
+                return contents
+
+        contents = self._getLineBefore(line, layoutMode, skipSpace, useCache)
+        if model is not None and contents and line != contents:
+            model.set_adjacent(contents, line, layoutMode, skipSpace)
+            self._scheduleLinePrefetch(contents, layoutMode, skipSpace, forward=False)
+
+        return contents
+
+    # pylint: disable=too-many-arguments
+    # pylint: disable=too-many-positional-arguments
+    def _getLineBefore(self, line, layoutMode, skipSpace, useCache=True, clearCache=True):
+        """Returns the contents of the line before line, or [] if it cannot be found.
+        If clearCache is True, the cached objects are cleared should finding the
+        previous context fail, and then finding it is tried again."""
+
+        firstObj, firstOffset = line[0][0], line[0][1]
         obj, offset = self.previousContext(firstObj, firstOffset, skipSpace)
-        if not obj and firstObj:
+        if not obj and firstObj and clearCache:
             tokens = ["WEB: Previous context is: ", obj, ", ", offset, ". Trying again."]
             debug.print_tokens(debug.LEVEL_INFO, tokens, True)
             self.clearCachedObjects()
@@ -1420,6 +1543,8 @@ class Utilities(script_utilities.Utilities):
                 contents = self.getLineContentsAtOffset(obj, offset, layoutMode, useCache)
 
         return contents
+    # pylint: enable=too-many-arguments
+    # pylint: enable=too-many-positional-arguments
 
     def getNextLineContents(self, obj=None, offset=-1, layoutMode=None, useCache=True):
         if obj is None:
@@ -1441,17 +1566,52 @@ class Utilities(script_utilities.Utilities):
         if not (line and line[0]):
             return []
 
+        lastObj, lastOffset = self._getLastContextOnLine(line)
+        tokens = ["WEB: Last context on line is: ", lastObj, ", ", lastOffset]
+        debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+
+        skipSpace = not settings_manager.get_manager().get_setting("speakBlankLines")
+        layoutMode = self._resolveLayoutMode(layoutMode)
+        model = self._getLineModel(lastObj) if useCache else None
+        if model is not None:
+            contents = model.get_next_line(line, layoutMode, skipSpace)
+            if contents:
+                self._currentLineContents = contents
+                self._debugContentsInfo(
+                    contents[0][0], contents[0][1], contents, "Next line (cached)")
+                self._scheduleLinePrefetch(contents, layoutMode, skipSpace)
+                return contents
+
+        contents = self._getLineAfter(line, lastObj, lastOffset, layoutMode, skipSpace, useCache)
+        if model is not None and contents and line != contents:
+            model.set_adjacent(line, contents, layoutMode, skipSpace)
+            self._scheduleLinePrefetch(contents, layoutMode, skipSpace)
+
+        return contents
+
+    def _getLastContextOnLine(self, line):
+        """Returns the last context on line, which is the end of the math if the line
+        ends within math."""
+
         lastObj, lastOffset = line[-1][0], line[-1][2] - 1
         math = self.getMathAncestor(lastObj)
         if math:
             lastObj, lastOffset = self.lastContext(math)
 
-        tokens = ["WEB: Last context on line is: ", lastObj, ", ", lastOffset]
-        debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+        return lastObj, lastOffset
+
+    # pylint: disable=too-many-arguments
+    # pylint: disable=too-many-positional-arguments
+    def _getLineAfter(
+        self, line, lastObj, lastOffset, layoutMode, skipSpace, useCache=True, clearCache=True
+    ):
+        """Returns the contents of the line after line, whose last context is lastObj,
+        lastOffset, or [] if it cannot be found. If clearCache is True, the cached
+        objects are cleared should finding the next context fail, and then finding it
+        is tried again."""
 
-        skipSpace = not settings_manager.get_manager().get_setting("speakBlankLines")
         obj, offset = self.nextContext(lastObj, lastOffset, skipSpace)
-        if not obj and lastObj:
+        if not obj and lastObj and clearCache:
             tokens = ["WEB: Next context is: ", obj, ", ", offset, ". Trying again."]
             debug.print_tokens(debug.LEVEL_INFO, tokens, True)
             self.clearCachedObjects()
@@ -1482,6 +1642,8 @@ class Utilities(script_utilities.Utilities):
             return []
 
         return contents
+    # pylint: enable=too-many-arguments
+    # pylint: enable=too-many-positional-arguments
 
     def _findSelectionBoundaryObject(self, root, findStart=True):
         string = AXText.get_selected_text(root)[0]
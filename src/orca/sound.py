@@ -25,6 +25,14 @@ __date__      = "$Date:$"
 __copyright__ = "Copyright (c) 2016 Orca Team"
 __license__   = "LGPL"
 
+import math
+import os
+import random
+import sys
+import threading
+import time
+from array import array
+
 import gi
 from gi.repository import GLib
 
@@ -39,16 +47,77 @@ else:
 from . import debug
 from .sound_generator import Icon, Tone
 
-class Player:
-    """Plays Icons and Tones."""
+class _Voice:
+    """A sound which is queued or being mixed into the output stream."""
 
-    def __init__(self):
+    def __init__(self, samples, isTone):
+        self.samples = samples
+        self.isTone = isTone
+        self.position = 0
+        self.queuedTime = time.monotonic()
+
+class Player:
+    """Plays Icons and Tones.
+
+    Tones are rendered, and icons decoded, once into cached samples which are mixed
+    into a single persistent output stream. The stream's sink can be replaced, e.g.
+    Player("fakesink sync=true") plays without audio output, at real-time pace.
+    """
+
+    # The format of the output stream, and therefore of rendered tones and decoded icons.
+    RATE = 44100
+    FORMAT = "S16LE" if sys.byteorder == "little" else "S16BE"
+    CHUNK_SIZE = 441
+    SINK_BUFFER_TIME = 40000
+    SINK_LATENCY_TIME = 10000
+
+    # Sounds waiting this long to be started are dropped rather than played late.
+    STALE_THRESHOLD = 0.25
+
+    # After this many chunks of silence (i.e. two seconds), the stream is paused.
+    IDLE_CHUNKS = 200
+    RAMP_SIZE = 88
+    MAX_CACHED_SOUNDS = 128
+    MAX_ICON_DURATION = 10
+    DECODE_TIMEOUT = 2
+
+    RENDERED_WAVES = {
+        Tone.SINE_WAVE: lambda phase: math.sin(2 * math.pi * phase),
+        Tone.SQUARE_WAVE: lambda phase: 1.0 if phase < 0.5 else -1.0,
+        Tone.SAW_WAVE: lambda phase: 2 * phase - 1,
+        Tone.TRIANGLE_WAVE: lambda phase: 4 * abs(phase - 0.5) - 1,
+        Tone.SILENCE: lambda phase: 0.0,
+        Tone.WHITE_UNIFORM_NOISE: lambda phase: random.uniform(-1.0, 1.0),
+    }
+
+    def __init__(self, sinkName="autoaudiosink"):
         self._initialized = False
         self._source = None
         self._sink = None
         self._player = None
         self._pipeline = None
 
+        self._sinkName = sinkName
+        self._stream = None
+        self._streamSource = None
+        self._streamPlaying = False
+        self._lock = threading.Lock()
+        self._voices = []
+        self._tones = {}
+        self._icons = {}
+        self._decoders = {}
+        self._undecodable = {}
+        self._samplesPushed = 0
+        self._idleChunks = 0
+        self._stats = {
+            "played": 0,
+            "dropped": 0,
+            "chunks": 0,
+            "mixedChunks": 0,
+            "totalLatency": 0.0,
+            "maxLatency": 0.0,
+        }
+
         if not _gstreamerAvailable:
             msg = 'SOUND ERROR: Gstreamer is not available'
             debug.print_message(debug.LEVEL_INFO, msg, True)
@@ -78,9 +147,279 @@ class Player:
         element.set_state(Gst.State.NULL)
         return False
 
+    def _initStream(self):
+        """Creates the persistent output stream into which all sounds are mixed."""
+
+        caps = f"audio/x-raw,format={self.FORMAT},rate={self.RATE},channels=1,layout=interleaved"
+        try:
+            self._stream = Gst.parse_launch(
+                f"appsrc name=source format=time caps={caps} "
+                f"! audioconvert ! audioresample ! {self._sinkName} name=output")
+        except GLib.Error as error:
+            msg = f"SOUND ERROR: Could not create output stream: {error}"
+            debug.print_message(debug.LEVEL_INFO, msg, True)
+            self._stream = None
+            return
+
+        self._streamSource = self._stream.get_by_name("source")
+        self._streamSource.set_property("max-bytes", 2 * self.CHUNK_SIZE)
+        self._streamSource.connect("need-data", self._onNeedData)
+        self._stream.connect("deep-element-added", self._onStreamElementAdded)
+        self._onStreamElementAdded(self._stream, self._stream, self._stream.get_by_name("output"))
+
+        bus = self._stream.get_bus()
+        bus.add_signal_watch()
+        bus.connect("message", self._onStreamMessage)
+
+    def _onStreamElementAdded(self, _bin, _subBin, element):
+        # The default buffering of audio sinks would delay every sound by ~200ms.
+        if element is None:
+            return
+        if element.find_property("buffer-time") and element.find_property("latency-time"):
+            element.set_property("buffer-time", self.SINK_BUFFER_TIME)
+            element.set_property("latency-time", self.SINK_LATENCY_TIME)
+
+    def _onStreamMessage(self, bus, message):
+        if message.type == Gst.MessageType.ERROR:
+            self._stream.set_state(Gst.State.NULL)
+            self._streamPlaying = False
+            error, info = message.parse_error()
+            msg = f'SOUND ERROR: {error}'
+            debug.print_message(debug.LEVEL_INFO, msg, True)
+
+    def _onNeedData(self, source, _length):
+        """Mixes the next chunk of the active sounds. Called in the streaming thread."""
+
+        now = time.monotonic()
+        chunk = None
+        with self._lock:
+            for voice in self._voices[:]:
+                if voice.position == 0:
+                    latency = now - voice.queuedTime
+                    if latency > self.STALE_THRESHOLD:
+                        self._voices.remove(voice)
+                        self._stats["dropped"] += 1
+                        continue
+                    self._stats["played"] += 1
+                    self._stats["totalLatency"] += latency
+                    self._stats["maxLatency"] = max(self._stats["maxLatency"], latency)
+
+                end = voice.position + self.CHUNK_SIZE
+                samples = voice.samples[voice.position:end]
+                voice.position = end
+                if voice.position >= len(voice.samples):
+                    self._voices.remove(voice)
+
+                if chunk is None:
+                    chunk = samples
+                    continue
+
+                self._stats["mixedChunks"] += 1
+                if len(samples) > len(chunk):
+                    chunk, samples = samples, chunk
+                mixed = [max(-32768, min(32767, a + b)) for a, b in zip(chunk, samples)]
+                chunk = array("h", mixed) + chunk[len(mixed):]
+
+            self._stats["chunks"] += 1
+            if chunk is not None:
+                self._idleChunks = 0
+            else:
+                self._idleChunks += 1
+                if self._idleChunks == self.IDLE_CHUNKS:
+                    GLib.idle_add(self._pauseStreamIfIdle)
+
+        if chunk is None:
+            chunk = array("h", bytes(2 * self.CHUNK_SIZE))
+        elif len(chunk) < self.CHUNK_SIZE:
+            chunk.extend(array("h", bytes(2 * (self.CHUNK_SIZE - len(chunk)))))
+
+        buffer = Gst.Buffer.new_wrapped(chunk.tobytes())
+        buffer.pts = Gst.util_uint64_scale(self._samplesPushed, Gst.SECOND, self.RATE)
+        buffer.duration = Gst.util_uint64_scale(len(chunk), Gst.SECOND, self.RATE)
+        self._samplesPushed += len(chunk)
+        source.emit("push-buffer", buffer)
+
+    def _pauseStreamIfIdle(self):
+        with self._lock:
+            if self._voices or not self._streamPlaying:
+                return False
+            self._streamPlaying = False
+
+        msg = "SOUND: Pausing idle output stream"
+        debug.print_message(debug.LEVEL_INFO, msg, True)
+        self._stream.set_state(Gst.State.PAUSED)
+        return False
+
+    def _renderTone(self, tone):
+        """Returns the samples for tone, rendering them if needed, or None if unsupported."""
+
+        key = tone.duration, tone.frequency, tone.volume, tone.wave
+        samples = self._tones.get(key)
+        if samples is not None:
+            return samples
+
+        wave = self.RENDERED_WAVES.get(tone.wave)
+        if wave is None:
+            return None
+
+        count = int(tone.duration * self.RATE)
+        amplitude = 32767 * min(max(0.0, tone.volume), 1.0)
+        step = tone.frequency / self.RATE
+        values = [amplitude * wave((i * step) % 1.0) for i in range(count)]
+
+        # Ramp the start and end to avoid clicks.
+        ramp = min(self.RAMP_SIZE, count // 2)
+        for i in range(ramp):
+            values[i] *= i / ramp
+            values[count - 1 - i] *= i / ramp
+
+        samples = array("h", map(int, values))
+        self._cache(self._tones, key, samples)
+        return samples
+
+    def _getIconKey(self, icon):
+        """Returns the key of icon in the cache of decoded icons, or None on error."""
+
+        try:
+            return icon.path, os.stat(icon.path).st_mtime_ns
+        except OSError as error:
+            msg = f"SOUND ERROR: {error}"
+            debug.print_message(debug.LEVEL_INFO, msg, True)
+            return None
+
+    def _decodeIcon(self, key):
+        """Starts decoding the icon file of key without blocking. The samples are only
+        cached if the whole file is decoded, i.e. decoding reaches the end of the stream."""
+
+        if key in self._decoders or key in self._undecodable:
+            return
+
+        caps = f"audio/x-raw,format={self.FORMAT},rate={self.RATE},channels=1,layout=interleaved"
+        try:
+            pipeline = Gst.parse_launch(
+                f"filesrc name=file ! decodebin ! audioconvert ! audioresample ! {caps} "
+                f"! appsink name=sink sync=false emit-signals=true")
+        except GLib.Error as error:
+            msg = f"SOUND ERROR: Could not create decoder for {key[0]}: {error}"
+            debug.print_message(debug.LEVEL_INFO, msg, True)
+            return
+
+        data = bytearray()
+        pipeline.get_by_name("file").set_property("location", key[0])
+        pipeline.get_by_name("sink").connect("new-sample", self._onDecodedSample, data)
+        bus = pipeline.get_bus()
+        bus.add_signal_watch()
+        bus.connect("message", self._onDecoderMessage, key, data)
+        timeoutId = GLib.timeout_add_seconds(self.DECODE_TIMEOUT, self._onDecodeTimeout, key)
+        self._decoders[key] = pipeline, timeoutId
+        pipeline.set_state(Gst.State.PLAYING)
+
+    def _onDecodedSample(self, sink, data):
+        """Collects decoded samples. Called in the decoder's streaming thread."""
+
+        sample = sink.emit("pull-sample")
+        if sample is None:
+            return Gst.FlowReturn.EOS
+
+        # Anything longer than MAX_ICON_DURATION is not cached, so stop collecting it.
+        if len(data) <= 2 * self.RATE * self.MAX_ICON_DURATION:
+            buffer = sample.get_buffer()
+            data.extend(buffer.extract_dup(0, buffer.get_size()))
+        return Gst.FlowReturn.OK
+
+    def _onDecoderMessage(self, bus, message, key, data):
+        if message.type == Gst.MessageType.EOS:
+            self._finishDecoding(key, data)
+        elif message.type == Gst.MessageType.ERROR:
+            error, info = message.parse_error()
+            self._finishDecoding(key, None, f"{error}")
+
+    def _onDecodeTimeout(self, key):
+        entry = self._decoders.get(key)
+        if entry is not None:
+            self._decoders[key] = entry[0], 0
+            self._finishDecoding(key, None, "timed out", False)
+        return False
+
+    def _finishDecoding(self, key, data, problem="", isPermanent=True):
+        """Stops decoding the icon file of key, caching data if it is complete."""
+
+        entry = self._decoders.pop(key, None)
+        if entry is None:
+            return
+
+        pipeline, timeoutId = entry
+        if timeoutId:
+            GLib.source_remove(timeoutId)
+        pipeline.get_bus().remove_signal_watch()
+        pipeline.set_state(Gst.State.NULL)
+
+        if data is not None and len(data) > 2 * self.RATE * self.MAX_ICON_DURATION:
+            data, problem = None, f"longer than {self.MAX_ICON_DURATION}s"
+
+        if not data:
+            msg = f"SOUND: Not caching {key[0]}: {problem or 'no samples'}"
+            debug.print_message(debug.LEVEL_INFO, msg, True)
+            if isPermanent:
+                self._cache(self._undecodable, key, True)
+            return
+
+        samples = array("h", bytes(data[:len(data) - len(data) % 2]))
+        self._cache(self._icons, key, samples)
+        msg = f"SOUND: Decoded {key[0]} ({len(samples)} samples)"
+        debug.print_message(debug.LEVEL_INFO, msg, True)
+
+    def _cache(self, cache, key, samples):
+        if len(cache) >= self.MAX_CACHED_SOUNDS:
+            cache.pop(next(iter(cache)))
+        cache[key] = samples
+
+    def _enqueue(self, samples, isTone, interrupt):
+        """Mixes samples into the output stream, returning False if the stream is unusable."""
+
+        if self._stream is None:
+            return False
+
+        with self._lock:
+            if interrupt:
+                self._stats["dropped"] += len([v for v in self._voices if v.position == 0])
+                self._voices.clear()
+            elif isTone:
+                # Only the most recent tone, e.g. of a progress bar, is of interest.
+                for voice in [v for v in self._voices if v.isTone]:
+                    self._voices.remove(voice)
+                    if voice.position == 0:
+                        self._stats["dropped"] += 1
+            self._voices.append(_Voice(samples, isTone))
+            self._idleChunks = 0
+            if self._streamPlaying:
+                return True
+            self._streamPlaying = True
+
+        if self._stream.set_state(Gst.State.PLAYING) == Gst.StateChangeReturn.FAILURE:
+            msg = "SOUND ERROR: Could not start output stream"
+            debug.print_message(debug.LEVEL_INFO, msg, True)
+            with self._lock:
+                self._voices.clear()
+                self._streamPlaying = False
+            self._stream = None
+            return False
+
+        return True
+
     def _playIcon(self, icon, interrupt=True):
         """Plays a sound icon, interrupting the current play first unless specified."""
 
+        # Icons which have yet to be decoded are played directly while they are decoded,
+        # so that the main loop never waits for decoding.
+        key = self._getIconKey(icon)
+        samples = self._icons.get(key) if key is not None else None
+        if samples is not None and self._enqueue(samples, False, interrupt):
+            return
+
+        if key is not None and samples is None and self._stream is not None:
+            self._decodeIcon(key)
+
         if interrupt:
             self._player.set_state(Gst.State.NULL)
 
@@ -90,6 +429,10 @@ class Player:
     def _playTone(self, tone, interrupt=True):
         """Plays a tone, interrupting the current play first unless specified."""
 
+        samples = self._renderTone(tone)
+        if samples is not None and self._enqueue(samples, True, interrupt):
+            return
+
         if interrupt:
             self._pipeline.set_state(Gst.State.NULL)
 
@@ -133,6 +476,7 @@ class Player:
         self._pipeline.add(self._sink)
         self._source.link(self._sink)
 
+        self._initStream()
         self._initialized = True
 
     def play(self, item, interrupt=True):
@@ -162,6 +506,9 @@ class Player:
         if self._pipeline:
             self._pipeline.set_state(Gst.State.NULL)
 
+        with self._lock:
+            self._voices.clear()
+
     def shutdown(self):
         """Shuts down the sound utilities."""
 
@@ -170,9 +517,24 @@ class Player:
             return
 
         self.stop()
+        for key in list(self._decoders):
+            self._finishDecoding(key, None, "shutting down", False)
+        if self._stream:
+            self._stream.set_state(Gst.State.NULL)
+            self._streamPlaying = False
         self._initialized = False
         _gstreamerAvailable = False
 
+    def getStatistics(self):
+        """Returns counts of the sounds played and dropped, and their latency in seconds."""
+
+        with self._lock:
+            stats = self._stats.copy()
+        stats["averageLatency"] = stats["totalLatency"] / max(1, stats["played"])
+        stats["cachedTones"] = len(self._tones)
+        stats["cachedIcons"] = len(self._icons)
+        return stats
+
 _player = Player()
 
 def getPlayer():
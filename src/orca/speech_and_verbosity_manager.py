@@ -40,7 +40,6 @@ from . import debug
 from . import focus_manager
 from . import input_event
 from . import keybindings
-from . import mathsymbols
 from . import messages
 from . import pronunciation_dict
 from . import settings
@@ -852,6 +851,8 @@ class SpeechAndVerbosityManager:
         debug.print_tokens(debug.LEVEL_INFO, tokens, True)
 
         if AXUtilities.is_math_related(obj):
+            # The math symbols are only loaded when math is first presented.
+            from . import mathsymbols
             text = mathsymbols.adjustForSpeech(text)
 
         if start_offset is not None:
@@ -49,7 +49,6 @@ from . import debug
 from . import focus_manager
 from . import generator
 from . import input_event_manager
-from . import mathsymbols
 from . import messages
 from . import object_properties
 from . import settings
@@ -1216,6 +1215,8 @@ class SpeechGenerator(generator.Generator):
         separators.extend(separators[-1] for _ in range(len(separators), child_count - 1))
         separators.append("")
 
+        # The math symbols are only loaded when math is first presented.
+        from . import mathsymbols
         for i, child in enumerate(AXObject.iter_children(obj)):
             result.extend(self._generate_math_contents(child, **args))
             separator_name = mathsymbols.getCharacterName(separators[i])
@@ -1531,6 +1532,7 @@ class SpeechGenerator(generator.Generator):
 
         attrs = AXObject.get_attributes_dict(obj)
         fence_start = attrs.get("open", "(")
+        from . import mathsymbols
         result = [mathsymbols.getCharacterName(fence_start)]
         result.extend(self.voice(DEFAULT, obj=obj, **args))
         return result
@@ -1542,6 +1544,7 @@ class SpeechGenerator(generator.Generator):
 
         attrs = AXObject.get_attributes_dict(obj)
         fence_end = attrs.get("close", ")")
+        from . import mathsymbols
         result = [mathsymbols.getCharacterName(fence_end)]
         result.extend(self.voice(DEFAULT, obj=obj, **args))
         return result
@@ -2095,6 +2098,7 @@ class SpeechGenerator(generator.Generator):
 
         string = result[0].strip()
         if len(string) == 1 and AXUtilities.is_math_related(obj):
+            from . import mathsymbols
             charname = mathsymbols.getCharacterName(string)
             if charname and charname != string:
                 result[0] = charname
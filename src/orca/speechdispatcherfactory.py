@@ -32,7 +32,6 @@ import time
 from . import debug
 from . import focus_manager
 from . import guilabels
-from . import mathsymbols
 from . import messages
 from . import speechserver
 from . import settings
@@ -480,6 +479,8 @@ class SpeechServer(speechserver.SpeechServer):
         name = character
         focus = focus_manager.get_manager().get_locus_of_focus()
         if AXUtilities.is_math_related(focus):
+            # The math symbols are only loaded when math is first presented.
+            from . import mathsymbols
             name = mathsymbols.getCharacterName(character)
 
         if not name or name == character:
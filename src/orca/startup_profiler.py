@@ -0,0 +1,153 @@
+# Orca
+#
+# Copyright 2024 Igalia, S.L.
+#
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation; either
+# version 2.1 of the License, or (at your option) any later version.
+#
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the
+# Free Software Foundation, Inc., Franklin Street, Fifth Floor,
+# Boston MA  02110-1301 USA.
+
+"""Measures the cost of importing modules and of each phase of startup."""
+
+__id__        = "$Id$"
+__version__   = "$Revision$"
+__date__      = "$Date$"
+__copyright__ = "Copyright (c) 2024 Igalia, S.L."
+__license__   = "LGPL"
+
+# This module is imported before the rest of Orca so that it can see those imports.
+# Therefore it must only depend upon the standard library.
+
+import builtins
+import sys
+import time
+from types import ModuleType
+from typing import Any, Callable, Mapping, Optional, Sequence
+
+
+class StartupProfiler:
+    """Records import times and startup phases when startup profiling is enabled."""
+
+    def __init__(self) -> None:
+        self._start_time: float = 0.0
+        self._last_mark: float = 0.0
+        self._original_import: Optional[Callable[..., ModuleType]] = None
+        self._import_times: dict[str, float] = {}
+        self._child_times: list[float] = []
+        self._phases: list[tuple[str, float]] = []
+
+    def is_active(self) -> bool:
+        """Returns True if startup is being profiled."""
+
+        return self._original_import is not None
+
+    def start(self) -> None:
+        """Starts recording imports and phases."""
+
+        if self.is_active():
+            return
+
+        self._start_time = self._last_mark = time.perf_counter()
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+
+    def stop(self) -> None:
+        """Stops recording imports."""
+
+        original_import = self._original_import
+        if original_import is None:
+            return
+
+        builtins.__import__ = original_import
+        self._original_import = None
+
+    @staticmethod
+    def _get_import_name(
+        name: str,
+        globals_: Optional[Mapping[str, Any]],
+        fromlist: Optional[Sequence[str]],
+        level: int
+    ) -> str:
+        if level and globals_:
+            package = globals_.get("__package__") or ""
+            parts = package.split(".")
+            package = ".".join(parts[:len(parts) - level + 1])
+            name = ".".join(x for x in (package, name) if x)
+        # For "from package import module", the module is what got loaded.
+        submodules = [x for x in fromlist or () if f"{name}.{x}" in sys.modules]
+        if submodules:
+            name = f"{name}.{','.join(submodules)}"
+        return name
+
+    # pylint: disable=redefined-builtin
+    def _import(
+        self,
+        name: str,
+        globals: Optional[Mapping[str, object]] = None,
+        locals: Optional[Mapping[str, object]] = None,
+        fromlist: Optional[Sequence[str]] = (),
+        level: int = 0
+    ) -> ModuleType:
+        assert self._original_import is not None
+        module_count = len(sys.modules)
+        start = time.perf_counter()
+        self._child_times.append(0.0)
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            child_time = self._child_times.pop()
+            if self._child_times:
+                self._child_times[-1] += elapsed
+            # Only imports which caused modules to be loaded are of interest.
+            if len(sys.modules) != module_count:
+                key = self._get_import_name(name, globals, fromlist, level)
+                self._import_times[key] = self._import_times.get(key, 0.0) + elapsed - child_time
+    # pylint: enable=redefined-builtin
+
+    def mark(self, phase: str) -> None:
+        """Records that the named phase of startup just finished."""
+
+        if not self.is_active():
+            return
+
+        now = time.perf_counter()
+        self._phases.append((phase, now - self._last_mark))
+        self._last_mark = now
+
+    def get_report(self, limit: int = 25) -> list[str]:
+        """Returns the lines of a report of the phases and the most costly imports."""
+
+        total = time.perf_counter() - self._start_time
+        lines = [f"STARTUP PROFILE: {total:.3f}s since profiling started."]
+        elapsed = 0.0
+        for phase, duration in self._phases:
+            elapsed += duration
+            lines.append(f"{elapsed:8.3f}s (+{duration:.3f}s) {phase}")
+
+        import_time = sum(self._import_times.values())
+        lines.append(f"Imports: {len(self._import_times)} loads, {import_time:.3f}s self time. "
+                     f"Most costly {limit}:")
+        ranked = sorted(self._import_times.items(), key=lambda x: x[1], reverse=True)
+        for name, duration in ranked[:limit]:
+            lines.append(f"{duration:8.3f}s {name}")
+
+        return lines
+
+
+_profiler: StartupProfiler = StartupProfiler()
+
+def get_profiler() -> StartupProfiler:
+    """Returns the startup profiler."""
+
+    return _profiler
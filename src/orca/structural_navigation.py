@@ -27,6 +27,8 @@ __copyright__ = "Copyright (c) 2005-2009 Sun Microsystems Inc." \
                 "Copyright (c) 2010-2013 The Orca Team"
 __license__   = "LGPL"
 
+import bisect
+
 import gi
 gi.require_version("Atspi", "2.0")
 from gi.repository import Atspi
@@ -64,6 +66,10 @@ class StructuralNavigationObject:
     role and/or a state of interest. Or they may be something more complex
     such as character counts, text attributes, and other object attributes.
     """
+
+    # The number of rows shown in the "list of" dialog before it is fully populated.
+    ROWS_PER_SCREEN = 25
+
     def __init__(self, structuralNavigation, objType, bindings, predicate,
                  criteria, presentation, dialogData, getter):
         """Creates a new structural navigation object.
@@ -266,38 +272,106 @@ class StructuralNavigationObject:
     def showList(self, script, inputEvent):
         """Show a list of all the items with this object type."""
 
-        objects = self.structural_navigation._getAll(self)
-
-        def _isValidMatch(x):
-            if AXObject.is_dead(x):
-                return False
-            return not (script.utilities.isHidden(x) or script.utilities.is_empty(x))
-
-        objects = list(filter(_isValidMatch, objects))
-
-        if self.predicate is not None:
-            objects = list(filter(self.predicate, objects))
-
         if self._dialogData is None:
             msg = "STRUCTURAL NAVIGATION: Cannot show list without dialog data"
             debug.print_message(debug.LEVEL_INFO, msg, True)
             return
 
+        objects, morePages = self.structural_navigation._getAllInPages(self)
         title, columnHeaders, rowData = self._dialogData()
-        count = len(objects)
-        title = f"{title}: {messages.itemsFound(count)}"
-        if not count:
-            script.presentMessage(title)
-            return
+        self._showList(script, objects, title, columnHeaders, rowData, morePages)
+
+    # pylint: disable=too-many-arguments
+    # pylint: disable=too-many-positional-arguments
+    def _showList(self, script, objects, title, columnHeaders, rowData, morePages=None):
+        """Shows the list dialog with the first screenful of objects and the current
+        object, then populates the remaining rows while the main loop is idle. If
+        morePages is provided, it yields the objects not yet fetched, page by page."""
+
+        def _fetchMore():
+            nonlocal morePages
+            page = next(morePages, None) if morePages is not None else None
+            if page is None:
+                morePages = None
+                return False
+            objects.extend(page)
+            return True
+
+        def _isValidMatch(x):
+            if AXObject.is_dead(x):
+                return False
+            if script.utilities.isHidden(x) or script.utilities.is_empty(x):
+                return False
+            return self.predicate is None or self.predicate(x)
+
+        def _makeRow(x):
+            """Returns the row for x, or None if x is not a valid match or its row data
+            cannot be obtained."""
+
+            try:
+                if not _isValidMatch(x):
+                    return None
+                return [x, -1] + rowData(x)
+            except Exception as error:
+                tokens = ["STRUCTURAL NAVIGATION: Exception getting row for", x, ":", error]
+                debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+                return None
 
         currentObject, offset = script.utilities.getCaretContext()
-        try:
-            index = objects.index(currentObject)
-        except Exception:
-            index = 0
+        currentIndex = -1
+        while currentIndex == -1 and currentObject is not None:
+            try:
+                currentIndex = objects.index(currentObject)
+            except ValueError:
+                if not _fetchMore():
+                    break
+
+        # Indices into objects of the rows in the dialog, in document order.
+        shown = []
+        rows = []
+        nextIndex = 0
+        while len(rows) < self.ROWS_PER_SCREEN:
+            if nextIndex >= len(objects) and not _fetchMore():
+                break
+            row = _makeRow(objects[nextIndex])
+            if row is not None:
+                shown.append(nextIndex)
+                rows.append(row)
+            nextIndex += 1
+
+        row = _makeRow(currentObject) if currentIndex >= nextIndex else None
+        if row is not None:
+            shown.append(currentIndex)
+            rows.append(row)
+
+        if not rows:
+            script.presentMessage(f"{title}: {messages.itemsFound(0)}")
+            return
 
-        rows = [[obj, -1] + rowData(obj) for obj in objects]
-        orca_gui_navlist.showUI(title, columnHeaders, rows, index)
+        selectedRow = shown.index(currentIndex) if currentIndex in shown else 0
+
+        def _pendingRows():
+            i = nextIndex
+            while i < len(objects) or _fetchMore():
+                row = _makeRow(objects[i]) if i != currentIndex else None
+                if row is not None:
+                    position = bisect.bisect(shown, i)
+                    shown.insert(position, i)
+                    yield position, row
+                i += 1
+
+        def _titleForCount(count):
+            return f"{title}: {messages.itemsFound(count)}"
+
+        tokens = ["STRUCTURAL NAVIGATION: Showing", len(rows), "of", len(objects),
+                  "matches. Remaining matches will be added when idle."]
+        if morePages is not None:
+            tokens.append("More matches will be fetched from the document when idle.")
+        debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+        orca_gui_navlist.showUI(_titleForCount(len(rows)), columnHeaders, rows,
+                                selectedRow, _pendingRows(), _titleForCount)
+    # pylint: enable=too-many-arguments
+    # pylint: enable=too-many-positional-arguments
 
     def goPreviousAtLevelFactory(self, level):
         """Generates a goPrevious method for the specified level. Right
@@ -340,29 +414,8 @@ class StructuralNavigationObject:
 
         def showListAtLevel(script, inputEvent):
             objects = self.structural_navigation._getAll(self, arg=level)
-
-            def _isValidMatch(x):
-                return not (script.utilities.isHidden(x) or script.utilities.is_empty(x))
-
-            objects = list(filter(_isValidMatch, objects))
-            if self.predicate is not None:
-                objects = list(filter(self.predicate, objects))
-
             title, columnHeaders, rowData = self._dialogData(arg=level)
-            count = len(objects)
-            title = f"{title}: {messages.itemsFound(count)}"
-            if not count:
-                script.presentMessage(title)
-                return
-
-            currentObject, offset = script.utilities.getCaretContext()
-            try:
-                index = objects.index(currentObject)
-            except Exception:
-                index = 0
-
-            rows = [[obj, -1] + rowData(obj) for obj in objects]
-            orca_gui_navlist.showUI(title, columnHeaders, rows, index)
+            self._showList(script, objects, title, columnHeaders, rowData)
 
         return showListAtLevel
 
@@ -400,6 +453,11 @@ class StructuralNavigation:
     enabled.
     """
 
+    # The number of matches fetched up front when building the "list of" dialog. Later pages
+    # are fetched while the dialog is idle, each for at most PAGE_TIME_BUDGET seconds.
+    PAGE_SIZE = 100
+    PAGE_TIME_BUDGET = 0.05
+
     # The available object types.
     #
     # Convenience methods have been put into place whereby one can
@@ -778,6 +836,48 @@ class StructuralNavigation:
         self._objectCache[hash(document)] = cache
         return rv
 
+    def _getAllInPages(self, structuralNavigationObject, arg=None):
+        """Returns the first page of instances of structuralNavigationObject, along with
+        a generator of the remaining pages, or None if the first page is all there is."""
+
+        document = self._script.utilities.documentFrame()
+        cache = self._objectCache.setdefault(hash(document), {})
+        key = f"{structuralNavigationObject.objType}:{arg}"
+        focus = focus_manager.get_manager().get_locus_of_focus()
+        if cache.get(key) or structuralNavigationObject.getter \
+           or not structuralNavigationObject.criteria \
+           or not AXObject.supports_collection(document) or self._inModalDialog \
+           or AXObject.find_ancestor_inclusive(focus, AXUtilities.is_modal_dialog):
+            return self._getAll(structuralNavigationObject, arg), None
+
+        rule = structuralNavigationObject.criteria(arg)
+        matches, isComplete = AXCollection.get_matches_page(document, rule, self.PAGE_SIZE)
+        if isComplete:
+            cache[key] = matches.copy()
+        if isComplete or not matches:
+            return matches, None
+
+        def _remainingPages():
+            found = matches.copy()
+            while True:
+                page, isComplete = AXCollection.get_matches_page(
+                    document, rule, self.PAGE_SIZE * 10, found[-1], self.PAGE_TIME_BUDGET)
+                if not page and not isComplete:
+                    return
+                found.extend(page)
+                if page:
+                    yield page
+                if isComplete:
+                    break
+
+            # The cache may have been cleared while we were paging.
+            if self._objectCache.get(hash(document)) is cache:
+                tokens = ["STRUCTURAL NAVIGATION: Caching", len(found), "paged matches"]
+                debug.print_tokens(debug.LEVEL_INFO, tokens, True)
+                cache[key] = found
+
+        return matches, _remainingPages()
+
     def goEdge(self, structuralNavigationObject, isStart, event, container=None, arg=None):
         self._last_input_event = event
         if container is None: